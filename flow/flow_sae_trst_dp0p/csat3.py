@@ -1,11 +1,10 @@
 #!/usr/bin/env python3
 from structlog import get_logger
 
-import math
 import pandas as pd
 
 from flow_sae_trst_dp0p.l0tol0p import L0toL0p
-from flow_sae_trst_dp0p.shared_functions import get_nth_bit, get_range_bits
+from flow_sae_trst_dp0p.shared_functions import get_nth_bit_array, get_range_bits_array, get_flag_array, to_float_array
 
 log = get_logger()
 
@@ -23,17 +22,18 @@ class Csat3(L0toL0p):
     def data_conversion(self, filename: str) -> pd.DataFrame:
         df = super().data_conversion(filename)
 
-        df['tempSoni'] = df['speed_of_sound'].apply(lambda x: math.nan if math.isnan(x) else self.get_temp_soni(x)).astype('float32')
-        df['idx'] = df['diagnostic_word'].apply(lambda x: math.nan if math.isnan(x) else get_range_bits(x, 0, 5)).astype('float32')
-        df['qfSoniUnrs'] = df['diagnostic_word'].apply(lambda x: -1 if math.isnan(x) else 1 if x == -99999 else 0).astype('int8')
-        df['qfSoniData'] = df['diagnostic_word'].apply(lambda x: -1 if math.isnan(x) else 1 if x == 61503 else 0).astype('int8')
-        df['qfSoniTrig'] = df['diagnostic_word'].apply(lambda x: -1 if math.isnan(x) else 1 if x == 61440 else 0).astype('int8')
-        df['qfSoniComm'] = df['diagnostic_word'].apply(lambda x: -1 if math.isnan(x) else 1 if x == 61441 else 0).astype('int8')
-        df['qfSoniCode'] = df['diagnostic_word'].apply(lambda x: -1 if math.isnan(x) else 1 if x == 61442 else 0).astype('int8')
-        df['qfSoniTemp'] = df['diagnostic_word'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit(x, 15)).astype('int8')
-        df['qfSoniSgnlPoor'] = df['diagnostic_word'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit(x, 14)).astype('int8')
-        df['qfSoniSgnlHigh'] = df['diagnostic_word'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit(x, 13)).astype('int8')
-        df['qfSoniSgnlLow'] = df['diagnostic_word'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit(x, 12)).astype('int8')
+        df['tempSoni'] = self.get_temp_soni(to_float_array(df['speed_of_sound'])).astype('float32')
+        diagnostic_word = to_float_array(df['diagnostic_word'])
+        df['idx'] = get_range_bits_array(diagnostic_word, 0, 5).astype('float32')
+        df['qfSoniUnrs'] = get_flag_array(diagnostic_word, diagnostic_word == -99999).astype('int8')
+        df['qfSoniData'] = get_flag_array(diagnostic_word, diagnostic_word == 61503).astype('int8')
+        df['qfSoniTrig'] = get_flag_array(diagnostic_word, diagnostic_word == 61440).astype('int8')
+        df['qfSoniComm'] = get_flag_array(diagnostic_word, diagnostic_word == 61441).astype('int8')
+        df['qfSoniCode'] = get_flag_array(diagnostic_word, diagnostic_word == 61442).astype('int8')
+        df['qfSoniTemp'] = get_nth_bit_array(diagnostic_word, 15).astype('int8')
+        df['qfSoniSgnlPoor'] = get_nth_bit_array(diagnostic_word, 14).astype('int8')
+        df['qfSoniSgnlHigh'] = get_nth_bit_array(diagnostic_word, 13).astype('int8')
+        df['qfSoniSgnlLow'] = get_nth_bit_array(diagnostic_word, 12).astype('int8')
         del df['diagnostic_word']
         df.rename(columns=self.data_columns, inplace=True)
         log.debug(f'{df.columns}')
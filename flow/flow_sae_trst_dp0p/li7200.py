@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 from structlog import get_logger
 
-import math
 import pandas as pd
 
 from flow_sae_trst_dp0p.l0tol0p import L0toL0p
-from flow_sae_trst_dp0p.shared_functions import get_nth_bit_opposite, get_range_bits, from_percentage
+from flow_sae_trst_dp0p.shared_functions import get_nth_bit_opposite_array, get_range_bits_array, from_percentage
 from flow_sae_trst_dp0p.shared_functions import get_temp_kelvin, get_pressure_pa, mmol_to_mol, umol_to_mol
+from flow_sae_trst_dp0p.shared_functions import to_float_array
 
 log = get_logger()
 
@@ -26,48 +26,49 @@ class Li7200(L0toL0p):
     def data_conversion(self, filename) -> pd.DataFrame:
         df = super().data_conversion(filename)
 
-        df['tempIn'] = df['temperature_inlet'].apply(lambda x: math.nan if math.isnan(x) else get_temp_kelvin(x)).astype('float32')
+        df['tempIn'] = get_temp_kelvin(to_float_array(df['temperature_inlet'])).astype('float32')
         del df['temperature_inlet']
-        df['tempOut'] = df['temperature_outlet'].apply(lambda x: math.nan if math.isnan(x) else get_temp_kelvin(x)).astype('float32')
+        df['tempOut'] = get_temp_kelvin(to_float_array(df['temperature_outlet'])).astype('float32')
         del df['temperature_outlet']
-        df['tempRefe'] = df['temperature'].apply(lambda x: math.nan if math.isnan(x) else get_temp_kelvin(x)).astype('float32')
+        df['tempRefe'] = get_temp_kelvin(to_float_array(df['temperature'])).astype('float32')
         del df['temperature']
         df['tempMean'] = (df['tempIn'] + df['tempOut']) / 2
-        df['presSum'] = df['pressure'].apply(lambda x: math.nan if math.isnan(x) else get_pressure_pa(x)).astype('float32')
+        df['presSum'] = get_pressure_pa(to_float_array(df['pressure'])).astype('float32')
         del df['pressure']
-        df['presDiff'] = df['differential_pressure'].apply(lambda x: math.nan if math.isnan(x) else get_pressure_pa(x)).astype('float32')
+        df['presDiff'] = get_pressure_pa(to_float_array(df['differential_pressure'])).astype('float32')
         del df['differential_pressure']
-        # df['presAtm'] = df['absolute_pressure'].apply(lambda x: math.nan if math.isnan(x) else get_pressure_pa(x)).astype('float32')
+        # df['presAtm'] = get_pressure_pa(to_float_array(df['absolute_pressure'])).astype('float32')
         # del df['absolute_pressure']
         # data from presto don't have presAtm, need to get from presSum-presDiff
         # if df['presAtm'].isnull().all():
         df['presAtm'] = df['presSum'] - df['presDiff']
 
-        df['densMoleH2o'] = df['h2o_molar_density'].apply(lambda x: math.nan if math.isnan(x) else mmol_to_mol(x)).astype('float32')
+        df['densMoleH2o'] = mmol_to_mol(to_float_array(df['h2o_molar_density'])).astype('float32')
         del df['h2o_molar_density']
-        df['rtioMoleDryH2o'] = df['h2o_mole_fraction_dry'].apply(lambda x: math.nan if math.isnan(x) else mmol_to_mol(x)).astype('float32')
+        df['rtioMoleDryH2o'] = mmol_to_mol(to_float_array(df['h2o_mole_fraction_dry'])).astype('float32')
         del df['h2o_mole_fraction_dry']
 
-        df['densMoleCo2'] = df['co2_molar_density'].apply(lambda x: math.nan if math.isnan(x) else mmol_to_mol(x)).astype('float32')
+        df['densMoleCo2'] = mmol_to_mol(to_float_array(df['co2_molar_density'])).astype('float32')
         del df['co2_molar_density']
-        df['rtioMoleDryCo2'] = df['co2_mole_fraction_dry'].apply(lambda x: math.nan if math.isnan(x) else umol_to_mol(x)).astype('float32')
+        df['rtioMoleDryCo2'] = umol_to_mol(to_float_array(df['co2_mole_fraction_dry'])).astype('float32')
         del df['co2_mole_fraction_dry']
 
-        df['ssiCo2'] = df['co2_signal_strength'].apply(lambda x: math.nan if math.isnan(x) else from_percentage(x)).astype('float32')
+        df['ssiCo2'] = from_percentage(to_float_array(df['co2_signal_strength'])).astype('float32')
         del df['co2_signal_strength']
-        df['ssiH2o'] = df['h2o_signal_strength'].apply(lambda x: math.nan if math.isnan(x) else from_percentage(x)).astype('float32')
+        df['ssiH2o'] = from_percentage(to_float_array(df['h2o_signal_strength'])).astype('float32')
         del df['h2o_signal_strength']
 
-        df['qfIrgaTurbHead'] = df['diagnostic_value'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit_opposite(x, 12)).astype('int8')
-        df['qfIrgaTurbTempOut'] = df['diagnostic_value'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit_opposite(x, 11)).astype('int8')
-        df['qfIrgaTurbTempIn'] = df['diagnostic_value'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit_opposite(x, 10)).astype('int8')
-        df['qfIrgaTurbAux'] = df['diagnostic_value'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit_opposite(x, 9)).astype('int8')
-        df['qfIrgaTurbPres'] = df['diagnostic_value'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit_opposite(x, 8)).astype('int8')
-        df['qfIrgaTurbChop'] = df['diagnostic_value'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit_opposite(x, 7)).astype('int8')
-        df['qfIrgaTurbDetc'] = df['diagnostic_value'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit_opposite(x, 6)).astype('int8')
-        df['qfIrgaTurbPll'] = df['diagnostic_value'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit_opposite(x, 5)).astype('int8')
-        df['qfIrgaTurbSync'] = df['diagnostic_value'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit_opposite(x, 4)).astype('int8')
-        lower4bits = df['diagnostic_value'].apply(lambda x: math.nan if math.isnan(x) else get_range_bits(x, 0, 3))
+        diagnostic_value = to_float_array(df['diagnostic_value'])
+        df['qfIrgaTurbHead'] = get_nth_bit_opposite_array(diagnostic_value, 12).astype('int8')
+        df['qfIrgaTurbTempOut'] = get_nth_bit_opposite_array(diagnostic_value, 11).astype('int8')
+        df['qfIrgaTurbTempIn'] = get_nth_bit_opposite_array(diagnostic_value, 10).astype('int8')
+        df['qfIrgaTurbAux'] = get_nth_bit_opposite_array(diagnostic_value, 9).astype('int8')
+        df['qfIrgaTurbPres'] = get_nth_bit_opposite_array(diagnostic_value, 8).astype('int8')
+        df['qfIrgaTurbChop'] = get_nth_bit_opposite_array(diagnostic_value, 7).astype('int8')
+        df['qfIrgaTurbDetc'] = get_nth_bit_opposite_array(diagnostic_value, 6).astype('int8')
+        df['qfIrgaTurbPll'] = get_nth_bit_opposite_array(diagnostic_value, 5).astype('int8')
+        df['qfIrgaTurbSync'] = get_nth_bit_opposite_array(diagnostic_value, 4).astype('int8')
+        lower4bits = get_range_bits_array(diagnostic_value, 0, 3)
         df['qfIrgaTurbAgc'] = ((lower4bits * 6.25 + 6.25) / 100).astype('float32')
         del df['diagnostic_value']
 
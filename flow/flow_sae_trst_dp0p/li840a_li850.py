@@ -1,13 +1,11 @@
 #!/usr/bin/env python3
 from structlog import get_logger
 
-import math
 import pandas as pd
 
 from flow_sae_trst_dp0p.l0tol0p import L0toL0p
-from flow_sae_trst_dp0p.shared_functions import get_nth_bit, get_range_bits
-from flow_sae_trst_dp0p.shared_functions import get_nth_bit_opposite, get_range_bits, from_percentage
 from flow_sae_trst_dp0p.shared_functions import get_temp_kelvin, get_pressure_pa, mmol_to_mol, umol_to_mol
+from flow_sae_trst_dp0p.shared_functions import to_float_array
 
 
 log = get_logger()
@@ -21,13 +19,13 @@ class Li840a(L0toL0p):
     def data_conversion(self, filename: str) -> pd.DataFrame:
         df = super().data_conversion(filename)
 
-        df['rtioMoleWetCo2'] = df['fwMoleCO2'].apply(lambda x: math.nan if math.isnan(x) else umol_to_mol(x)).astype('float32')
+        df['rtioMoleWetCo2'] = umol_to_mol(to_float_array(df['fwMoleCO2'])).astype('float32')
         del df['fwMoleCO2']
-        df['rtioMoleWetH2o'] = df['fwMoleH2O'].apply(lambda x: math.nan if math.isnan(x) else mmol_to_mol(x)).astype('float32')
+        df['rtioMoleWetH2o'] = mmol_to_mol(to_float_array(df['fwMoleH2O'])).astype('float32')
         del df['fwMoleH2O']
-        df['temp'] = df['tempCell'].apply(lambda x: math.nan if math.isnan(x) else get_temp_kelvin(x)).astype('float32')
+        df['temp'] = get_temp_kelvin(to_float_array(df['tempCell'])).astype('float32')
         del df['tempCell']
-        df['pres'] = df['presCell'].apply(lambda x: math.nan if math.isnan(x) else get_pressure_pa(x)).astype('float32')
+        df['pres'] = get_pressure_pa(to_float_array(df['presCell'])).astype('float32')
         del df['presCell']
         df['rtioMoleDryCo2'] = df['rtioMoleWetCo2']/(1-df['rtioMoleWetH2o'])
         df['rtioMoleDryH2o'] = df['rtioMoleWetH2o']/(1-df['rtioMoleWetH2o'])
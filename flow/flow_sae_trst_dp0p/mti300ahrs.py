@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 from structlog import get_logger
 
-import math
+import numpy as np
 import pandas as pd
 
 from flow_sae_trst_dp0p.l0tol0p import L0toL0p
-from flow_sae_trst_dp0p.shared_functions import get_nth_bit_opposite, get_nth_bit, get_degree_radian
+from flow_sae_trst_dp0p.shared_functions import get_nth_bit_opposite_array, get_nth_bit_array, get_degree_radian
+from flow_sae_trst_dp0p.shared_functions import to_float_array
 
 log = get_logger()
 
@@ -26,17 +27,18 @@ class Mti300Ahrs(L0toL0p):
     def data_conversion(self, filename) -> pd.DataFrame:
         df = super().data_conversion(filename)
 
-        df['angXaxs'] = df['roll'].apply(lambda x: math.nan if math.isnan(x) else get_degree_radian(x)).astype('float32')
+        df['angXaxs'] = get_degree_radian(to_float_array(df['roll'])).astype('float32')
         del df['roll']
-        df['angYaxs'] = df['pitch'].apply(lambda x: math.nan if math.isnan(x) else get_degree_radian(x)).astype('float32')
+        df['angYaxs'] = get_degree_radian(to_float_array(df['pitch'])).astype('float32')
         del df['pitch']
-        df['angZaxs'] = df['yaw'].apply(lambda x: math.nan if math.isnan(x) else get_degree_radian(x)).astype('float32')
+        df['angZaxs'] = get_degree_radian(to_float_array(df['yaw'])).astype('float32')
         del df['yaw']
 
-        df['qfAmrsVal'] = df['status_word'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit_opposite(x, 0)).astype('int8')
-        df['qfAmrsFilt'] = df['status_word'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit_opposite(x, 1)).astype('int8')
-        df['qfAmrsVelo'] = df['status_word'].apply(lambda x: -1 if math.isnan(x) else (get_nth_bit(x, 17) or get_nth_bit(x, 18))).astype('int8')
-        df['qfAmrsRng'] = df['status_word'].apply(lambda x: -1 if math.isnan(x) else get_nth_bit(x, 19)).astype('int8')
+        status_word = to_float_array(df['status_word'])
+        df['qfAmrsVal'] = get_nth_bit_opposite_array(status_word, 0).astype('int8')
+        df['qfAmrsFilt'] = get_nth_bit_opposite_array(status_word, 1).astype('int8')
+        df['qfAmrsVelo'] = np.maximum(get_nth_bit_array(status_word, 17), get_nth_bit_array(status_word, 18)).astype('int8')
+        df['qfAmrsRng'] = get_nth_bit_array(status_word, 19).astype('int8')
         del df['status_word']
         df.rename(columns=self.data_columns, inplace=True)
         log.debug(f'{df.columns}')
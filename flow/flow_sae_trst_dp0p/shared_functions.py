@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import math
 
+import numpy as np
+
 
 # get site atmospheric pressure
 def get_site_presAtm(site):
@@ -56,3 +58,42 @@ def get_degree_radian(degree: float) -> float:
 
 def get_multiply_by(data: float, multiplicand: float) -> float:
     return data * multiplicand
+
+
+# vectorized counterparts of the helpers above, operating on whole columns.
+# values are converted to float64 first so results match the scalar helpers exactly.
+
+# get values as a float64 array
+def to_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype='float64')
+
+
+# get int8 flags, -1 where the value is NaN
+def get_flag_array(values, flags) -> np.ndarray:
+    data = to_float_array(values)
+    return np.where(np.isnan(data), -1, flags).astype('int8')
+
+
+# get truncated int64 values, NaN replaced by 0
+def to_int_array(data: np.ndarray) -> np.ndarray:
+    return np.trunc(np.where(np.isnan(data), 0, data)).astype('int64')
+
+
+# get bit value from base10 numbers, -1 where the value is NaN
+def get_nth_bit_array(values, n) -> np.ndarray:
+    data = to_float_array(values)
+    return get_flag_array(data, (to_int_array(data) >> n) & 0x0001)
+
+
+# reverse bit value, -1 where the value is NaN
+def get_nth_bit_opposite_array(values, n) -> np.ndarray:
+    data = to_float_array(values)
+    return get_flag_array(data, 1 - ((to_int_array(data) >> n) & 0x0001))
+
+
+# get base10 values from base2 bit range start to end, NaN where the value is NaN
+def get_range_bits_array(values, start, end) -> np.ndarray:
+    data = to_float_array(values)
+    mask = ~(-1 << (end - start + 1)) << start
+    bits = ((to_int_array(data) & mask) >> start).astype('float64')
+    return np.where(np.isnan(data), np.nan, bits)
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 
+import math
 from unittest import TestCase
 
+import numpy as np
+
 from flow_sae_trst_dp0p.shared_functions import get_nth_bit, get_range_bits, get_nth_bit_opposite
+from flow_sae_trst_dp0p.shared_functions import get_nth_bit_array, get_range_bits_array, get_nth_bit_opposite_array
+from flow_sae_trst_dp0p.shared_functions import get_flag_array, get_temp_kelvin, to_float_array
 
 
 class SaeTrstDp0pTest(TestCase):
@@ -24,5 +29,25 @@ class SaeTrstDp0pTest(TestCase):
         self.assertEqual(get_nth_bit_opposite(self.number, 4), 0, message)
         self.assertEqual(get_nth_bit_opposite(self.number, 6), 1, message)
 
-
-
+    def test_array_parity(self):
+        message = "vectorized helpers should match the scalar helpers"
+        values = np.array([self.number, 0, 1, 4095, 61440, 1048575, -99999, math.nan, 12.7, 2 ** 20 + 5],
+                          dtype='float32')
+        for n in [0, 4, 6, 12, 15, 17, 19]:
+            expected = [-1 if math.isnan(x) else get_nth_bit(x, n) for x in values]
+            self.assertEqual(get_nth_bit_array(values, n).tolist(), expected, message)
+            expected = [-1 if math.isnan(x) else get_nth_bit_opposite(x, n) for x in values]
+            self.assertEqual(get_nth_bit_opposite_array(values, n).tolist(), expected, message)
+        for start, end in [(0, 3), (0, 5), (4, 5)]:
+            expected = [math.nan if math.isnan(x) else get_range_bits(x, start, end) for x in values]
+            np.testing.assert_array_equal(get_range_bits_array(values, start, end), expected, message)
+
+    def test_array_types(self):
+        values = np.array([self.number, math.nan])
+        self.assertEqual(get_nth_bit_array(values, 4).dtype, np.int8)
+        self.assertEqual(get_flag_array(values, values == self.number).tolist(), [1, -1])
+
+    def test_array_conversion_parity(self):
+        values = np.array([-12.3456, 0.001, 25.125, math.nan], dtype='float32')
+        expected = np.array([math.nan if math.isnan(x) else get_temp_kelvin(x) for x in values.tolist()]).astype('float32')
+        np.testing.assert_array_equal(get_temp_kelvin(to_float_array(values)).astype('float32'), expected)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+import math
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from flow_sae_trst_dp0p.csat3 import Csat3
+from flow_sae_trst_dp0p.li7200 import Li7200
+from flow_sae_trst_dp0p.mcseries import Mcseries
+from flow_sae_trst_dp0p.mti300ahrs import Mti300Ahrs
+from flow_sae_trst_dp0p.pump import Pump
+from flow_sae_trst_dp0p.shared_functions import get_nth_bit, get_nth_bit_opposite, get_range_bits
+from flow_sae_trst_dp0p.shared_functions import get_temp_kelvin, get_pressure_pa, mmol_to_mol, umol_to_mol
+from flow_sae_trst_dp0p.shared_functions import from_percentage, get_degree_radian, get_multiply_by
+
+
+def nan_or(function):
+    return lambda x: math.nan if math.isnan(x) else function(x)
+
+
+def flag_or(function):
+    return lambda x: -1 if math.isnan(x) else function(x)
+
+
+def bit_opposite(n):
+    return flag_or(lambda x: get_nth_bit_opposite(x, n))
+
+
+def bit(n):
+    return flag_or(lambda x: get_nth_bit(x, n))
+
+
+def equals(value):
+    return flag_or(lambda x: 1 if x == value else 0)
+
+
+csat3_temp_soni = Csat3.get_temp_soni
+mcseries_const = Mcseries.CONV_CONST
+
+# per sensor: (output column, input column, scalar conversion, dtype) as applied per element before vectorization
+SENSORS = {
+    'li7200': (Li7200, {}, [
+        ('tempIn', 'temperature_inlet', nan_or(get_temp_kelvin), 'float32'),
+        ('tempOut', 'temperature_outlet', nan_or(get_temp_kelvin), 'float32'),
+        ('tempRefe', 'temperature', nan_or(get_temp_kelvin), 'float32'),
+        ('presSum', 'pressure', nan_or(get_pressure_pa), 'float32'),
+        ('presDiff', 'differential_pressure', nan_or(get_pressure_pa), 'float32'),
+        ('densMoleH2o', 'h2o_molar_density', nan_or(mmol_to_mol), 'float32'),
+        ('rtioMoleDryH2o', 'h2o_mole_fraction_dry', nan_or(mmol_to_mol), 'float32'),
+        ('densMoleCo2', 'co2_molar_density', nan_or(mmol_to_mol), 'float32'),
+        ('rtioMoleDryCo2', 'co2_mole_fraction_dry', nan_or(umol_to_mol), 'float32'),
+        ('ssiCo2', 'co2_signal_strength', nan_or(from_percentage), 'float32'),
+        ('ssiH2o', 'h2o_signal_strength', nan_or(from_percentage), 'float32'),
+        ('qfIrgaTurbHead', 'diagnostic_value', bit_opposite(12), 'int8'),
+        ('qfIrgaTurbTempOut', 'diagnostic_value', bit_opposite(11), 'int8'),
+        ('qfIrgaTurbTempIn', 'diagnostic_value', bit_opposite(10), 'int8'),
+        ('qfIrgaTurbAux', 'diagnostic_value', bit_opposite(9), 'int8'),
+        ('qfIrgaTurbPres', 'diagnostic_value', bit_opposite(8), 'int8'),
+        ('qfIrgaTurbChop', 'diagnostic_value', bit_opposite(7), 'int8'),
+        ('qfIrgaTurbDetc', 'diagnostic_value', bit_opposite(6), 'int8'),
+        ('qfIrgaTurbPll', 'diagnostic_value', bit_opposite(5), 'int8'),
+        ('qfIrgaTurbSync', 'diagnostic_value', bit_opposite(4), 'int8'),
+        ('qfIrgaTurbAgc', 'diagnostic_value',
+         nan_or(lambda x: (get_range_bits(x, 0, 3) * 6.25 + 6.25) / 100), 'float32')]),
+    'csat3': (Csat3, {}, [
+        ('tempSoni', 'speed_of_sound', nan_or(lambda x: csat3_temp_soni(Csat3, x)), 'float32'),
+        ('idx', 'diagnostic_word', nan_or(lambda x: get_range_bits(x, 0, 5)), 'float32'),
+        ('qfSoniUnrs', 'diagnostic_word', equals(-99999), 'int8'),
+        ('qfSoniData', 'diagnostic_word', equals(61503), 'int8'),
+        ('qfSoniTrig', 'diagnostic_word', equals(61440), 'int8'),
+        ('qfSoniComm', 'diagnostic_word', equals(61441), 'int8'),
+        ('qfSoniCode', 'diagnostic_word', equals(61442), 'int8'),
+        ('qfSoniTemp', 'diagnostic_word', bit(15), 'int8'),
+        ('qfSoniSgnlPoor', 'diagnostic_word', bit(14), 'int8'),
+        ('qfSoniSgnlHigh', 'diagnostic_word', bit(13), 'int8'),
+        ('qfSoniSgnlLow', 'diagnostic_word', bit(12), 'int8')]),
+    'mti300ahrs': (Mti300Ahrs, {}, [
+        ('angXaxs', 'roll', nan_or(get_degree_radian), 'float32'),
+        ('angYaxs', 'pitch', nan_or(get_degree_radian), 'float32'),
+        ('angZaxs', 'yaw', nan_or(get_degree_radian), 'float32'),
+        ('qfAmrsVal', 'status_word', bit_opposite(0), 'int8'),
+        ('qfAmrsFilt', 'status_word', bit_opposite(1), 'int8'),
+        ('qfAmrsVelo', 'status_word', flag_or(lambda x: get_nth_bit(x, 17) or get_nth_bit(x, 18)), 'int8'),
+        ('qfAmrsRng', 'status_word', bit(19), 'int8')]),
+    'mcseries': (Mcseries, {'NEW_SOURCE_TYPE_NAME': 'mfcSampStor'}, [
+        ('presAtm', 'absolute_pressure', nan_or(get_pressure_pa), 'float32'),
+        ('temp', 'temperature', nan_or(get_temp_kelvin), 'float32'),
+        ('frt', 'volumetric_flow', nan_or(lambda x: get_multiply_by(x, mcseries_const)), 'float32'),
+        ('frt00', 'mass_flow', nan_or(lambda x: get_multiply_by(x, mcseries_const)), 'float32')]),
+    'pump': (Pump, {}, [])
+}
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Benchmark skipped due to long process time.')
+class SaeTrstDp0pBenchmarkTest(unittest.TestCase):
+    """Compare per-element and vectorized L0 to L0p conversions on synthetic 20 Hz data."""
+
+    def setUp(self) -> None:
+        # one hour of 20 Hz data by default, set BENCHMARK_ROWS=1728000 for a full day
+        self.row_count = int(os.environ.get('BENCHMARK_ROWS', 72000))
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.environ['IN_PATH'] = self.temp_dir.name
+        os.environ['OUT_PATH'] = self.temp_dir.name
+        os.environ['RELATIVE_PATH_INDEX'] = '0'
+        os.environ['LOG_LEVEL'] = 'INFO'
+        random = np.random.default_rng(0)
+        columns = {'readout_time': pd.date_range('2023-01-01', periods=self.row_count, freq='50ms')}
+        for sensor_class, environment, conversions in SENSORS.values():
+            for output, column, function, dtype in conversions:
+                if column in columns:
+                    continue
+                if 'diagnostic' in column or 'status' in column:
+                    values = random.integers(0, 2 ** 20, self.row_count).astype('float64')
+                    values[::97] = -99999
+                else:
+                    values = random.normal(20, 10, self.row_count).astype('float32')
+                values[::101] = math.nan
+                columns[column] = values
+        columns['dac_output'] = random.normal(5, 1, self.row_count).astype('float32')
+        self.data_file = Path(self.temp_dir.name, 'data.parquet')
+        pd.DataFrame(columns).to_parquet(self.data_file)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        os.environ.pop('NEW_SOURCE_TYPE_NAME', None)
+
+    def test_benchmark(self) -> None:
+        for name, (sensor_class, environment, conversions) in SENSORS.items():
+            os.environ.pop('NEW_SOURCE_TYPE_NAME', None)
+            os.environ.update(environment)
+            sensor = sensor_class()
+            start = time.perf_counter()
+            df = sensor.data_conversion(self.data_file)
+            vectorized_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            source = pd.read_parquet(self.data_file)
+            for output, column, function, dtype in conversions:
+                expected = source[column].apply(function).astype(dtype)
+                pd.testing.assert_series_equal(df[output], expected, check_names=False)
+            scalar_elapsed = time.perf_counter() - start
+            print(f'\n{name}: {self.row_count} rows, per-element {scalar_elapsed:.3f}s, '
+                  f'vectorized {vectorized_elapsed:.3f}s')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import pyarrow.parquet as pq
+import pyarrow.compute as pc
 import pyarrow as pa
 from pathlib import Path
 import structlog
@@ -55,6 +56,33 @@ def populate_columns(table: pa.Table, field_names: List[str],
             new_columns[field_name_index].append(value)
 
 
+def explode_columns(data_array: pa.ChunkedArray, field_count: int) -> List[pa.Array]:
+    """
+    Split a list column into one typed column per array index using Arrow compute.
+
+    Produces the same values as populate_columns: a NULL array or an array shorter
+    than the number of field names yields None for the missing positions.
+
+    :param data_array: The original data array.
+    :param field_count: The number of columns to create.
+    :return: The new columns, one per array index.
+    """
+    if data_array.num_chunks == 0:
+        return [pa.array([], data_array.type.value_type) for n in range(0, field_count)]
+    list_array = data_array.combine_chunks()
+    offsets = list_array.offsets.slice(0, len(list_array))
+    offset_type = offsets.type
+    # NULL arrays have a NULL length, treat them as empty
+    lengths = pc.fill_null(pc.list_value_length(list_array), 0)
+    values = list_array.values
+    columns: List[pa.Array] = []
+    for index in range(0, field_count):
+        positions = pc.add(offsets, pa.scalar(index, offset_type))
+        indices = pc.if_else(pc.greater(lengths, index), positions, pa.scalar(None, offset_type))
+        columns.append(values.take(indices))
+    return columns
+
+
 def write_restructured_file(path: Path, out_path: Path, schema: Path, replace_schema_name: bool, write_site_file: bool) -> None:
     """
     Reorder the data value array to columns labelled with the appropriate schema field names
@@ -84,14 +112,9 @@ def write_restructured_file(path: Path, out_path: Path, schema: Path, replace_sc
         column_index = column_names.index(array_name)
         data_values = table.column(column_index)
         array_field_names=[key for key, value in schema_data.data_mapping.items() if value == array_name] # field names pertaining to this array
-        parsed_columns: List[list] = create_columns(array_field_names)
-        data_type: pa.lib.ListType = data_values.type
-        populate_columns(table, array_field_names, data_values, parsed_columns)
-        
-        # convert to arrays with the appropriate type
+        parsed_columns: List[pa.Array] = explode_columns(data_values, len(array_field_names))
         for i in range(0, len(parsed_columns)):
-            column: pa.Array = pa.array(parsed_columns[i], data_type.value_type)
-            table: pa.Table = table.append_column(array_field_names[i], column)  # add column to table
+            table: pa.Table = table.append_column(array_field_names[i], parsed_columns[i])  # add column to table
     
     # remove original data arrays from table
     for array_name in array_names:
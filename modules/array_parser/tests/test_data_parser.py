@@ -3,6 +3,8 @@ import os
 import sys
 from pathlib import Path
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pyfakefs.fake_filesystem_unittest import TestCase
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
@@ -22,3 +24,27 @@ class DataParserTest(TestCase):
     def test_data_parser(self) -> None:
         data_file_parser.write_restructured_file(self.data_file_path, self.out_path, self.schema_file_path, self.replace_schema_name, self.write_site_file)
         Path(self.out_path, 'tchain_parsed_32610_2019-01-12.parquet').unlink()
+
+    def test_explode_columns(self) -> None:
+        data_array = pa.chunked_array([
+            pa.array([[1.0, 2.0, 3.0], None, [4.0]], pa.list_(pa.float32())),
+            pa.array([[5.0, None, 6.0, 7.0], []], pa.list_(pa.float32())).slice(0, 2)
+        ])
+        table = pa.table({'data': data_array})
+        field_names = ['a', 'b', 'c']
+        expected = data_file_parser.create_columns(field_names)
+        data_file_parser.populate_columns(table, field_names, data_array, expected)
+        columns = data_file_parser.explode_columns(data_array, len(field_names))
+        for i in range(0, len(field_names)):
+            self.assertEqual(columns[i].type, pa.float32())
+            self.assertEqual(columns[i].to_pylist(), expected[i])
+
+    def test_explode_columns_file(self) -> None:
+        table = pq.read_table(self.data_file_path)
+        data_array = table.column('water_temperature')
+        field_names = [f'depth{n}WaterTemp' for n in range(0, 11)]
+        expected = data_file_parser.create_columns(field_names)
+        data_file_parser.populate_columns(table, field_names, data_array, expected)
+        columns = data_file_parser.explode_columns(data_array, len(field_names))
+        for i in range(0, len(field_names)):
+            self.assertEqual(columns[i].to_pylist(), expected[i])
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+import tempfile
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import array_parser.data_file_parser as data_file_parser
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Benchmark skipped due to long process time.')
+class DataParserBenchmarkTest(unittest.TestCase):
+    """Compare the per-cell and Arrow explode paths on one day of 1 Hz array data."""
+
+    def setUp(self) -> None:
+        self.row_count = 86400
+        self.field_count = 11
+        self.temp_dir = tempfile.TemporaryDirectory()
+        values = []
+        for row in range(0, self.row_count):
+            if row % 1000 == 0:
+                values.append(None)
+            elif row % 10 == 0:
+                values.append([float(row)] * (self.field_count - 3))
+            else:
+                values.append([float(row)] * self.field_count)
+        table = pa.table({'source_id': pa.array(['32610'] * self.row_count),
+                          'site_id': pa.array(['BARC'] * self.row_count),
+                          'readout_time': pa.array(range(0, self.row_count * 1000, 1000), pa.timestamp('ms')),
+                          'water_temperature': pa.array(values, pa.list_(pa.float32()))})
+        self.data_file_path = Path(self.temp_dir.name, 'tchain_32610_2019-01-12.parquet')
+        pq.write_table(table, self.data_file_path)
+        self.field_names = [f'depth{n}WaterTemp' for n in range(0, self.field_count)]
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_benchmark(self) -> None:
+        table = pq.read_table(self.data_file_path)
+        data_array = table.column('water_temperature')
+        data_type = data_array.type
+
+        start = time.perf_counter()
+        python_columns = data_file_parser.create_columns(self.field_names)
+        data_file_parser.populate_columns(table, self.field_names, data_array, python_columns)
+        python_columns = [pa.array(column, data_type.value_type) for column in python_columns]
+        python_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        arrow_columns = data_file_parser.explode_columns(data_array, len(self.field_names))
+        arrow_elapsed = time.perf_counter() - start
+
+        for i in range(0, len(self.field_names)):
+            self.assertTrue(arrow_columns[i].equals(python_columns[i]))
+        print(f'\n{self.row_count} rows x {self.field_count} fields: '
+              f'per-cell {python_elapsed:.3f}s, arrow {arrow_elapsed:.3f}s, '
+              f'speedup {python_elapsed / arrow_elapsed:.0f}x')
+        self.assertLess(arrow_elapsed, python_elapsed)
+
+
+if __name__ == '__main__':
+    unittest.main()
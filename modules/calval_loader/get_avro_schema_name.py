@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 from contextlib import closing
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
 import logging
 
 
@@ -29,3 +29,31 @@ def get_avro_schema_name(connection, asset_uid : int) -> Optional[list]:
         #avro_schema_name = row[0]
         #print(f'avro_schema_name: {avro_schema_name}')
     return avro_schema_name
+
+
+def get_avro_schema_names(connection, asset_uids: Iterable[int]) -> Dict[int, List[str]]:
+    """
+    Return the Avro schema names of many assets in one query.
+
+    :param connection: The database connection
+    :param asset_uids: The asset UIDs
+    :return: The schema names by asset UID. Assets without a schema are not included.
+    """
+    sql = '''
+         select 
+            distinct iaa2.asset_uid, ist.avro_schema_name
+         from 
+            is_sensor_type ist, is_asset_definition iad2, is_asset_assignment iaa2
+        where 
+            iad2.asset_definition_uuid = iaa2.asset_definition_uuid 
+        and 
+            ist.sensor_type_name = iad2.sensor_type_name 
+        and 
+            iaa2.asset_uid = any(%(asset_uids)s)
+    '''
+    schema_names: Dict[int, List[str]] = {}
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, dict(asset_uids=sorted(set(asset_uids))))
+        for asset_uid, avro_schema_name in cursor.fetchall():
+            schema_names.setdefault(asset_uid, []).append(avro_schema_name)
+    return schema_names
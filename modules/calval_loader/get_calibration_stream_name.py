@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 import logging
-from typing import Optional
+from typing import Dict, Optional
 
 from contextlib import closing
 
@@ -40,3 +40,33 @@ def get_calibration_stream_name(connection, schema_name: str, stream_number: int
         stream_name = row[0]
         # print(f'asset_type: {schema_name}    stream_name: {stream_name}')
     return stream_name
+
+
+def get_calibration_stream_names(connection, schema_name: str) -> Dict[str, str]:
+    """
+    Return all calibration stream names of an asset type in one query.
+
+    :param connection: The database connection
+    :param schema_name: The schema name of the data
+    :return: The stream names by calibration stream number
+    """
+    sql = '''
+        select distinct
+            is_ingest_term.stream_id, is_ingest_term.schema_field_name
+        from
+            is_ingest_term
+        join
+            is_asset_definition
+        on
+            is_asset_definition.asset_definition_uuid = is_ingest_term.asset_definition_uuid
+        join is_sensor_type ist
+        on is_asset_definition.sensor_type_name = ist.sensor_type_name
+        and
+            ist.avro_schema_name = %(avro_schema_name)s
+    '''
+    stream_names: Dict[str, str] = {}
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, dict(avro_schema_name=schema_name))
+        for stream_number, stream_name in cursor.fetchall():
+            stream_names.setdefault(str(stream_number), stream_name)
+    return stream_names
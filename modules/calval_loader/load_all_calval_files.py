@@ -1,16 +1,25 @@
 #!/usr/bin/env python3
 import os
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import closing
 from pathlib import Path
 import environs
 import xml.etree.ElementTree as ET
 import sys
-from calval_loader.get_avro_schema_name import get_avro_schema_name
-from calval_loader.get_calibration_stream_name import get_calibration_stream_name
+from typing import Dict, List, NamedTuple, Optional
+from calval_loader.get_avro_schema_name import get_avro_schema_names
+from calval_loader.get_calibration_stream_name import get_calibration_stream_names
 from google.cloud import storage
 from data_access.db_config_reader import read_from_mount
 from data_access.db_connector import DbConnector
-import datetime
+
+
+class CalvalFile(NamedTuple):
+    """A calibration file read from the bucket."""
+    filename: str
+    asset_id: str
+    stream_id: str
+    content: bytes
 
 
 def load() -> None:
@@ -21,48 +30,122 @@ def load() -> None:
     output_directory: Path = env.path('OUT_PATH')
     sensor_type = env.str('SOURCE_TYPE')
     schema_name = env.str('SCHEMA_NAME',sensor_type)
+    download_workers = env.int('DOWNLOAD_WORKERS', 8) # Number of concurrent downloads
     db_config = read_from_mount(Path('/var/db_secret'))
     storage_client = storage.Client()
     ingest_bucket = storage_client.bucket(ingest_bucket_name)
     starting_path_index: int = env.int('STARTING_PATH_INDEX')
     with closing(DbConnector(db_config)) as connector:
-        now = datetime.datetime.now()
-        try:
-            data_path_start = Path(*in_path.parts[0:starting_path_index + 1])  # starting index
-            print("Starting New Datum in the load_al_calval_files pipeline ")
-            for path in data_path_start.rglob('*'):
-                if path.is_file():
-                    print("Path value is: ", path)
-                    pathname, extension = os.path.splitext(path)
-
-                    filename = pathname.split('/')
-
-                    filename = filename[-1] + ".xml"
-                    print("FileName is: ", filename)
-                    blob = ingest_bucket.get_blob(filename)
-
-                    with blob.open("r") as f:
-                        root = ET.fromstring(blob.download_as_string())
-                        asset_id = root.find('SensorID').find('MxAssetID').text
-                        avro_schema_name = get_avro_schema_name(connector.get_connection(), asset_id)
-                        if ((avro_schema_name != None) and (schema_name in avro_schema_name)):
-                            stream_id = root.find('StreamCalVal').find('StreamID').text
-                            stream_name = get_calibration_stream_name(connector.get_connection(), schema_name,
-                                                                      stream_id)
-                            print('schema name , asset_id, stream_id, stream_name, filename are :', schema_name, "  ", asset_id,
-                                  "  ", stream_id, " ", stream_name, " ", filename)
-                            try:
-                                output_path = Path(output_directory, sensor_type, asset_id, stream_name, filename)
-                                output_path.parent.mkdir(parents=True, exist_ok=True)
-                                # print('Output Path is:', output_path)
-                                with open(output_path, "wb") as output_file:
-                                    output_file.write(blob.download_as_string())
-                            except Exception:
-                                exc_type, exc_obj, exc_tb = sys.exc_info()
-                                print("Exception at line " + str(exc_tb.tb_lineno) + ": " + str(sys.exc_info()))
-        except Exception:
-            exception_type, exception_obj, exception_tb = sys.exc_info()
-            print("Exception at line " + str(exception_tb.tb_lineno) + ": " + str(sys.exc_info()))
+        data_path_start = Path(*in_path.parts[0:starting_path_index + 1])  # starting index
+        print("Starting New Datum in the load_al_calval_files pipeline ")
+        filenames = get_filenames(data_path_start)
+        load_files(ingest_bucket, connector.get_connection(), filenames, output_directory, sensor_type, schema_name,
+                   download_workers)
+
+
+def get_filenames(data_path: Path) -> List[str]:
+    """Return the calibration file name of each trigger file under the data path, in order and without duplicates."""
+    filenames = {}
+    for path in data_path.rglob('*'):
+        if path.is_file():
+            print("Path value is: ", path)
+            pathname, extension = os.path.splitext(path)
+            filenames[pathname.split('/')[-1] + ".xml"] = None
+    return list(filenames)
+
+
+def load_files(bucket, connection, filenames: List[str], output_directory: Path, sensor_type: str,
+               schema_name: str, workers: int = 8) -> int:
+    """
+    Fetch and parse calibration files concurrently, look up the schema and stream names of all of them
+    in two queries, and write the files of the schema under their asset and stream.
+
+    :param bucket: The calibration bucket.
+    :param connection: The database connection.
+    :param filenames: The calibration file names.
+    :param output_directory: The output root.
+    :param sensor_type: The sensor type directory name.
+    :param schema_name: The Avro schema name of the sensor type.
+    :param workers: The number of concurrent downloads and writes.
+    :return: The number of files written.
+    """
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        fetched = executor.map(lambda filename: fetch_calval_file(bucket, filename), filenames)
+        calval_files = [calval_file for calval_file in fetched if calval_file is not None]
+        asset_uids = [int(calval_file.asset_id) for calval_file in calval_files if calval_file.asset_id.isdigit()]
+        schema_names = get_avro_schema_names(connection, asset_uids) if asset_uids else {}
+        stream_names = get_calibration_stream_names(connection, schema_name) if calval_files else {}
+        outputs = []
+        for calval_file in calval_files:
+            output_path = get_output_path(calval_file, schema_names, stream_names, schema_name, output_directory,
+                                          sensor_type)
+            if output_path is not None:
+                outputs.append((output_path, calval_file.content))
+        written = sum(executor.map(write_calval_file, *zip(*outputs))) if outputs else 0
+    print(f'Wrote {written} of {len(calval_files)} calibration files.')
+    return written
+
+
+def fetch_calval_file(bucket, filename: str) -> Optional[CalvalFile]:
+    """Download and parse a calibration file, returning None if it cannot be read."""
+    try:
+        blob = bucket.get_blob(filename)
+        if blob is None:
+            print("Calibration file not found: ", filename)
+            return None
+        return read_calval_file(filename, blob.download_as_bytes())
+    except Exception:
+        exc_type, exc_obj, exc_tb = sys.exc_info()
+        print("Exception at line " + str(exc_tb.tb_lineno) + ": " + str(sys.exc_info()))
+        return None
+
+
+def read_calval_file(filename: str, content: bytes) -> CalvalFile:
+    """Parse the asset and calibration stream of a calibration file."""
+    root = ET.fromstring(content)
+    asset_id = root.find('SensorID').find('MxAssetID').text
+    stream_id = root.find('StreamCalVal').find('StreamID').text
+    return CalvalFile(filename=filename, asset_id=asset_id, stream_id=stream_id, content=content)
+
+
+def get_output_path(calval_file: CalvalFile, schema_names: Dict[int, List[str]], stream_names: Dict[str, str],
+                    schema_name: str, output_directory: Path, sensor_type: str) -> Optional[Path]:
+    """
+    Return the output path of a calibration file, or None if its asset is not of the schema
+    or its stream is unknown.
+
+    :param calval_file: The calibration file.
+    :param schema_names: The Avro schema names by asset UID.
+    :param stream_names: The stream names of the schema by stream number.
+    :param schema_name: The Avro schema name of the sensor type.
+    :param output_directory: The output root.
+    :param sensor_type: The sensor type directory name.
+    :return: The output path.
+    """
+    asset_id = calval_file.asset_id
+    if not asset_id.isdigit() or schema_name not in schema_names.get(int(asset_id), []):
+        return None
+    stream_name = stream_names.get(calval_file.stream_id)
+    print('schema name , asset_id, stream_id, stream_name, filename are :', schema_name, "  ", asset_id,
+          "  ", calval_file.stream_id, " ", stream_name, " ", calval_file.filename)
+    if stream_name is None:
+        print(f'Stream name not found for stream ID {calval_file.stream_id} and asset type {schema_name}.')
+        return None
+    return Path(output_directory, sensor_type, asset_id, stream_name, calval_file.filename)
+
+
+def write_calval_file(output_path: Path, content: bytes) -> bool:
+    """Write a calibration file, returning false if it could not be written."""
+    try:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        # print('Output Path is:', output_path)
+        with open(output_path, "wb") as output_file:
+            output_file.write(content)
+        return True
+    except Exception:
+        exc_type, exc_obj, exc_tb = sys.exc_info()
+        print("Exception at line " + str(exc_tb.tb_lineno) + ": " + str(sys.exc_info()))
+        return False
 
 
 if __name__ == '__main__':
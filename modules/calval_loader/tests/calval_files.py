@@ -0,0 +1,7 @@
+#!/usr/bin/env python3
+
+
+def calval_xml(asset_id: int, stream_id: int) -> bytes:
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="no" ?><CalVal>'
+            f'<SensorID><MxAssetID>{asset_id}</MxAssetID></SensorID>'
+            f'<StreamCalVal><StreamID>{stream_id}</StreamID></StreamCalVal></CalVal>').encode()
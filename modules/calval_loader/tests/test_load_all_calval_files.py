@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+import unittest
+from pathlib import Path
+
+from testfixtures import TempDirectory
+
+from calval_loader.load_all_calval_files import get_filenames, load_files, read_calval_file
+from calval_loader.tests.calval_files import calval_xml
+from common.tests.fake_bucket import FakeBucket
+from data_access.tests.fake_connector import FakeConnector
+
+
+class LoadAllCalvalFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = TempDirectory()
+        self.out_path = Path(self.temp_dir.path, 'out')
+        self.contents = {
+            '1_WO1_1.xml': calval_xml(8125, 0),
+            '2_WO1_1.xml': calval_xml(8125, 1),
+            '3_WO1_1.xml': calval_xml(9000, 0),  # another schema
+            '4_WO1_1.xml': calval_xml(8126, 7),  # unknown stream
+            '5_WO1_1.xml': b'<CalVal>',  # not parsable
+        }
+        self.bucket = FakeBucket(self.contents)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def handler(sql: str, parameters):
+        if 'asset_uid' in sql:
+            schema_names = {8125: ['exo2'], 8126: ['exo2'], 9000: ['prt']}
+            return [(uid, name) for uid in parameters['asset_uids'] for name in schema_names.get(uid, [])]
+        return [(0, 'conductance'), (1, 'temperature')]
+
+    def test_load_files(self):
+        connector = FakeConnector(self.handler)
+        filenames = sorted(self.contents) + ['6_WO1_1.xml']  # missing from the bucket
+        written = load_files(self.bucket, connector.get_connection(), filenames, self.out_path, 'exo2', 'exo2',
+                             workers=4)
+        self.assertEqual(2, written)
+        # one query for the schema names of all assets and one for the stream names
+        self.assertEqual(2, connector.query_count)
+        self.assertEqual(self.contents['1_WO1_1.xml'],
+                         Path(self.out_path, 'exo2/8125/conductance/1_WO1_1.xml').read_bytes())
+        self.assertEqual(self.contents['2_WO1_1.xml'],
+                         Path(self.out_path, 'exo2/8125/temperature/2_WO1_1.xml').read_bytes())
+        files = [path for path in self.out_path.rglob('*') if path.is_file()]
+        self.assertEqual(2, len(files))
+        # each file is downloaded once
+        self.assertEqual(sorted(self.contents), sorted(self.bucket.downloads))
+
+    def test_read_calval_file(self):
+        path = Path(Path(__file__).parent, '10000000000084_WO21814_120104.xml')
+        calval_file = read_calval_file(path.name, path.read_bytes())
+        self.assertEqual('8125', calval_file.asset_id)
+        self.assertEqual('0', calval_file.stream_id)
+
+    def test_get_filenames(self):
+        self.temp_dir.write('in/exo2/2023/01/1_WO1_1.txt', b'')
+        self.temp_dir.write('in/exo2/2023/02/1_WO1_1.txt', b'')
+        self.temp_dir.write('in/exo2/2023/02/2_WO1_1.txt', b'')
+        self.assertEqual(['1_WO1_1.xml', '2_WO1_1.xml'], sorted(get_filenames(Path(self.temp_dir.path, 'in'))))
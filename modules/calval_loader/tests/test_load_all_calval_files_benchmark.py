@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from calval_loader.load_all_calval_files import load_files
+from calval_loader.tests.calval_files import calval_xml
+from common.tests.fake_bucket import FakeBucket
+from data_access.tests.fake_connector import FakeConnector
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Benchmark skipped due to long process time.')
+class LoadAllCalvalFilesBenchmarkTest(unittest.TestCase):
+    """Time loading calibration files from a bucket with 5ms of latency per download."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def handler(sql: str, parameters):
+        if 'asset_uid' in sql:
+            return [(uid, 'exo2') for uid in parameters['asset_uids']]
+        return [(stream_id, f'stream{stream_id}') for stream_id in range(10)]
+
+    def test_throughput(self):
+        for file_count in [100, 1000, 4000]:
+            contents = {f'{n}_WO1_1.xml': calval_xml(n % 500, n % 10) for n in range(file_count)}
+            for workers in [1, 16]:
+                bucket = FakeBucket(contents, latency=0.005)
+                connector = FakeConnector(self.handler)
+                out_path = Path(self.temp_dir.name, f'{file_count}_{workers}')
+                start = time.perf_counter()
+                written = load_files(bucket, connector.get_connection(), list(contents), out_path, 'exo2', 'exo2',
+                                     workers=workers)
+                elapsed = time.perf_counter() - start
+                self.assertEqual(file_count, written)
+                print(f'{file_count} files with {workers} workers: {elapsed:.2f}s, '
+                      f'{file_count / elapsed:.0f} files/s, {connector.query_count} queries')
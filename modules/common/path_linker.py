@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Set, Tuple
+
+import structlog
+
+log = structlog.get_logger()
+
+
+def walk_files(path: Path) -> Iterator[Path]:
+    """
+    Yield the files in a directory and its subdirectories, like rglob('*') filtered by is_file(),
+    using the file types os.scandir reads with the directory entries.
+
+    :param path: The directory.
+    :return: The file paths.
+    """
+    if not os.path.isdir(path):
+        return
+    directories = [str(path)]
+    while directories:
+        subdirectories = []
+        with os.scandir(directories.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif entry.is_file():
+                    yield Path(entry.path)
+        directories.extend(reversed(subdirectories))
+
+
+class PathLinker:
+    """Link or copy files into an output directory, creating each output directory once."""
+
+    def __init__(self, symlink: bool = True, workers: int = 1) -> None:
+        """
+        Constructor.
+
+        :param symlink: Link files if true, copy them otherwise.
+        :param workers: The number of threads creating links, for network filesystems.
+        """
+        self.symlink = symlink
+        self.workers = workers
+        self.created_dirs: Set[str] = set()
+        self.lock = threading.Lock()
+
+    def link(self, path: Path, link_path: Path) -> bool:
+        """
+        Link a file unless the link path is already taken.
+
+        :param path: The source file.
+        :param link_path: The link to create.
+        :return: True if the link was created.
+        """
+        self.make_parent(link_path)
+        log.debug(f'path: {path} link: {link_path}')
+        if self.symlink:
+            try:
+                os.symlink(path, link_path)
+            except FileExistsError:
+                return False
+        else:
+            if os.path.exists(link_path):
+                return False
+            shutil.copy2(path, link_path)
+        return True
+
+    def link_all(self, links: Iterable[Tuple[Path, Path]]) -> int:
+        """
+        Link many files, fanning out to a thread pool when workers is greater than one.
+
+        :param links: Source and link paths.
+        :return: The number of links created.
+        """
+        if self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                return sum(executor.map(lambda link: self.link(*link), links))
+        return sum(self.link(path, link_path) for path, link_path in links)
+
+    def make_parent(self, link_path: Path) -> None:
+        """Create the parent directory of a link if this linker has not created it yet."""
+        self.make_dirs(os.path.dirname(link_path))
+
+    def make_dirs(self, path: Path) -> None:
+        """Create a directory if this linker has not created it yet."""
+        path = str(path)
+        if path not in self.created_dirs:
+            os.makedirs(path, exist_ok=True)
+            with self.lock:
+                self.created_dirs.add(path)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+from typing import Dict, List, Optional
+
+from common.tests.fake_service import FakeService
+
+
+class FakeBlob:
+
+    def __init__(self, bucket: 'FakeBucket', name: str) -> None:
+        self.bucket = bucket
+        self.name = name
+
+    def download_to_filename(self, filename: str) -> None:
+        with self.bucket.request():
+            data = self.download()
+            with open(filename, 'wb') as f:
+                f.write(data[:10])
+                if self.name in self.bucket.broken:
+                    raise ConnectionError(f'Connection reset downloading {self.name}')
+                f.write(data[10:])
+
+    def download_as_bytes(self) -> bytes:
+        with self.bucket.request():
+            return self.download()
+
+    def download(self) -> bytes:
+        self.bucket.downloads.append(self.name)
+        with self.bucket.lock:
+            if self.bucket.failures.get(self.name, 0) > 0:
+                self.bucket.failures[self.name] -= 1
+                raise ConnectionError(f'Transient failure downloading {self.name}')
+        return self.bucket.contents[self.name]
+
+
+class FakeBucket(FakeService):
+    """
+    Stand-in for a storage bucket holding blobs in memory. Downloads of a blob named in failures fail
+    before writing, as many times as given; downloads of a blob in broken fail after a partial write.
+    """
+
+    def __init__(self, contents: Dict[str, bytes], latency: float = 0) -> None:
+        super().__init__(latency)
+        self.contents = contents
+        self.failures: Dict[str, int] = {}
+        self.broken = set()
+        self.downloads: List[str] = []
+        self.listings = 0
+
+    def list_blobs(self, prefix: str) -> List[FakeBlob]:
+        self.listings += 1
+        return [FakeBlob(self, name) for name in sorted(self.contents) if name.startswith(prefix)]
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self, name)
+
+    def get_blob(self, name: str) -> Optional[FakeBlob]:
+        return FakeBlob(self, name) if name in self.contents else None
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+import threading
+import time
+from contextlib import contextmanager
+
+
+class FakeService:
+    """Base for stand-in remote services, adding an optional latency per request and tracking concurrent requests."""
+
+    def __init__(self, latency: float = 0) -> None:
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    @contextmanager
+    def request(self):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            yield
+        finally:
+            with self.lock:
+                self.active -= 1
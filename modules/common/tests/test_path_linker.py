@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+import os
+from pathlib import Path
+
+from pyfakefs.fake_filesystem_unittest import TestCase
+
+from common.path_linker import PathLinker, walk_files
+
+
+class PathLinkerTest(TestCase):
+
+    def setUp(self):
+        self.setUpPyfakefs()
+        self.in_path = Path('/in/prt/2019/01/01')
+        self.out_path = Path('/out')
+        self.paths = [Path(self.in_path, 'CFGLOC1/data/prt_CFGLOC1_2019-01-01.parquet'),
+                      Path(self.in_path, 'CFGLOC1/location/CFGLOC1.json'),
+                      Path(self.in_path, 'CFGLOC2/data/prt_CFGLOC2_2019-01-01.parquet')]
+        for path in self.paths:
+            self.fs.create_file(path, contents=path.name)
+        self.fs.create_dir(Path(self.in_path, 'CFGLOC3/data'))
+
+    def test_walk_files(self):
+        self.assertEqual(sorted(self.paths), sorted(walk_files(self.in_path)))
+        self.assertEqual(sorted(self.in_path.rglob('*.*')), sorted(walk_files(self.in_path)))
+        self.assertEqual([], list(walk_files(Path('/in/missing'))))
+        self.assertEqual([], list(walk_files(self.paths[0])))
+
+    def test_link_all(self):
+        for workers in [1, 4]:
+            out_path = Path(self.out_path, str(workers))
+            linker = PathLinker(workers=workers)
+            links = [(path, Path(out_path, *path.parts[2:])) for path in walk_files(self.in_path)]
+            self.assertEqual(3, linker.link_all(links))
+            # existing links are left in place
+            self.assertEqual(0, linker.link_all(links))
+            for path, link_path in links:
+                self.assertTrue(link_path.is_symlink())
+                self.assertEqual(path, Path(os.readlink(link_path)))
+            self.assertEqual({str(link_path.parent) for path, link_path in links}, linker.created_dirs)
+
+    def test_copy(self):
+        linker = PathLinker(symlink=False)
+        link_path = Path(self.out_path, 'data', self.paths[0].name)
+        self.assertTrue(linker.link(self.paths[0], link_path))
+        self.assertFalse(linker.link(self.paths[0], link_path))
+        self.assertFalse(link_path.is_symlink())
+        self.assertEqual(self.paths[0].name, link_path.read_text())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import common.log_config as log_config
+from common.path_linker import PathLinker, walk_files
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Benchmark skipped due to long process time.')
+class PathLinkerBenchmarkTest(unittest.TestCase):
+    """Time linking 100k files with rglob and pathlib against the link engine."""
+
+    def setUp(self):
+        log_config.configure('INFO')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.in_path = Path(self.temp_dir.name, 'in', 'prt', '2019', '01', '01')
+        self.file_count = 0
+        for location in range(0, 1000):
+            for data_type in ['data', 'flags', 'location', 'uncertainty_coef']:
+                path = Path(self.in_path, f'CFGLOC{location}', data_type)
+                path.mkdir(parents=True)
+                for n in range(0, 25):
+                    Path(path, f'prt_CFGLOC{location}_{n}.parquet').touch()
+                    self.file_count += 1
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_link(self):
+        out_path = Path(self.temp_dir.name, 'out_pathlib')
+        start = time.perf_counter()
+        for path in self.in_path.rglob('*'):
+            if path.is_file():
+                link_path = Path(out_path, *path.parts[3:])
+                link_path.parent.mkdir(parents=True, exist_ok=True)
+                if not link_path.exists():
+                    link_path.symlink_to(path)
+        pathlib_time = time.perf_counter() - start
+        for workers in [1, 8]:
+            out_path = Path(self.temp_dir.name, f'out_{workers}')
+            start = time.perf_counter()
+            count = PathLinker(workers=workers).link_all((path, Path(out_path, *path.parts[3:]))
+                                                         for path in walk_files(self.in_path))
+            engine_time = time.perf_counter() - start
+            self.assertEqual(self.file_count, count)
+            print(f'\n{self.file_count} files: pathlib {pathlib_time:.2f}s, '
+                  f'engine with {workers} workers {engine_time:.2f}s')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+from pathlib import Path
+
+from pyfakefs.fake_filesystem_unittest import TestCase
+
+import common.workbook_index as workbook_index
+
+HEADER = ['table', 'fieldName', 'rank', 'downloadPkg', 'pubFormat', 'dataCategory', 'DPNumber', 'dpID']
+ROWS = [['table001', 'endDateTime', '2', 'basic', "yyyy-MM-dd'T'HH:mm:ss'Z'(floor)", 'N',
+         'NEON.DOM.SITE.DP1.00066.001.01234.HOR.VER.001', 'NEON.DOM.SITE.DP1.00066.001'],
+        ['table001', 'startDateTime', '1', 'basic', "yyyy-MM-dd'T'HH:mm:ss'Z'(floor)", 'N',
+         'NEON.DOM.SITE.DP1.00066.001.01234.HOR.VER.001', 'NEON.DOM.SITE.DP1.00066.001'],
+        ['table001', 'mean', '3', 'basic', 'signif_###(round)', 'Y',
+         'NEON.DOM.SITE.DP1.00066.001.01234.HOR.VER.001', 'NEON.DOM.SITE.DP1.00066.001'],
+        ['table001', 'numPts', '4', 'expanded', 'integer', 'Y',
+         'NEON.DOM.SITE.DP1.00066.001.01234.HOR.VER.001', 'NEON.DOM.SITE.DP1.00066.001'],
+        ['table001', 'mean', '5', 'none', 'asIs', 'Y', '', 'NEON.DOM.SITE.DP1.00066.001'],
+        ['table002', 'remarks', '1', 'none', 'asIs', 'N', '', 'NEON.DOM.SITE.DP1.00066.001']]
+
+
+class WorkbookIndexTest(TestCase):
+
+    def setUp(self):
+        self.setUpPyfakefs()
+        self.workbook_path = Path('/workbooks')
+        self.path = Path(self.workbook_path, 'publication_workbook_NEON.DOM.SITE.DP1.00066.001.txt')
+        self.fs.create_file(self.path, contents='\n'.join('\t'.join(row) for row in [HEADER] + ROWS) + '\n')
+
+    def test_read_workbook(self):
+        workbook = workbook_index.read_workbook(self.path)
+        self.assertEqual({'NEON.DOM.SITE.DP1.00066.001'}, workbook.dp_ids)
+        self.assertEqual(['table001', 'table002'], list(workbook.tables))
+        table = workbook.tables['table001']
+        self.assertEqual(['endDateTime', 'startDateTime', 'mean', 'numPts', 'mean'], table.field_names)
+        self.assertEqual('signif_###(round)', table.formats['mean'])
+        self.assertTrue(table.has_package('basic'))
+        self.assertTrue(table.has_package('expanded'))
+        self.assertEqual(['startDateTime', 'endDateTime', 'mean'], table.package_field_names['basic'])
+        self.assertEqual(['startDateTime', 'endDateTime', 'mean', 'numPts'], table.package_field_names['expanded'])
+        self.assertEqual(['mean'], table.data_field_names['basic'])
+        self.assertEqual(['mean', 'numPts'], table.data_field_names['expanded'])
+        self.assertEqual(4, len(table.package_rows['expanded']))
+        self.assertEqual(['NEON.DOM.SITE.DP1.00066.001.01234.HOR.VER.001'] * 4, table.dp_numbers)
+        self.assertFalse(workbook.tables['table002'].has_package('basic'))
+
+    def test_cache(self):
+        workbook = workbook_index.read_workbook(self.path)
+        self.assertIs(workbook, workbook_index.read_workbook(self.path))
+        self.assertIs(workbook, workbook_index.read_workbooks(self.workbook_path)['NEON.DOM.SITE.DP1.00066.001'])
+        self.assertIs(workbook, workbook_index.find_workbook(self.workbook_path, self.path.name))
+        self.assertIsNone(workbook_index.find_workbook(self.workbook_path, 'missing.txt'))
+        # a changed workbook is read again
+        self.fs.remove(self.path)
+        self.fs.create_file(self.path, contents='\t'.join(HEADER) + '\n' + '\t'.join(ROWS[0]) + '\n')
+        self.assertEqual(['table001'], list(workbook_index.read_workbook(self.path).tables))
+
+    def test_workbook_added_to_subdirectory(self):
+        # adding a file to an existing subdirectory leaves the top directory unchanged
+        self.fs.create_dir(Path(self.workbook_path, 'new'))
+        self.assertIsNone(workbook_index.find_workbook(self.workbook_path, 'publication_workbook_new.txt'))
+        path = Path(self.workbook_path, 'new', 'publication_workbook_new.txt')
+        rows = [row[:-1] + ['NEON.DOM.SITE.DP1.00098.001'] for row in ROWS]
+        self.fs.create_file(path, contents='\n'.join('\t'.join(row) for row in [HEADER] + rows) + '\n')
+        self.assertEqual(path, workbook_index.find_workbook(self.workbook_path, path.name).path)
+        self.assertIn('NEON.DOM.SITE.DP1.00098.001', workbook_index.read_workbooks(self.workbook_path))
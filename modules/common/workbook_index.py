@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+import csv
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import structlog
+
+log = structlog.get_logger()
+
+# download package type to the workbook downloadPkg values it publishes
+PACKAGE_TYPES = {'basic': {'basic'}, 'expanded': {'basic', 'expanded'}}
+# the number of parsed workbook files held per process
+WORKBOOK_CACHE_SIZE = 64
+
+
+class WorkbookTable(NamedTuple):
+    """The publication workbook rows of one table, indexed for publication."""
+    name: str
+    rows: List[dict]
+    # all field names in workbook order
+    field_names: List[str]
+    # the first publication format listed for each field
+    formats: Dict[str, str]
+    # the downloadPkg value of each row
+    download_packages: List[str]
+    # rows in workbook order, field names in rank order and data field names (dataCategory 'Y') by package type
+    package_rows: Dict[str, List[dict]]
+    package_field_names: Dict[str, List[str]]
+    data_field_names: Dict[str, List[str]]
+    # the full 45 character data product numbers
+    dp_numbers: List[str]
+
+    def has_package(self, package_type: str) -> bool:
+        """Return true if any row's downloadPkg contains the package type."""
+        return any(package_type in download_package for download_package in self.download_packages)
+
+
+class WorkbookIndex(NamedTuple):
+    """A publication workbook file indexed by table."""
+    path: Path
+    rows: List[dict]
+    dp_ids: Set[str]
+    # tables in order of first appearance
+    tables: Dict[str, WorkbookTable]
+
+
+def index_workbook(path: Path, rows: List[dict]) -> WorkbookIndex:
+    """
+    Index publication workbook rows.
+
+    :param path: The workbook file.
+    :param rows: The workbook rows.
+    :return: The index.
+    """
+    rows_by_table: Dict[str, List[dict]] = {}
+    for row in rows:
+        rows_by_table.setdefault(row['table'], []).append(row)
+    tables = {name: index_table(name, table_rows) for name, table_rows in rows_by_table.items()}
+    return WorkbookIndex(path=path, rows=rows, dp_ids={row['dpID'] for row in rows}, tables=tables)
+
+
+def index_table(name: str, rows: List[dict]) -> WorkbookTable:
+    formats: Dict[str, str] = {}
+    for row in rows:
+        formats.setdefault(row['fieldName'], row['pubFormat'])
+    package_rows = {}
+    package_field_names = {}
+    data_field_names = {}
+    for package_type, download_packages in PACKAGE_TYPES.items():
+        selected = [row for row in rows if row['downloadPkg'] in download_packages]
+        package_rows[package_type] = selected
+        package_field_names[package_type] = [row['fieldName'] for row in
+                                             sorted(selected, key=lambda row: int(row['rank']))]
+        data_field_names[package_type] = [row['fieldName'] for row in selected if row['dataCategory'] == 'Y']
+    return WorkbookTable(name=name,
+                         rows=rows,
+                         field_names=[row['fieldName'] for row in rows],
+                         formats=formats,
+                         download_packages=[row['downloadPkg'] for row in rows],
+                         package_rows=package_rows,
+                         package_field_names=package_field_names,
+                         data_field_names=data_field_names,
+                         dp_numbers=[row['DPNumber'] for row in rows if len(row['DPNumber']) == 45])
+
+
+def read_workbook(path: Path) -> WorkbookIndex:
+    """
+    Read and index a tab delimited publication workbook file. Indexes are held in an LRU cache
+    shared by all callers in the process; they must not be modified.
+
+    :param path: The workbook file.
+    :return: The index.
+    """
+    stat = os.stat(path)
+    return _read_workbook(Path(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=WORKBOOK_CACHE_SIZE)
+def _read_workbook(path: Path, mtime: int, size: int) -> WorkbookIndex:
+    log.info(f'Loading workbook file {path}')
+    with open(path) as file:
+        rows = list(csv.DictReader(file, delimiter='\t'))
+    return index_workbook(path, rows)
+
+
+def read_workbooks(workbook_path: Path) -> Dict[str, WorkbookIndex]:
+    """
+    Read and index every publication workbook file in a directory.
+
+    :param workbook_path: The directory holding only publication workbooks.
+    :return: The indexes by dpID. The first file listing a dpID is used.
+    """
+    workbooks: Dict[str, WorkbookIndex] = {}
+    for path in sorted(get_workbook_files(workbook_path)):
+        workbook = read_workbook(path)
+        for dp_id in sorted(workbook.dp_ids):
+            workbooks.setdefault(dp_id, workbook)
+    return workbooks
+
+
+def find_workbook(workbook_path: Path, filename: str) -> Optional[WorkbookIndex]:
+    """
+    Read and index the publication workbook file with the given name in a directory.
+
+    :param workbook_path: The directory to search.
+    :param filename: The workbook file name.
+    :return: The index or None if the file is not found.
+    """
+    for path in get_workbook_files(workbook_path):
+        if path.name == filename:
+            return read_workbook(path)
+    return None
+
+
+def get_workbook_files(workbook_path: Path) -> Tuple[Path, ...]:
+    """Get the files in a workbook directory and its subdirectories."""
+    return tuple(path for path in Path(workbook_path).rglob('*') if path.is_file())
@@ -4,6 +4,7 @@ import structlog
 from typing import List, Dict
 
 import common.location_file_parser as location_file_parser
+from common.path_linker import PathLinker, walk_files
 
 from context_filter.context_filter_config import Config
 from context_filter.path_parser import PathParser
@@ -26,16 +27,15 @@ class ContextFilter:
     def get_source_paths(self) -> Dict[str, List[Dict[str, Path]]]:
         """Organize paths in the input directory by source ID with data types and associated paths."""
         source_paths: Dict[str, List[Dict[str, Path]]] = {}
-        for path in self.input_path.rglob('*'):
-            if path.is_file():
-                source_id, data_type = self.path_parser.parse(path)
-                log.debug(f'source_id: {source_id} data_type: {data_type}')
-                paths = source_paths.get(source_id)
-                # if first iteration for this data source
-                if paths is None:
-                    paths = []
-                paths.append({data_type: path})
-                source_paths.update({source_id: paths})
+        for path in walk_files(self.input_path):
+            source_id, data_type = self.path_parser.parse(path)
+            log.debug(f'source_id: {source_id} data_type: {data_type}')
+            paths = source_paths.get(source_id)
+            # if first iteration for this data source
+            if paths is None:
+                paths = []
+            paths.append({data_type: path})
+            source_paths.update({source_id: paths})
         return source_paths
 
     def get_matching_paths(self, source_paths: Dict[str, List[Dict[str, Path]]]) -> List[List[Dict[str, Path]]]:
@@ -73,11 +73,8 @@ class ContextFilter:
 
         :param matching_paths: Paths organized by data type.
         """
+        linker = PathLinker()
         for path_list in matching_paths:
             for paths in path_list:
                 for path in paths.values():
-                    link_path = Path(self.output_path, *path.parts[self.trim_index:])
-                    log.debug(f'link_path: {link_path}')
-                    link_path.parent.mkdir(parents=True, exist_ok=True)
-                    if not link_path.exists():
-                        link_path.symlink_to(path)
+                    linker.link(path, Path(self.output_path, *path.parts[self.trim_index:]))
@@ -2,42 +2,207 @@ from contextlib import closing
 from pandas import DataFrame
 import datetime
 from dateutil.relativedelta import relativedelta
+from typing import Dict, Iterable, List, NamedTuple
+
+from psycopg2.extras import execute_values
 
 from data_access.db_connector import DbConnector
 
+domain_index = 1
+site_index = 2
+package_index = 11
+date_index = 10
+type_index = 6
+date_delimiter = "-"
+delimited_data_length = 14 # length of dot-delimited filename for data files. Used to find the package and data date
+
+# the values of a dp_pub_object row
+dp_pub_object_values = "(nextval('dp_pub_object_id_seq1'), %s, %s, %s, %s, %s, %s, %s)"
+
+object_types = {
+    'EML': 'METADATA',
+    'readme': 'README',
+    'sensor_positions': 'SENSORLOCATIONS',
+    'variables': 'VARIABLES',
+    'science_review_flags': 'SCIENCEREVIEWFLAGS'
+}
+
+
+class PubRecord(NamedTuple):
+    """The dp_pub and dp_pub_object rows for a manifest."""
+    dp_idq: str
+    site: str
+    package_type: str
+    data_interval_start: datetime.date
+    data_interval_end: datetime.date
+    timestamp: datetime.datetime
+    has_data_by_package: Dict[str, str]
+    # (object_type, object_id, object_size, checksum, tran_date, supplier_version_id) by package type
+    objects_by_package: Dict[str, List[tuple]]
+
 
 def create_pub(connector: DbConnector, pub: DataFrame, version: str, change_by: str):
     connection = connector.get_connection()
     schema = connector.get_schema()
-    domain_index = 1
-    site_index = 2
-    package_index = 11
-    date_index = 10
-    type_index = 6
-    date_delimiter = "-"
-    delimited_data_length = 14 # length of dot-delimited filename for data files. Used to find the package and data date
+    with closing(connection.cursor()) as cursor:
+        try:
+            record = get_pub_record(pub, version)
+            release_status = remove_existing_pubs(cursor, schema, record)
+            for package_type in record.objects_by_package.keys():
+                # insert dp_pub and return ID
+                dp_pub_id = insert_dp_pub(cursor, schema, record, package_type, release_status, change_by)
+
+                # insert dp_pub_objects
+                for object_tuple in record.objects_by_package[package_type]:
+                    cursor.execute(get_dp_pub_object_sql(schema), (dp_pub_id,) + object_tuple)
+
+            connection.commit()
+
+        except Exception as exc:
+            connection.rollback()
+            raise exc
+
+
+def create_pubs(connector: DbConnector, pubs: Iterable[DataFrame], version: str, change_by: str,
+                commit_size: int = 100, page_size: int = 1000) -> int:
+    """
+    Create the pub records for many manifests, inserting each manifest's objects in multi-row
+    statements and committing once per commit_size manifests.
+
+    :param connector: A database connection.
+    :param pubs: The manifests.
+    :param version: The supplier version ID.
+    :param change_by: The user making the change.
+    :param commit_size: The number of manifests per transaction.
+    :param page_size: The number of rows per insert statement.
+    :return: The number of dp_pub_object rows inserted.
+    """
+    connection = connector.get_connection()
+    schema = connector.get_schema()
+    # execute_values expands the single %s into the rows
+    dp_pub_object_sql = get_dp_pub_object_sql(schema, '%s')
+    object_count = 0
+    pending = 0
+    with closing(connection.cursor()) as cursor:
+        try:
+            for pub in pubs:
+                record = get_pub_record(pub, version)
+                release_status = remove_existing_pubs(cursor, schema, record)
+                for package_type in record.objects_by_package.keys():
+                    dp_pub_id = insert_dp_pub(cursor, schema, record, package_type, release_status, change_by)
+                    rows = [(dp_pub_id,) + object_tuple for object_tuple in record.objects_by_package[package_type]]
+                    execute_values(cursor, dp_pub_object_sql, rows, template=dp_pub_object_values, page_size=page_size)
+                    object_count += len(rows)
+                pending += 1
+                if pending >= commit_size:
+                    connection.commit()
+                    pending = 0
+            connection.commit()
+
+        except Exception as exc:
+            connection.rollback()
+            raise exc
+    return object_count
+
+
+def get_pub_record(pub: DataFrame, version: str) -> PubRecord:
+    """Parse the dp_pub and dp_pub_object rows of a manifest."""
     timestamp = datetime.datetime.utcnow()
+    files = pub['file'].tolist()
+
+    # First run through the files in the manifest to find a data file
+    for file in files:
+        dp_parts = file.split('.')
+        # Parse package info from a data filename
+        if len(dp_parts) == delimited_data_length:
+            # parse dp_pub fields common across the package
+            site = dp_parts[site_index]
+            dp_parts[domain_index] = 'DOM'
+            dp_parts[site_index] = 'SITE'
+            dp_idq = '.'.join(dp_parts[:6])
+            package_type = dp_parts[package_index]
+            date = dp_parts[date_index]
+            date_parts = date.split(date_delimiter)
+            year = int(date_parts[0])
+            month = int(date_parts[1])
+            data_interval_start = datetime.date(year, month, 1)
+            next_month = data_interval_start + relativedelta(days=+32)
+            data_interval_end = datetime.date(next_month.year, next_month.month, 1)
+            break
+    else:
+        raise ValueError(f'No data file found in manifest files {files}.')
+
+    # Now run through all the files to create the pub record
+    has_data = 'N'
+    objects = []
+    for file, file_has_data, object_id, object_size, checksum in zip(files, pub['hasData'].tolist(),
+                                                                      pub['objectId'].tolist(), pub['size'].tolist(),
+                                                                      pub['checksum'].tolist()):
+        if file_has_data:
+            has_data = 'Y'
+        object_type = object_types.get(file.split('.')[type_index], 'DATA')
+        objects.append((object_type, object_id, object_size, checksum, timestamp, version))
+    return PubRecord(dp_idq=dp_idq, site=site, package_type=package_type, data_interval_start=data_interval_start,
+                     data_interval_end=data_interval_end, timestamp=timestamp,
+                     has_data_by_package={package_type: has_data}, objects_by_package={package_type: objects})
 
+
+def remove_existing_pubs(cursor, schema: str, record: PubRecord) -> str:
+    """Delete the existing pubs for the package, returning the release status for the new pub."""
+    find_dp_pub_sql = f'''
+        select
+            dp_pub_id, release_status
+        from
+            {schema}.dp_pub
+        where
+            dp_idq = %s and site = %s and data_interval_start = %s and data_interval_end = %s and package_type = %s
+    '''
+    delete_dp_pub_sql = f'''
+        delete from {schema}.dp_pub where dp_pub_id = %s
+    '''
+    cursor.execute(find_dp_pub_sql, (record.dp_idq, record.site, record.data_interval_start,
+                                     record.data_interval_end, record.package_type))
+    release_status = 'P'
+    existing_pubs = cursor.fetchall()
+    for existing_pub in existing_pubs:
+        if existing_pub[1] == 'T':
+            release_status = 'U'
+        else:
+            release_status = existing_pub[1]
+            cursor.execute(delete_dp_pub_sql, [existing_pub[0]])
+    return release_status
+
+
+def insert_dp_pub(cursor, schema: str, record: PubRecord, package_type: str, release_status: str,
+                  change_by: str) -> int:
+    """Insert the dp_pub row for a package, returning its ID."""
     dp_pub_sql = f'''
         INSERT INTO {schema}.dp_pub
            (dp_pub_id,
-            dp_idq, 
-            site, 
-            package_type, 
-            data_interval_start, 
-            data_interval_end, 
-            has_data, 
-            status, 
-            create_date, 
-            update_date, 
+            dp_idq,
+            site,
+            package_type,
+            data_interval_start,
+            data_interval_end,
+            has_data,
+            status,
+            create_date,
+            update_date,
             release_status,
             change_by)
-        VALUES 
+        VALUES
             (nextval('dp_pub_id_seq1'), %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         RETURNING dp_pub_id
     '''
+    status = 'OK'
+    cursor.execute(dp_pub_sql, (record.dp_idq, record.site, package_type, record.data_interval_start,
+                                record.data_interval_end, record.has_data_by_package[package_type], status,
+                                record.timestamp, record.timestamp, release_status, change_by))
+    return cursor.fetchone()[0]
+
 
-    dp_pub_object_sql = f'''
+def get_dp_pub_object_sql(schema: str, values: str = dp_pub_object_values) -> str:
+    return f'''
         INSERT INTO {schema}.dp_pub_object
            (dp_pub_object_id,
             dp_pub_id,
@@ -47,112 +212,6 @@ def create_pub(connector: DbConnector, pub: DataFrame, version: str, change_by:
             checksum,
             tran_date,
             supplier_version_id)
-        VALUES 
-            (nextval('dp_pub_object_id_seq1'), %s, %s, %s, %s, %s, %s, %s)
-    '''
-
-    find_dp_pub_sql = f'''
-        select 
-            dp_pub_id, release_status
-        from 
-            {schema}.dp_pub 
-        where 
-            dp_idq = %s and site = %s and data_interval_start = %s and data_interval_end = %s and package_type = %s
+        VALUES
+            {values}
     '''
-
-    delete_dp_pub_sql = f'''
-        delete from {schema}.dp_pub where dp_pub_id = %s 
-    '''
-
-    has_data_by_package = {}
-    objects_by_package = {}
-
-    with closing(connection.cursor()) as cursor:
-        try:
-            # First run through the files in the manifest to find a data file
-            for index, row in pub.iterrows():
-                dp_parts = row['file'].split('.')
-                # Parse package info from a data filename
-                if len(dp_parts) == delimited_data_length:
-                    # parse dp_pub fields common across the package
-                    site = dp_parts[site_index]
-                    dp_parts[domain_index] = 'DOM'
-                    dp_parts[site_index] = 'SITE'
-                    dp_idq = '.'.join(dp_parts[:6])
-                    package_type = dp_parts[package_index]
-                    date = dp_parts[date_index]
-                    date_parts = date.split(date_delimiter)
-                    year = int(date_parts[0])
-                    month = int(date_parts[1])
-                    data_interval_start = datetime.date(year, month, 1)
-                    next_month = data_interval_start + relativedelta(days=+32)
-                    data_interval_end = datetime.date(next_month.year, next_month.month, 1)
-                    status = 'OK'
-                    create_date = timestamp
-                    update_date = timestamp
-                    cursor.execute(find_dp_pub_sql, (dp_idq, site, data_interval_start, data_interval_end, package_type))
-                    release_status = 'P'
-                    existing_pubs = cursor.fetchall()
-                    for existing_pub in existing_pubs:
-                        if existing_pub[1] == 'T':
-                            release_status = 'U'
-                        else:
-                            release_status = existing_pub[1]
-                            cursor.execute(delete_dp_pub_sql, [existing_pub[0]])
-                    break
-                
-            # Now run through all the files to create the pub record 
-            for index, row in pub.iterrows():
-                dp_parts = row['file'].split('.')
-                has_data = 'Y' if row['hasData'] else 'N'
-                
-                data_type=dp_parts[type_index]
-                object_type = 'DATA' # initialize
-                if data_type == 'EML':
-                    object_type = 'METADATA'
-                elif data_type == 'readme':
-                    object_type = 'README'
-                elif data_type == 'sensor_positions':
-                    object_type = 'SENSORLOCATIONS'
-                elif data_type == 'variables':
-                    object_type = 'VARIABLES'
-                elif data_type == 'science_review_flags':
-                    object_type = 'SCIENCEREVIEWFLAGS'
-                
-                object_id = row['objectId']
-                object_size = row['size']
-                checksum = row['checksum']
-                tran_date = timestamp
-
-                # update has_data
-                if package_type in has_data_by_package.keys():
-                    has_data_by_package[package_type] = 'Y' if (has_data_by_package[package_type] == 'Y'
-                                                                or has_data == 'Y') else 'N'
-                else:
-                    has_data_by_package[package_type] = has_data
-                    
-                # store dp_pub_object tuple
-                object_tuple = (object_type, object_id, object_size, checksum, tran_date, version)
-                if package_type in objects_by_package.keys():
-                    this_package = objects_by_package[package_type]
-                    this_package.append(object_tuple)
-                    objects_by_package[package_type] = this_package
-                else:
-                    objects_by_package[package_type] = [object_tuple]
-
-            for package_type in objects_by_package.keys():
-                # insert dp_pub and return ID
-                cursor.execute(dp_pub_sql, (dp_idq, site, package_type, data_interval_start, data_interval_end,
-                                            has_data_by_package[package_type], status, create_date, update_date,
-                                            release_status, change_by))
-                dp_pub_id = cursor.fetchone()[0]
-
-                # insert dp_pub_objects
-                for object_tuple in objects_by_package[package_type]:
-                    cursor.execute(dp_pub_object_sql, (dp_pub_id,) + object_tuple)
-
-            connection.commit()
-
-        except Exception as exc:
-            cursor.rollback()
-            raise exc
@@ -1,7 +1,10 @@
-from typing import Any
+import re
+import threading
+from typing import Any, Dict, Optional, Sequence, Set
 from typing import NamedTuple
 
 import psycopg2
+import psycopg2.pool
 
 
 class DbConfig(NamedTuple):
@@ -14,8 +17,17 @@ class DbConfig(NamedTuple):
 
 class DbConnector:
 
-    def __init__(self, config: DbConfig) -> None:
+    def __init__(self, config: DbConfig, prepare_statements: bool = False, itersize: int = 0) -> None:
+        """
+        :param config: The database configuration.
+        :param prepare_statements: Run the hot lookup queries as server-side prepared statements.
+        :param itersize: If greater than zero, stream large result sets through named
+            server-side cursors fetching this many rows per round trip.
+        """
         self.config = config
+        self.prepare_statements = prepare_statements
+        self.itersize = itersize
+        self.prepared: Dict[int, Set[str]] = {}
         self.connection = self._connect()
 
     def get_schema(self):
@@ -27,8 +39,18 @@ class DbConnector:
     def close(self):
         self.connection.close()
 
+    def prepare(self, cursor: Any, name: str, sql: str) -> None:
+        """Prepare the statement on the cursor's connection if it has not been prepared there yet."""
+        statements = self.prepared.setdefault(id(cursor.connection), set())
+        if name not in statements:
+            cursor.execute(f'prepare {name} as {to_positional_parameters(sql)}')
+            statements.add(name)
+
     def _connect(self) -> Any:
-        return psycopg2.connect(
+        return psycopg2.connect(**self._connect_parameters())
+
+    def _connect_parameters(self) -> dict:
+        return dict(
             host=self.config.host,
             port=5432,
             user=self.config.user,
@@ -36,3 +58,90 @@ class DbConnector:
             dbname=self.config.database_name,
             sslmode='require',
             options=f'-c search_path={self.config.schema}')
+
+
+class PooledDbConnector(DbConnector):
+    """
+    A connector backed by a bounded connection pool. Each thread is handed its own
+    connection from the pool on first use; all connections are returned on close.
+    """
+
+    def __init__(self, config: DbConfig, max_connections: int, prepare_statements: bool = False,
+                 itersize: int = 0) -> None:
+        self.max_connections = max_connections
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.connections: Dict[int, Any] = {}
+        self.pool = None
+        super().__init__(config, prepare_statements=prepare_statements, itersize=itersize)
+
+    def get_connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            with self.lock:
+                connection = self.pool.getconn(key=threading.get_ident())
+                self.connections[threading.get_ident()] = connection
+            self.local.connection = connection
+        return connection
+
+    def close(self):
+        with self.lock:
+            for key, connection in self.connections.items():
+                self.prepared.pop(id(connection), None)
+                self.pool.putconn(connection, key=key)
+            self.connections.clear()
+            self.pool.closeall()
+
+    def _connect(self) -> Any:
+        self.pool = self._create_pool()
+        return None
+
+    def _create_pool(self) -> Any:
+        return psycopg2.pool.ThreadedConnectionPool(1, self.max_connections, **self._connect_parameters())
+
+
+def to_positional_parameters(sql: str) -> str:
+    """Replace the %s placeholders in a query with the $1, $2, ... form used by prepared statements."""
+    count = 0
+
+    def replace(match) -> str:
+        nonlocal count
+        count += 1
+        return f'${count}'
+    return re.sub(r'%s', replace, sql)
+
+
+def execute(connector: DbConnector, cursor: Any, name: str, sql: str, parameters: Sequence) -> None:
+    """
+    Execute a lookup query, as a server-side prepared statement if the connector enables them.
+
+    :param connector: A database connection.
+    :param cursor: The cursor to execute on.
+    :param name: The prepared statement name.
+    :param sql: The query with %s placeholders.
+    :param parameters: The query parameters.
+    """
+    if getattr(connector, 'prepare_statements', False):
+        connector.prepare(cursor, name, sql)
+        placeholders = ', '.join(['%s'] * len(parameters))
+        cursor.execute(f'execute {name} ({placeholders})', parameters)
+    else:
+        cursor.execute(sql, parameters)
+
+
+def get_cursor(connector: DbConnector, name: Optional[str] = None) -> Any:
+    """
+    Get a cursor for a potentially large result set. If the connector sets an itersize
+    a named server-side cursor is returned, so rows are streamed rather than fetched at once.
+
+    :param connector: A database connection.
+    :param name: The server-side cursor name.
+    :return: The cursor.
+    """
+    connection = connector.get_connection()
+    itersize = getattr(connector, 'itersize', 0)
+    if name is None or not itersize:
+        return connection.cursor()
+    cursor = connection.cursor(name=name)
+    cursor.itersize = itersize
+    return cursor
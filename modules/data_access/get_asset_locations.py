@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
 from contextlib import closing
-from typing import List, Tuple, Set
+from datetime import date, datetime, time
+from typing import Dict, List, Optional, Tuple, Set
 
 from geojson import Feature, FeatureCollection
 
 from data_access.get_assets import get_asset_definition_by_date
 from data_access.get_named_location_geolocations import get_named_location_geolocations
-from data_access.get_named_location_context import get_named_location_context
-from data_access.get_named_location_parents import get_named_location_parents
-from data_access.get_named_location_properties import get_named_location_properties
+from data_access.get_named_location_context import get_named_location_context, get_named_location_context_by_id
+from data_access.get_named_location_parents import get_named_location_parents, get_named_location_parents_by_id
+from data_access.get_named_location_properties import get_named_location_properties, \
+    get_named_location_properties_by_id
 from data_access.db_connector import DbConnector
 from data_access.types.asset import Asset
 from data_access.types.asset_location import AssetLocation
@@ -16,64 +18,242 @@ from data_access.types.property import Property
 import data_access.types.geojson_converter as geojson_converter
 
 
-def get_asset_locations(connector: DbConnector, asset: Asset) -> FeatureCollection:
+def get_asset_locations(connector: DbConnector, asset: Asset,
+                        cache: Optional['AssetLocationCache'] = None) -> FeatureCollection:
     """
     Get an asset's location history in GEOJson format.
 
     :param connector: The database connection.
     :param asset: The asset.
+    :param cache: Metadata shared across the assets of a run. A cache for this asset alone is used if not given.
     :return: The asset's location history.
     """
-    connection = connector.get_connection()
-    schema = connector.get_schema()
-    sql = f'''
+    if cache is None:
+        cache = AssetLocationCache(connector)
+    features: List[Feature] = []
+    for (key, install_date, remove_date, name) in cache.get_install_rows(asset):
+        locations: FeatureCollection = cache.get_geolocations(key)
+        properties: List[Property] = cache.get_properties(key)
+        # get asset information (model, manufacturer, software version) and append to properties
+        all_asset: Set[Asset] = cache.get_asset_definitions(asset.id, install_date, remove_date)
+        asset_def = next(iter(all_asset), None)
+        if asset_def:
+            properties.extend([Property(name="asset_model", value=asset_def.model),
+                               Property(name="asset_manufacturer", value=asset_def.manufacturer),
+                               Property(name="asset_software_version", value=asset_def.software_version)])
+
+        parents: dict[str, Tuple[int, str]] = cache.get_parents(key)
+        (domain_id, domain) = parents['domain'] if parents else None
+        (site_id, site) = parents['site'] if parents else None
+        site_location: FeatureCollection = cache.get_geolocations(site_id)
+        context: List[str] = cache.get_context(key)
+        asset_location = AssetLocation(name=name, domain=domain, site=site, install_date=install_date,
+                                       remove_date=remove_date, context=context, properties=properties,
+                                       site_location=site_location, locations=locations)
+        features.append(geojson_converter.convert_asset_location(asset_location))
+    feature_collection = FeatureCollection(features)
+    # add the asset as the source
+    feature_collection.update(source_id=asset.id)
+    feature_collection.update(source_type=asset.type)
+    return feature_collection
+
+
+class AssetLocationCache:
+    """
+    Supplies the install rows of assets and the metadata of their named locations. Given a source
+    type, the install rows and asset definitions of all its assets and the properties, parents and
+    context of their named locations are loaded in batched queries on first use. Geolocations are
+    memoized per named location, so sites shared by many assets are read once per run. Lookups the
+    batched queries do not cover fall back to one query per key, also memoized.
+    """
+
+    def __init__(self, connector: DbConnector, source_type: Optional[str] = None) -> None:
+        self.connector = connector
+        self.source_type = source_type
+        self.prefetched = False
+        self.install_rows: Dict[int, List[tuple]] = {}
+        self.asset_definitions: Dict[int, List[tuple]] = {}
+        self.geolocations: Dict[int, FeatureCollection] = {}
+        self.properties: Dict[int, List[Property]] = {}
+        self.parents: Dict[int, Optional[Dict[str, Tuple[int, str]]]] = {}
+        self.context: Dict[int, List[str]] = {}
+
+    def prefetch(self) -> None:
+        self.prefetched = True
+        self.install_rows = get_install_rows_by_asset(self.connector, self.source_type)
+        self.asset_definitions = get_asset_definitions_by_asset(self.connector, self.source_type)
+        keys = list(dict.fromkeys(row[0] for rows in self.install_rows.values() for row in rows))
+        if keys:
+            properties = get_named_location_properties_by_id(self.connector, keys)
+            parents = get_named_location_parents_by_id(self.connector, keys)
+            context = get_named_location_context_by_id(self.connector, keys)
+            for key in keys:
+                self.properties[key] = properties.get(key, [])
+                self.parents[key] = parents.get(key) or None
+                self.context[key] = context.get(key, [])
+
+    def is_prefetched(self, asset: Asset) -> bool:
+        if self.source_type is None or asset.type != self.source_type:
+            return False
+        if not self.prefetched:
+            self.prefetch()
+        return True
+
+    def get_install_rows(self, asset: Asset) -> List[tuple]:
+        """Return the (named location ID, install date, remove date, name) rows of an asset by install date."""
+        if self.is_prefetched(asset):
+            rows = self.install_rows.get(asset.id, [])
+        else:
+            rows = get_install_rows(self.connector, asset.id)
+        return [(row[0], row[1], row[2], row[3]) for row in rows]
+
+    def get_asset_definitions(self, asset_id: int, install_date, remove_date) -> Set[Asset]:
+        if asset_id not in self.asset_definitions:
+            return get_asset_definition_by_date(self.connector, install_date, remove_date, asset_id)
+        return {Asset(id=asset_id, type=asset_type, model=model, manufacturer=manufacturer, software_version=software)
+                for (start_date, end_date, asset_type, model, manufacturer, software) in self.asset_definitions[asset_id]
+                if is_assigned(start_date, end_date, install_date, remove_date)}
+
+    def get_geolocations(self, key: int) -> FeatureCollection:
+        if key not in self.geolocations:
+            self.geolocations[key] = get_named_location_geolocations(self.connector, key)
+        return self.geolocations[key]
+
+    def get_properties(self, key: int) -> List[Property]:
+        if key not in self.properties:
+            self.properties[key] = get_named_location_properties(self.connector, key)
+        # callers append asset properties
+        return list(self.properties[key])
+
+    def get_parents(self, key: int) -> Optional[Dict[str, Tuple[int, str]]]:
+        if key not in self.parents:
+            self.parents[key] = get_named_location_parents(self.connector, key)
+        parents = self.parents[key]
+        return dict(parents) if parents else None
+
+    def get_context(self, key: int) -> List[str]:
+        if key not in self.context:
+            self.context[key] = get_named_location_context(self.connector, key)
+        return list(self.context[key])
+
+
+def install_rows_sql(schema: str, asset_filter: str) -> str:
+    return f'''
         select
             is_asset_location.nam_locn_id,
             is_asset_location.install_date,
             is_asset_location.remove_date,
             nam_locn.nam_locn_name,
-            type.type_name
+            type.type_name,
+            is_asset_location.asset_uid
         from
             {schema}.is_asset_location, {schema}.nam_locn, {schema}.type
         where
-            is_asset_location.asset_uid = %s
+            {asset_filter}
         and
             nam_locn.nam_locn_id = is_asset_location.nam_locn_id
         and
             type.type_id = nam_locn.type_id
-        order by 
+        order by
+            is_asset_location.asset_uid,
             is_asset_location.install_date;
     '''
-    features: List[Feature] = []
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(sql, [asset.id])
-        rows = cursor.fetchall()
-        for row in rows:
-            key = row[0]
-            install_date = row[1]
-            remove_date = row[2]
-            name = row[3]
-            locations: FeatureCollection = get_named_location_geolocations(connector, key)
-            properties: List[Property] = get_named_location_properties(connector, key)
-            # get asset information (model, manufacturer, software version) and append to properties
-            all_asset: Set[Asset] = get_asset_definition_by_date(connector, install_date, remove_date, asset.id)
-            asset_def = next(iter(all_asset), None)
-            if asset_def:
-                properties.extend([Property(name="asset_model", value=asset_def.model),
-                                   Property(name="asset_manufacturer", value=asset_def.manufacturer),
-                                   Property(name="asset_software_version", value=asset_def.software_version)])
-
-            parents: dict[str, Tuple[int, str]] = get_named_location_parents(connector, key)
-            (domain_id, domain) = parents['domain'] if parents else None
-            (site_id, site) = parents['site'] if parents else None
-            site_location: FeatureCollection = get_named_location_geolocations(connector, site_id)
-            context: List[str] = get_named_location_context(connector, key)
-            asset_location = AssetLocation(name=name, domain=domain, site=site, install_date=install_date,
-                                           remove_date=remove_date, context=context, properties=properties,
-                                           site_location=site_location, locations=locations)
-            features.append(geojson_converter.convert_asset_location(asset_location))
-    feature_collection = FeatureCollection(features)
-    # add the asset as the source
-    feature_collection.update(source_id=asset.id)
-    feature_collection.update(source_type=asset.type)
-    return feature_collection
+
+
+def source_type_assets_sql(schema: str) -> str:
+    """The asset UIDs of a source type, as get_assets selects them."""
+    return f'''
+        select
+            is_asset_assignment.asset_uid
+        from
+            {schema}.is_asset_assignment,
+            {schema}.is_asset_definition,
+            {schema}.is_sensor_type
+        where
+            is_asset_assignment.asset_definition_uuid = is_asset_definition.asset_definition_uuid
+        and
+            is_asset_definition.sensor_type_name = is_sensor_type.sensor_type_name
+        and
+            is_sensor_type.avro_schema_name = %s
+    '''
+
+
+def get_install_rows(connector: DbConnector, asset_id: int) -> List[tuple]:
+    sql = install_rows_sql(connector.get_schema(), 'is_asset_location.asset_uid = %s')
+    with closing(connector.get_connection().cursor()) as cursor:
+        cursor.execute(sql, [asset_id])
+        return cursor.fetchall()
+
+
+def get_install_rows_by_asset(connector: DbConnector, source_type: str) -> Dict[int, List[tuple]]:
+    """
+    Get the install rows of all assets of a source type in a single query.
+
+    :param connector: The database connection.
+    :param source_type: The source type.
+    :return: The install rows by install date, keyed by asset UID.
+    """
+    schema = connector.get_schema()
+    sql = install_rows_sql(schema, f'is_asset_location.asset_uid in ({source_type_assets_sql(schema)})')
+    install_rows: Dict[int, List[tuple]] = {}
+    with closing(connector.get_connection().cursor()) as cursor:
+        cursor.execute(sql, [source_type])
+        for row in cursor.fetchall():
+            install_rows.setdefault(row[5], []).append(row)
+    return install_rows
+
+
+def get_asset_definitions_by_asset(connector: DbConnector, source_type: str) -> Dict[int, List[tuple]]:
+    """
+    Get the definition assignments of all assets of a source type in a single query.
+
+    :param connector: The database connection.
+    :param source_type: The source type.
+    :return: The (start date, end date, sensor type, model, manufacturer, software version) rows
+        keyed by asset UID.
+    """
+    schema = connector.get_schema()
+    sql = f'''
+        select
+            asset.asset_uid,
+            is_asset_assignment.start_date,
+            is_asset_assignment.end_date,
+            is_asset_definition.sensor_type_name,
+            is_asset_definition.model_number,
+            is_asset_definition.manufacturer_name,
+            is_asset_definition.sw_version
+        from
+            {schema}.asset,
+            {schema}.is_asset_assignment,
+            {schema}.is_asset_definition
+        where
+            asset.asset_uid = is_asset_assignment.asset_uid
+        and
+            is_asset_assignment.asset_definition_uuid = is_asset_definition.asset_definition_uuid
+        and
+            asset.asset_uid in ({source_type_assets_sql(schema)})
+    '''
+    definitions: Dict[int, List[tuple]] = {}
+    with closing(connector.get_connection().cursor()) as cursor:
+        cursor.execute(sql, [source_type])
+        for row in cursor.fetchall():
+            definitions.setdefault(row[0], []).append(row[1:])
+    return definitions
+
+
+def is_assigned(start_date, end_date, install_date, remove_date) -> bool:
+    """
+    Match the assignment condition of get_asset_definition_by_date: the assignment starts by the
+    install date and has not ended before the remove date. As in SQL, comparisons with null are false.
+    """
+    if start_date is None or install_date is None or as_datetime(start_date) > as_datetime(install_date):
+        return False
+    if end_date is None:
+        return True
+    return remove_date is not None and as_datetime(end_date) >= as_datetime(remove_date)
+
+
+def as_datetime(value):
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, time())
+    return value
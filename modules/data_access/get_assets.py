@@ -3,7 +3,7 @@ from contextlib import closing
 from typing import Iterator, Set
 
 from data_access.types.asset import Asset
-from data_access.db_connector import DbConnector
+from data_access.db_connector import DbConnector, get_cursor
 
 
 def get_assets(connector: DbConnector, source_type: str) -> Iterator[Asset]:
@@ -14,7 +14,6 @@ def get_assets(connector: DbConnector, source_type: str) -> Iterator[Asset]:
     :param source_type: The type of sensor.
     :return: The assets.
     """
-    connection = connector.get_connection()
     schema = connector.get_schema()
     sql = f'''
          select
@@ -36,10 +35,9 @@ def get_assets(connector: DbConnector, source_type: str) -> Iterator[Asset]:
              is_sensor_type.avro_schema_name = %s
          order by asset_uid 
     '''
-    with closing(connection.cursor()) as cursor:
+    with closing(get_cursor(connector, 'get_assets')) as cursor:
         cursor.execute(sql, [source_type])
-        rows = cursor.fetchall()
-        for row in rows:
+        for row in cursor:
             asset_id = row[0]
             asset_type = row[1]
             yield Asset(id=asset_id, type=asset_type)
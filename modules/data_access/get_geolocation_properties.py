@@ -4,7 +4,7 @@ from typing import List
 
 import common.date_formatter as date_formatter
 from data_access.types.property import Property
-from data_access.db_connector import DbConnector
+from data_access.db_connector import DbConnector, execute
 
 
 def get_geolocation_properties(connector: DbConnector, geolocation_id: int) -> List[Property]:
@@ -32,7 +32,7 @@ def get_geolocation_properties(connector: DbConnector, geolocation_id: int) -> L
     '''
     properties: List[Property] = []
     with closing(connection.cursor()) as cursor:
-        cursor.execute(sql, [geolocation_id])
+        execute(connector, cursor, 'geolocation_properties', sql, [geolocation_id])
         rows = cursor.fetchall()
         for row in rows:
             name = row[0]
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 from contextlib import closing
-from typing import List
+from typing import Dict, Iterable, List
 
-from data_access.db_connector import DbConnector
+from data_access.db_connector import DbConnector, execute
 from data_access.types.active_period import ActivePeriod
 
 
@@ -21,15 +21,43 @@ def get_group_loader_active_periods(connector: DbConnector, group_id: int) -> Li
             group_active_period 
         where 
             group_id = %s
-        order by start_date
+        order by start_date, end_date
     '''
     periods: List[ActivePeriod] = []
     connection = connector.get_connection()
     with closing(connection.cursor()) as cursor:
-        cursor.execute(sql, [group_id])
+        execute(connector, cursor, 'group_loader_active_periods', sql, [group_id])
         rows = cursor.fetchall()
         for row in rows:
             start_date = row[0]
             end_date = row[1]
             periods.append(ActivePeriod(start_date=start_date, end_date=end_date))
     return periods
+
+
+def get_group_loader_active_periods_by_id(connector: DbConnector,
+                                          group_ids: Iterable[int]) -> Dict[int, List[ActivePeriod]]:
+    """
+    Get the active time periods for many group ids in a single query.
+
+    :param connector: A database connector.
+    :param group_ids: The group IDs.
+    :return: The active periods keyed by group ID.
+    """
+    sql = '''
+        select
+            group_id, start_date, end_date
+        from
+            group_active_period
+        where
+            group_id = ANY (%s)
+        order by group_id, start_date, end_date
+    '''
+    periods: Dict[int, List[ActivePeriod]] = {}
+    connection = connector.get_connection()
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, (list(group_ids),))
+        rows = cursor.fetchall()
+        for row in rows:
+            periods.setdefault(row[0], []).append(ActivePeriod(start_date=row[1], end_date=row[2]))
+    return periods
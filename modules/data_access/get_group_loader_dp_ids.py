@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 from contextlib import closing
-from typing import List
+from typing import Dict, Iterable, List
 
-from data_access.db_connector import DbConnector
+from data_access.db_connector import DbConnector, execute
 
 
 def get_group_loader_dp_ids(connector: DbConnector, group_id: int) -> List[str]:
@@ -22,13 +22,43 @@ def get_group_loader_dp_ids(connector: DbConnector, group_id: int) -> List[str]:
             dpg.group_id = g.group_id
         and
             g.group_id = %s
+        order by dpg.dp_idq
     '''
     dpids: List[str] = []
     connection = connector.get_connection()
     with closing(connection.cursor()) as cursor:
-        cursor.execute(sql, [group_id])
+        execute(connector, cursor, 'group_loader_dp_ids', sql, [group_id])
         rows = cursor.fetchall()
         for row in rows:
             data_product_id = row[0]
             dpids.append(data_product_id)
     return dpids
+
+
+def get_group_loader_dp_ids_by_id(connector: DbConnector, group_ids: Iterable[int]) -> Dict[int, List[str]]:
+    """
+    Get the data product ids for many group ids in a single query.
+
+    :param connector: A database connector.
+    :param group_ids: The group IDs.
+    :return: The data product ids keyed by group ID.
+    """
+    sql = '''
+        select
+            g.group_id, substring (dpg.dp_idq  from 15 for 13 )
+        from
+            "group" g, data_product_group dpg
+        where
+            dpg.group_id = g.group_id
+        and
+            g.group_id = ANY (%s)
+        order by g.group_id, dpg.dp_idq
+    '''
+    dpids: Dict[int, List[str]] = {}
+    connection = connector.get_connection()
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, (list(group_ids),))
+        rows = cursor.fetchall()
+        for row in rows:
+            dpids.setdefault(row[0], []).append(row[1])
+    return dpids
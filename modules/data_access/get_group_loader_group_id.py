@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 from contextlib import closing
-from typing import List
+from typing import Dict, Iterable, List
 
 from data_access.db_connector import DbConnector
 
@@ -22,7 +22,7 @@ def get_group_loader_group_id(connector: DbConnector, mem_id: int) -> List[int]:
              nlg.group_id = g.group_id 
          and 
              nlg.named_location_id = %s
-   	
+         order by g.group_id
     '''
           
     sql_2 = '''       
@@ -34,7 +34,7 @@ def get_group_loader_group_id(connector: DbConnector, mem_id: int) -> List[int]:
              gm.group_id = g.group_id 
          and 
              gm.member_group_id = %s
- 	
+         order by g.group_id
     '''
 
     group_ids: List[int] = []
@@ -49,3 +49,49 @@ def get_group_loader_group_id(connector: DbConnector, mem_id: int) -> List[int]:
             group_id = row[0]
             group_ids.append(group_id)
     return group_ids
+
+
+def get_group_loader_group_ids_by_member(connector: DbConnector, mem_ids: Iterable[int]) -> Dict[int, List[int]]:
+    """
+    Get the Group IDs for many named locations and member groups with two queries.
+
+    :param connector: A database connection.
+    :param mem_ids: The member group or named location IDs.
+    :return: The group IDs keyed by member ID, named location groups first.
+    """
+    sql_1 = '''
+         select distinct
+             nlg.named_location_id, g.group_id
+         from
+             named_location_group nlg, "group" g
+         where
+             nlg.group_id = g.group_id
+         and
+             nlg.named_location_id = ANY (%s)
+         order by nlg.named_location_id, g.group_id
+    '''
+
+    sql_2 = '''
+         select
+             gm.member_group_id, g.group_id
+         from
+             group_member gm, "group" g
+         where
+             gm.group_id = g.group_id
+         and
+             gm.member_group_id = ANY (%s)
+         order by gm.member_group_id, g.group_id
+    '''
+
+    group_ids: Dict[int, List[int]] = {}
+    mem_ids = list(mem_ids)
+    connection = connector.get_connection()
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql_1, (mem_ids,))
+        rows_1 = cursor.fetchall()
+        cursor.execute(sql_2, (mem_ids,))
+        rows_2 = cursor.fetchall()
+        rows = rows_1 + rows_2
+        for row in rows:
+            group_ids.setdefault(row[0], []).append(row[1])
+    return group_ids
@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 from contextlib import closing
-from typing import Dict, List, Set, Iterator, Optional, Tuple
+from typing import Dict, Iterable, List, Set, Iterator, Optional, Tuple
 
-from data_access.db_connector import DbConnector
+from data_access.db_connector import DbConnector, execute
 from data_access.types.property import Property
-from data_access.get_named_location_parents import get_named_location_parents
+from data_access.get_named_location_parents import get_named_location_parents, get_named_location_parents_by_id
 
 
 def get_group_loader_properties(connector: DbConnector, group_id: int) -> List[Property]:
@@ -29,30 +29,79 @@ def get_group_loader_properties(connector: DbConnector, group_id: int) -> List[P
             nam_locn.nam_locn_id = g.named_location_id
         and
             g.group_id = %s
+        order by nam_locn.nam_locn_id
     '''
     properties: List[Property] = []
-    hor_name = "HOR"
-    ver_name = "VER"
-    site_name = "site"
-    domain_name = "domain"
-    visibility_code_name = "visibility_code"
     connection = connector.get_connection()
     with closing(connection.cursor()) as cursor:
-        cursor.execute(sql, [group_id])
+        execute(connector, cursor, 'group_loader_properties', sql, [group_id])
         rows = cursor.fetchall()
         for row in rows:
-            # name = row[0]
-            hor = row[1]
-            ver = row[2]
-            visibility_code = row[3]
             key = row[4]
-            site = row[5]
             parents: Dict[str, Tuple[int, str]] = get_named_location_parents(connector, key)
-            (parent_id, name_domain) = parents['domain'] if parents else None
-            domain: str = name_domain
-            properties.append(Property(name=site_name, value=site))
-            properties.append(Property(name=domain_name, value=domain))
-            properties.append(Property(name=visibility_code_name, value=visibility_code))
-            properties.append(Property(name=hor_name, value=hor))
-            properties.append(Property(name=ver_name, value=ver))
+            add_properties(properties, row[1:], parents)
     return properties
+
+
+def get_group_loader_properties_by_id(connector: DbConnector, group_ids: Iterable[int]) -> Dict[int, List[Property]]:
+    """
+    Get the properties associated with many group ids, reading the parents of their named
+    locations with one more query.
+
+    :param connector: A database connection.
+    :param group_ids: The group IDs to search.
+    :return: The group properties keyed by group ID.
+    """
+    sql = '''
+       select
+            g.group_id,
+            g.hor,
+            g.ver,
+            g.visibility_code,
+            nam_locn.nam_locn_id,
+            nam_locn.nam_locn_name
+        from
+            "group" g, nam_locn
+        where
+            nam_locn.nam_locn_id = g.named_location_id
+        and
+            g.group_id = ANY (%s)
+        order by g.group_id, nam_locn.nam_locn_id
+    '''
+    properties: Dict[int, List[Property]] = {}
+    connection = connector.get_connection()
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, (list(group_ids),))
+        rows = cursor.fetchall()
+    keys = list(dict.fromkeys(row[4] for row in rows))
+    all_parents = get_named_location_parents_by_id(connector, keys) if keys else {}
+    for row in rows:
+        parents = all_parents.get(row[4]) or None
+        add_properties(properties.setdefault(row[0], []), row[1:], parents)
+    return properties
+
+
+def add_properties(properties: List[Property], row: tuple, parents: Optional[Dict[str, Tuple[int, str]]]) -> None:
+    """
+    Append the properties of a group.
+
+    :param properties: Collection to append to.
+    :param row: The hor, ver, visibility code, named location ID and named location name of the group.
+    :param parents: The parents of the group's named location.
+    """
+    hor_name = "HOR"
+    ver_name = "VER"
+    site_name = "site"
+    domain_name = "domain"
+    visibility_code_name = "visibility_code"
+    hor = row[0]
+    ver = row[1]
+    visibility_code = row[2]
+    site = row[4]
+    (parent_id, name_domain) = parents['domain'] if parents else None
+    domain: str = name_domain
+    properties.append(Property(name=site_name, value=site))
+    properties.append(Property(name=domain_name, value=domain))
+    properties.append(Property(name=visibility_code_name, value=visibility_code))
+    properties.append(Property(name=hor_name, value=hor))
+    properties.append(Property(name=ver_name, value=ver))
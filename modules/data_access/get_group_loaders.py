@@ -1,23 +1,26 @@
 #!/usr/bin/env python3
 from contextlib import closing
-from typing import List
+from typing import Dict, List
 
 from data_access.db_connector import DbConnector
 from data_access.types.active_period import ActivePeriod
 from data_access.types.group import Group
 from data_access.types.property import Property
-from data_access.get_group_loader_properties import get_group_loader_properties
-from data_access.get_group_loader_active_periods import get_group_loader_active_periods
-from data_access.get_group_loader_dp_ids import get_group_loader_dp_ids
-from data_access.get_group_loader_group_id import get_group_loader_group_id
+from data_access.get_group_loader_properties import get_group_loader_properties, get_group_loader_properties_by_id
+from data_access.get_group_loader_active_periods import get_group_loader_active_periods, \
+    get_group_loader_active_periods_by_id
+from data_access.get_group_loader_dp_ids import get_group_loader_dp_ids, get_group_loader_dp_ids_by_id
+from data_access.get_group_loader_group_id import get_group_loader_group_id, get_group_loader_group_ids_by_member
 
 
-def get_group_loaders(connector: DbConnector, group_prefix: str) -> List[List[Group]]:
+def get_group_loaders(connector: DbConnector, group_prefix: str, prefetch: bool = True) -> List[List[Group]]:
     """
     Get member groups for a group prefix, i.e., pressure-air_.
 
     :param connector: A database connector.
     :param group_prefix: A group prefix.
+    :param prefetch: Load group IDs, names, active periods, data product IDs and properties
+        for all members in batched queries rather than per member and group.
     :return: The Group.
     """
     sql_nlg = '''
@@ -53,7 +56,6 @@ def get_group_loaders(connector: DbConnector, group_prefix: str) -> List[List[Gr
              g.group_name like %s
          order by gm.member_group_id
     '''
-    group_name: str = ""
     group_prefix_1 = group_prefix + '%'
     if group_prefix[-1] == "_":
         group_prefix_1 = group_prefix[:-1] + r'\_%'
@@ -64,26 +66,99 @@ def get_group_loaders(connector: DbConnector, group_prefix: str) -> List[List[Gr
         cursor.execute(sql_gm, [group_prefix_1])
         rows_gm = cursor.fetchall()
         rows = rows_nlg + rows_gm
-        groups_all = []
-        for row in rows:
-            mem_id = row[0]
-            mem_name = row[1]
-            groups = []
-            group_ids: List[int] = get_group_loader_group_id(connector, mem_id=mem_id)
-            for group_id in group_ids:
-                group_name: str = get_group_loader_group_name(connector, group_id=group_id,
-                                                              group_prefix_1=group_prefix_1)
-                if group_name != "":
-                    active_periods: List[ActivePeriod] = get_group_loader_active_periods(connector, group_id=group_id)
-                    data_product_ids: List[str] = get_group_loader_dp_ids(connector, group_id=group_id)
-                    properties: List[Property] = get_group_loader_properties(connector, group_id=group_id)
-                    groups.append(Group(name=mem_name, group=group_name, active_periods=active_periods,
-                    data_product_ID=data_product_ids, properties=properties))
-            groups.append(groups)
-            groups_all.append(groups)
+    hydrator = GroupHydrator(connector, [row[0] for row in rows], group_prefix_1, prefetch)
+    groups_all = []
+    for row in rows:
+        mem_id = row[0]
+        mem_name = row[1]
+        groups = []
+        group_ids: List[int] = hydrator.get_group_ids(mem_id)
+        for group_id in group_ids:
+            group_name: str = hydrator.get_group_name(group_id)
+            if group_name != "":
+                active_periods: List[ActivePeriod] = hydrator.get_active_periods(group_id)
+                data_product_ids: List[str] = hydrator.get_dp_ids(group_id)
+                properties: List[Property] = hydrator.get_properties(group_id)
+                groups.append(Group(name=mem_name, group=group_name, active_periods=active_periods,
+                data_product_ID=data_product_ids, properties=properties))
+        groups.append(groups)
+        groups_all.append(groups)
     return groups_all
 
 
+class GroupHydrator:
+    """
+    Supplies the groups of a set of members and the details of those groups, either from
+    batched queries over the whole set or from one query per member and group. Groups
+    shared by many members are read once in the batched mode.
+    """
+
+    def __init__(self, connector: DbConnector, mem_ids: List[int], group_prefix_1: str, prefetch: bool) -> None:
+        self.connector = connector
+        self.group_prefix_1 = group_prefix_1
+        self.prefetch = prefetch
+        if prefetch:
+            keys = list(dict.fromkeys(mem_ids))
+            self.group_ids = get_group_loader_group_ids_by_member(connector, keys) if keys else {}
+            self.group_names = get_group_loader_group_names(connector, group_prefix_1)
+            # only the groups named with the prefix are loaded
+            group_ids = [group_id for group_id in dict.fromkeys(
+                group_id for ids in self.group_ids.values() for group_id in ids) if group_id in self.group_names]
+            self.active_periods = get_group_loader_active_periods_by_id(connector, group_ids) if group_ids else {}
+            self.dp_ids = get_group_loader_dp_ids_by_id(connector, group_ids) if group_ids else {}
+            self.properties = get_group_loader_properties_by_id(connector, group_ids) if group_ids else {}
+
+    def get_group_ids(self, mem_id: int) -> List[int]:
+        if self.prefetch:
+            return list(self.group_ids.get(mem_id, []))
+        return get_group_loader_group_id(self.connector, mem_id=mem_id)
+
+    def get_group_name(self, group_id: int) -> str:
+        if self.prefetch:
+            return self.group_names.get(group_id, '')
+        return get_group_loader_group_name(self.connector, group_id=group_id, group_prefix_1=self.group_prefix_1)
+
+    def get_active_periods(self, group_id: int) -> List[ActivePeriod]:
+        if self.prefetch:
+            return list(self.active_periods.get(group_id, []))
+        return get_group_loader_active_periods(self.connector, group_id=group_id)
+
+    def get_dp_ids(self, group_id: int) -> List[str]:
+        if self.prefetch:
+            return list(self.dp_ids.get(group_id, []))
+        return get_group_loader_dp_ids(self.connector, group_id=group_id)
+
+    def get_properties(self, group_id: int) -> List[Property]:
+        if self.prefetch:
+            return list(self.properties.get(group_id, []))
+        return get_group_loader_properties(self.connector, group_id=group_id)
+
+
+def get_group_loader_group_names(connector: DbConnector, group_prefix_1: str) -> Dict[int, str]:
+    """
+    Get the names of all groups matching a group prefix in a single query.
+
+    :param connector: A database connection.
+    :param group_prefix_1: The group prefix pattern.
+    :return: The Group names keyed by group ID.
+    """
+    sql_group_names = '''
+         select
+             g.group_id, g.group_name
+         from
+            "group" g
+         where
+            g.group_name like %s
+    '''
+    group_names: Dict[int, str] = {}
+    with closing(connector.get_connection().cursor()) as cursor:
+        cursor.execute(sql_group_names, [group_prefix_1])
+        rows = cursor.fetchall()
+        for row in rows:
+            group_names[row[0]] = row[1]
+    return group_names
+
+
 def get_group_loader_group_name(connector: DbConnector, group_id: int, group_prefix_1: str) -> str:
     """
     Get group name for a group id.
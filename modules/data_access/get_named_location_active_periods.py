@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 from contextlib import closing
-from typing import List
+from typing import Dict, Iterable, List
 
 from data_access.types.active_period import ActivePeriod
-from data_access.db_connector import DbConnector
+from data_access.db_connector import DbConnector, execute
 
 
 def get_active_periods(connector: DbConnector, named_location_id: int) -> List[ActivePeriod]:
@@ -27,10 +27,41 @@ def get_active_periods(connector: DbConnector, named_location_id: int) -> List[A
     '''
     periods: List[ActivePeriod] = []
     with closing(connection.cursor()) as cursor:
-        cursor.execute(sql, [named_location_id])
+        execute(connector, cursor, 'named_location_active_periods', sql, [named_location_id])
         rows = cursor.fetchall()
         for row in rows:
             start_date = row[0]
             end_date = row[1]
             periods.append(ActivePeriod(start_date=start_date, end_date=end_date))
     return periods
+
+
+def get_active_periods_by_id(connector: DbConnector, named_location_ids: Iterable[int]) -> Dict[int, List[ActivePeriod]]:
+    """
+    Get the active time periods for many named locations in a single query.
+
+    :param connector: A database connection.
+    :param named_location_ids: The named location IDs.
+    :return: The active periods keyed by named location ID.
+    """
+    connection = connector.get_connection()
+    schema = connector.get_schema()
+    sql = f'''
+        select 
+            named_location_id, start_date, end_date 
+        from 
+            {schema}.active_period 
+        where 
+            named_location_id = ANY (%s)
+        order by named_location_id, start_date
+    '''
+    periods: Dict[int, List[ActivePeriod]] = {}
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, (list(named_location_ids),))
+        rows = cursor.fetchall()
+        for row in rows:
+            named_location_id = row[0]
+            start_date = row[1]
+            end_date = row[2]
+            periods.setdefault(named_location_id, []).append(ActivePeriod(start_date=start_date, end_date=end_date))
+    return periods
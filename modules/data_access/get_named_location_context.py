@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 from contextlib import closing
-from typing import List
+from typing import Dict, Iterable, List
 
-from data_access.db_connector import DbConnector
+from data_access.db_connector import DbConnector, execute
 
 
 def get_named_location_context(connector: DbConnector, named_location_id: int) -> List[str]:
@@ -25,9 +25,39 @@ def get_named_location_context(connector: DbConnector, named_location_id: int) -
     '''
     contexts: List[str] = []
     with closing(connection.cursor()) as cursor:
-        cursor.execute(sql, [named_location_id])
+        execute(connector, cursor, 'named_location_context', sql, [named_location_id])
         rows = cursor.fetchall()
         for row in rows:
             context_code = row[0]
             contexts.append(context_code)
     return contexts
+
+
+def get_named_location_context_by_id(connector: DbConnector, named_location_ids: Iterable[int]) -> Dict[int, List[str]]:
+    """
+    Get context entries for many named locations in a single query.
+
+    :param connector: A database connection.
+    :param named_location_ids: The named location IDs.
+    :return: The context entries keyed by named location ID.
+    """
+    connection = connector.get_connection()
+    schema = connector.get_schema()
+    sql = f'''
+        select 
+            named_location_id,
+            context_code
+        from 
+            {schema}.named_location_context 
+        where 
+            named_location_id = ANY (%s)
+    '''
+    contexts: Dict[int, List[str]] = {}
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, (list(named_location_ids),))
+        rows = cursor.fetchall()
+        for row in rows:
+            named_location_id = row[0]
+            context_code = row[1]
+            contexts.setdefault(named_location_id, []).append(context_code)
+    return contexts
@@ -8,7 +8,7 @@ import common.date_formatter as date_formatter
 from data_access.get_named_location_parents import get_named_location_parents
 from data_access.get_named_location_properties import get_named_location_properties
 from data_access.get_geolocation_properties import get_geolocation_properties
-from data_access.db_connector import DbConnector
+from data_access.db_connector import DbConnector, execute
 from data_access.types.property import Property
 
 
@@ -50,7 +50,7 @@ def get_named_location_geolocations(connector: DbConnector, named_location_id: i
     '''
     features: List[Feature] = []
     with closing(connection.cursor()) as cursor:
-        cursor.execute(sql, [named_location_id])
+        execute(connector, cursor, 'named_location_geolocations', sql, [named_location_id])
         rows = cursor.fetchall()
         for row in rows:
             location_id = row[0]
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
-from typing import Dict, Optional, Tuple, Any
+from typing import Dict, Iterable, Optional, Tuple, Any
 from contextlib import closing
 
-from data_access.db_connector import DbConnector
+from data_access.db_connector import DbConnector, execute
 
 
 def get_named_location_parents(connector: DbConnector, named_location_id: int) -> Optional[Dict[str, Tuple[int, str]]]:
@@ -17,14 +17,15 @@ def get_named_location_parents(connector: DbConnector, named_location_id: int) -
     connection = connector.get_connection()
     parents: Dict[str, Tuple[int, str]] = {}
     with closing(connection.cursor()) as cursor:
-        find_parent(cursor, schema, named_location_id, parents)
+        find_parent(cursor, schema, named_location_id, parents, connector)
     if not parents:
         return None
     else:
         return parents
 
 
-def find_parent(cursor: Any, schema: str, named_location_id: int, parents: Dict[str, Tuple[int, str]]):
+def find_parent(cursor: Any, schema: str, named_location_id: int, parents: Dict[str, Tuple[int, str]],
+                connector: Optional[DbConnector] = None):
     """
     Recursively search for the site.
 
@@ -32,6 +33,7 @@ def find_parent(cursor: Any, schema: str, named_location_id: int, parents: Dict[
     :param schema: The schema to query.
     :param named_location_id: The named location ID.
     :param parents: Collection to append to.
+    :param connector: The connector owning the cursor, used for prepared statements.
     """
     sql = f'''
         select
@@ -47,7 +49,7 @@ def find_parent(cursor: Any, schema: str, named_location_id: int, parents: Dict[
         where
             chld_nam_locn_id = %s
     '''
-    cursor.execute(sql, [named_location_id])
+    execute(connector, cursor, 'named_location_parent', sql, [named_location_id])
     row = cursor.fetchone()
     if row is not None:
         parent_id = row[0]
@@ -57,4 +59,65 @@ def find_parent(cursor: Any, schema: str, named_location_id: int, parents: Dict[
             parents['site'] = (parent_id, name)
         if type_name.lower() == 'domain':
             parents['domain'] = (parent_id, name)        
-        find_parent(cursor, schema, parent_id, parents)
+        find_parent(cursor, schema, parent_id, parents, connector)
+
+
+def get_named_location_parents_by_id(connector: DbConnector,
+                                     named_location_ids: Iterable[int]) -> Dict[int, Dict[str, Tuple[int, str]]]:
+    """
+    Get the site and domain of many named locations with a single recursive query.
+
+    :param connector: A database connection.
+    :param named_location_ids: The named location IDs.
+    :return: The parents keyed by named location ID, locations without parents are omitted.
+    """
+    schema = connector.get_schema()
+    connection = connector.get_connection()
+    sql = f'''
+        with recursive ancestor(chld_nam_locn_id, prnt_nam_locn_id, depth) as (
+            select
+                chld_nam_locn_id,
+                prnt_nam_locn_id,
+                1
+            from
+                {schema}.nam_locn_tree
+            where
+                chld_nam_locn_id = ANY (%s)
+            union all
+            select
+                ancestor.chld_nam_locn_id,
+                nam_locn_tree.prnt_nam_locn_id,
+                ancestor.depth + 1
+            from
+                ancestor
+            join
+                {schema}.nam_locn_tree on nam_locn_tree.chld_nam_locn_id = ancestor.prnt_nam_locn_id
+        )
+        select
+            ancestor.chld_nam_locn_id,
+            ancestor.prnt_nam_locn_id,
+            nam_locn.nam_locn_name,
+            type.type_name
+        from
+            ancestor
+        join
+            {schema}.nam_locn on nam_locn.nam_locn_id = ancestor.prnt_nam_locn_id
+        join
+            {schema}.type on type.type_id = nam_locn.type_id
+        order by
+            ancestor.chld_nam_locn_id, ancestor.depth
+    '''
+    parents: Dict[int, Dict[str, Tuple[int, str]]] = {}
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, (list(named_location_ids),))
+        rows = cursor.fetchall()
+        for row in rows:
+            named_location_id = row[0]
+            parent_id = row[1]
+            name = row[2]
+            type_name = row[3]
+            if type_name.lower() == 'site':
+                parents.setdefault(named_location_id, {})['site'] = (parent_id, name)
+            if type_name.lower() == 'domain':
+                parents.setdefault(named_location_id, {})['domain'] = (parent_id, name)
+    return parents
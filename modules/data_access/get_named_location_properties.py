@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 from contextlib import closing
-from typing import List
+from typing import Dict, Iterable, List
 
 import common.date_formatter as date_formatter
 from data_access.types.property import Property
 
-from data_access.db_connector import DbConnector
+from data_access.db_connector import DbConnector, execute
 
 
 def get_named_location_properties(connector: DbConnector, named_location_id: int) -> List[Property]:
@@ -33,21 +33,64 @@ def get_named_location_properties(connector: DbConnector, named_location_id: int
     '''
     properties: List[Property] = []
     with closing(connection.cursor()) as cursor:
-        cursor.execute(sql, [named_location_id])
+        execute(connector, cursor, 'named_location_properties', sql, [named_location_id])
         rows = cursor.fetchall()
         for row in rows:
-            name = row[0]
-            string_value = row[1]
-            number_value = row[2]
-            date_value = row[3]
-            if string_value is not None:
-                properties.append(Property(name=name, value=string_value))
-            if number_value is not None:
-                if name == 'Required Asset Management Location ID':
-                    properties.append(Property(name=name, value=int(number_value)))
-                else:
-                    properties.append(Property(name=name, value=number_value))
-            if date_value is not None:
-                date_value = date_formatter.to_string(date_value)
-                properties.append(Property(name=name, value=date_value))
+            add_properties(properties, row[0], row[1], row[2], row[3])
     return properties
+
+
+def get_named_location_properties_by_id(connector: DbConnector,
+                                        named_location_ids: Iterable[int]) -> Dict[int, List[Property]]:
+    """
+    Get the properties associated with many named locations in a single query.
+
+    :param connector: A database connection.
+    :param named_location_ids: The named location IDs to search.
+    :return: The named location properties keyed by named location ID.
+    """
+    connection = connector.get_connection()
+    schema = connector.get_schema()
+    sql = f'''
+        select
+            property.nam_locn_id,
+            attr.attr_name,
+            property.string_value,
+            property.number_value,
+            property.date_value
+        from
+            {schema}.property
+        join
+            {schema}.attr on property.attr_id = attr.attr_id
+        where
+            property.nam_locn_id = ANY (%s)
+    '''
+    properties: Dict[int, List[Property]] = {}
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, (list(named_location_ids),))
+        rows = cursor.fetchall()
+        for row in rows:
+            add_properties(properties.setdefault(row[0], []), row[1], row[2], row[3], row[4])
+    return properties
+
+
+def add_properties(properties: List[Property], name: str, string_value, number_value, date_value) -> None:
+    """
+    Append the non-null values of a property row.
+
+    :param properties: Collection to append to.
+    :param name: The attribute name.
+    :param string_value: The string value.
+    :param number_value: The number value.
+    :param date_value: The date value.
+    """
+    if string_value is not None:
+        properties.append(Property(name=name, value=string_value))
+    if number_value is not None:
+        if name == 'Required Asset Management Location ID':
+            properties.append(Property(name=name, value=int(number_value)))
+        else:
+            properties.append(Property(name=name, value=number_value))
+    if date_value is not None:
+        date_value = date_formatter.to_string(date_value)
+        properties.append(Property(name=name, value=date_value))
@@ -4,20 +4,24 @@ from typing import Dict, List, Set, Iterator, Optional, Tuple
 from data_access.types.active_period import ActivePeriod
 from data_access.types.named_location import NamedLocation
 from data_access.types.property import Property
-from data_access.get_named_location_active_periods import get_active_periods
-from data_access.get_named_location_properties import get_named_location_properties
-from data_access.get_named_location_context import get_named_location_context
-from data_access.get_named_location_parents import get_named_location_parents
+from data_access.get_named_location_active_periods import get_active_periods, get_active_periods_by_id
+from data_access.get_named_location_properties import get_named_location_properties, \
+    get_named_location_properties_by_id
+from data_access.get_named_location_context import get_named_location_context, get_named_location_context_by_id
+from data_access.get_named_location_parents import get_named_location_parents, get_named_location_parents_by_id
 from data_access.db_connector import DbConnector
 
 
-def get_named_locations(connector: DbConnector, location_type: str, source_type: str) -> Iterator[NamedLocation]:
+def get_named_locations(connector: DbConnector, location_type: str, source_type: str,
+                        prefetch: bool = True) -> Iterator[NamedLocation]:
     """
     Get the named locations of the given type.
 
     :param connector: A database connection.
     :param location_type: The named location type.
     :param source_type: The sensor type.
+    :param prefetch: Load active periods, context, properties and parents for all
+        locations in batched queries rather than per location.
     :return: The named locations.
     """
     connection = connector.get_connection()
@@ -58,36 +62,93 @@ def get_named_locations(connector: DbConnector, location_type: str, source_type:
     with closing(connection.cursor()) as cursor:
         cursor.execute(sql, (location_type, source_type))
         rows = cursor.fetchall()
-        for row in rows:
-            key = row[0]
-            name = row[1]
-            description = row[2]
-            active_periods: List[ActivePeriod] = get_active_periods(connector, key)
-            context: List[str] = get_named_location_context(connector, key)
-            properties: List[Property] = get_named_location_properties(connector, key)
-            schema_names: Set[str] = {source_type}
-            parents: Dict[str, Tuple[int, str]] = get_named_location_parents(connector, key)
-            (parent_id, name_domain) = parents['domain'] if parents else None
-            domain: str = name_domain
-            (site_id, name_site) = parents['site'] if parents else None
-            site: str = name_site
-            processing_start_date = get_processing_start_date(properties)
-            if processing_start_date is None:
-                processing_start_date = get_site_start_date(connector, site_id)
-                if processing_start_date is not None:
-                    properties.append(Property(name=processing_start_date_name(), value=processing_start_date))
-            else:
+    hydrator = NamedLocationHydrator(connector, [row[0] for row in rows], prefetch)
+    for row in rows:
+        key = row[0]
+        name = row[1]
+        description = row[2]
+        active_periods: List[ActivePeriod] = hydrator.get_active_periods(key)
+        context: List[str] = hydrator.get_context(key)
+        properties: List[Property] = hydrator.get_properties(key)
+        schema_names: Set[str] = {source_type}
+        parents: Dict[str, Tuple[int, str]] = hydrator.get_parents(key)
+        (parent_id, name_domain) = parents['domain'] if parents else None
+        domain: str = name_domain
+        (site_id, name_site) = parents['site'] if parents else None
+        site: str = name_site
+        processing_start_date = get_processing_start_date(properties)
+        if processing_start_date is None:
+            processing_start_date = hydrator.get_site_start_date(site_id)
+            if processing_start_date is not None:
                 properties.append(Property(name=processing_start_date_name(), value=processing_start_date))
-            named_location = NamedLocation(name=name,
-                                           type=location_type,
-                                           description=description,
-                                           domain=domain,
-                                           site=site,
-                                           schema_names=schema_names,
-                                           context=context,
-                                           active_periods=active_periods,
-                                           properties=properties)
-            yield named_location
+        else:
+            properties.append(Property(name=processing_start_date_name(), value=processing_start_date))
+        named_location = NamedLocation(name=name,
+                                       type=location_type,
+                                       description=description,
+                                       domain=domain,
+                                       site=site,
+                                       schema_names=schema_names,
+                                       context=context,
+                                       active_periods=active_periods,
+                                       properties=properties)
+        yield named_location
+
+
+class NamedLocationHydrator:
+    """
+    Supplies the per-location details for a set of named locations, either from batched
+    queries over the whole set or from one query per location. Site start dates are
+    memoized per site ID in both modes.
+    """
+
+    def __init__(self, connector: DbConnector, named_location_ids: List[int], prefetch: bool) -> None:
+        self.connector = connector
+        self.prefetch = prefetch
+        self.site_start_dates: Dict[int, Optional[str]] = {}
+        if prefetch:
+            keys = list(dict.fromkeys(named_location_ids))
+            self.active_periods = get_active_periods_by_id(connector, keys)
+            self.context = get_named_location_context_by_id(connector, keys)
+            self.properties = get_named_location_properties_by_id(connector, keys)
+            self.parents = get_named_location_parents_by_id(connector, keys)
+            self.prefetch_site_start_dates()
+
+    def prefetch_site_start_dates(self) -> None:
+        site_ids = set()
+        for key, parents in self.parents.items():
+            if 'site' in parents and get_processing_start_date(self.properties.get(key, [])) is None:
+                site_ids.add(parents['site'][0])
+        if site_ids:
+            site_properties = get_named_location_properties_by_id(self.connector, site_ids)
+            for site_id in site_ids:
+                self.site_start_dates[site_id] = get_processing_start_date(site_properties.get(site_id, []))
+
+    def get_active_periods(self, key: int) -> List[ActivePeriod]:
+        if self.prefetch:
+            return list(self.active_periods.get(key, []))
+        return get_active_periods(self.connector, key)
+
+    def get_context(self, key: int) -> List[str]:
+        if self.prefetch:
+            return list(self.context.get(key, []))
+        return get_named_location_context(self.connector, key)
+
+    def get_properties(self, key: int) -> List[Property]:
+        if self.prefetch:
+            return list(self.properties.get(key, []))
+        return get_named_location_properties(self.connector, key)
+
+    def get_parents(self, key: int) -> Optional[Dict[str, Tuple[int, str]]]:
+        if self.prefetch:
+            parents = self.parents.get(key)
+            return dict(parents) if parents else None
+        return get_named_location_parents(self.connector, key)
+
+    def get_site_start_date(self, site_id: int) -> Optional[str]:
+        if site_id not in self.site_start_dates:
+            self.site_start_dates[site_id] = get_site_start_date(self.connector, site_id)
+        return self.site_start_dates[site_id]
 
 
 def get_site_start_date(connector: DbConnector, site_id: int) -> Optional[str]:
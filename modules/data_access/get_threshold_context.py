@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 from contextlib import closing
-from typing import List
+from typing import Dict, List, Optional
 
-from data_access.db_connector import DbConnector
+from data_access.db_connector import DbConnector, execute
 
 
 def get_threshold_context(connector: DbConnector, threshold_uuid: str) -> List[str]:
@@ -25,9 +25,46 @@ def get_threshold_context(connector: DbConnector, threshold_uuid: str) -> List[s
             where
                 threshold_uuid = %s
         '''
-        cursor.execute(sql, [threshold_uuid])
+        execute(connector, cursor, 'threshold_context', sql, [threshold_uuid])
         rows = cursor.fetchall()
         for row in rows:
             context_code = row[0]
             context_codes.append(context_code)
     return context_codes
+
+
+def get_threshold_contexts(connector: DbConnector, terms: Optional[List[str]]) -> Dict[str, List[str]]:
+    """
+    Get the context codes for all thresholds of the given terms in a single query.
+
+    :param connector: A database connection.
+    :param terms: The threshold term names, or None for all terms.
+    :return: The context codes keyed by threshold UUID.
+    """
+    connection = connector.get_connection()
+    schema = connector.get_schema()
+    sql = f'''
+        select 
+            threshold_context.threshold_uuid,
+            threshold_context.context_code 
+        from 
+            {schema}.threshold_context 
+        join 
+            {schema}.threshold on threshold.threshold_uuid = threshold_context.threshold_uuid
+    '''
+    contexts: Dict[str, List[str]] = {}
+    with closing(connection.cursor()) as cursor:
+        if terms is None:
+            cursor.execute(sql)
+        else:
+            sql += '''
+        where 
+            threshold.term_name = ANY (%s)
+    '''
+            cursor.execute(sql, (terms,))
+        rows = cursor.fetchall()
+        for row in rows:
+            threshold_uuid = row[0]
+            context_code = row[1]
+            contexts.setdefault(threshold_uuid, []).append(context_code)
+    return contexts
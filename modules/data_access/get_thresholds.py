@@ -1,14 +1,22 @@
 from contextlib import closing
-from typing import List, Iterator
+from typing import Dict, List, Iterator, Optional
 
 import common.date_formatter as date_formatter
 from data_access.types.threshold import Threshold
-from data_access.get_threshold_context import get_threshold_context
-from data_access.db_connector import DbConnector
+from data_access.get_threshold_context import get_threshold_context, get_threshold_contexts
+from data_access.db_connector import DbConnector, get_cursor
 
 
-def get_thresholds(connector: DbConnector, term: str) -> Iterator[Threshold]:
-    connection = connector.get_connection()
+def get_thresholds(connector: DbConnector, term: str, prefetch_context: bool = True) -> Iterator[Threshold]:
+    """
+    Get the thresholds for the given terms.
+
+    :param connector: A database connection.
+    :param term: Pipe-separated term names, or 'none' for all terms.
+    :param prefetch_context: Load the context codes of all thresholds in one query
+        rather than one query per threshold.
+    :return: The thresholds.
+    """
     schema = connector.get_schema()
     sql = f'''
          select
@@ -40,14 +48,16 @@ def get_thresholds(connector: DbConnector, term: str) -> Iterator[Threshold]:
          order by
              nam_locn.nam_locn_name, threshold.term_name, threshold.threshold_name, attr.column_name
      '''
-    with closing(connection.cursor()) as cursor:
-        if term == 'none':
+    terms: Optional[List[str]] = None if term == 'none' else term.split("|")
+    contexts: Optional[Dict[str, List[str]]] = None
+    if prefetch_context:
+        contexts = get_threshold_contexts(connector, terms)
+    with closing(get_cursor(connector, 'get_thresholds')) as cursor:
+        if terms is None:
             cursor.execute(sql.replace("and \n             threshold.term_name = ANY (%s)", ""))
         else:
-            terms = term.split("|")
             cursor.execute(sql, (terms,))
-        rows = cursor.fetchall()
-        for row in rows:
+        for row in cursor:
             threshold_name = row[0]
             term_name = row[1]
             threshold_uuid = row[2]
@@ -72,7 +82,10 @@ def get_thresholds(connector: DbConnector, term: str) -> Iterator[Threshold]:
                 end_date = date_formatter.to_string(end_date)
             if number_value is not None:
                 number_value = float(number_value)
-            context: List[str] = get_threshold_context(connector, threshold_uuid)
+            if contexts is not None:
+                context: List[str] = list(contexts.get(threshold_uuid, []))
+            else:
+                context: List[str] = get_threshold_context(connector, threshold_uuid)
             threshold = Threshold(threshold_name=threshold_name,
                                   term_name=term_name,
                                   location_name=location_name,
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+from typing import Callable, List, Optional, Sequence, Tuple
+
+
+class FakeCursor:
+    """Stand-in database cursor returning rows from a query handler and recording each query."""
+
+    def __init__(self, connection: 'FakeConnection', name: Optional[str] = None) -> None:
+        self.connection = connection
+        self.name = name
+        self.itersize = 2000
+        self.rows: List[tuple] = []
+
+    def execute(self, sql: str, parameters: Optional[Sequence] = None) -> None:
+        if isinstance(sql, bytes):
+            sql = sql.decode()
+        self.connection.queries.append((sql, parameters))
+        self.rows = list(self.connection.handler(sql, parameters))
+
+    def mogrify(self, sql: str, parameters: Sequence) -> bytes:
+        """Format a query as psycopg2.extras.execute_values expects, with parameters in their repr form."""
+        if isinstance(sql, bytes):
+            sql = sql.decode()
+        return (sql % tuple(repr(parameter) for parameter in parameters)).encode()
+
+    def fetchall(self) -> List[tuple]:
+        return self.rows
+
+    def fetchone(self) -> Optional[tuple]:
+        return self.rows[0] if self.rows else None
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def close(self) -> None:
+        pass
+
+
+class FakeConnection:
+
+    def __init__(self, handler: Callable[[str, Optional[Sequence]], List[tuple]]) -> None:
+        self.handler = handler
+        self.queries: List[Tuple[str, Optional[Sequence]]] = []
+        self.cursors: List[FakeCursor] = []
+        self.closed = False
+        self.encoding = 'UTF8'
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self, name: Optional[str] = None) -> FakeCursor:
+        cursor = FakeCursor(self, name)
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeConnector:
+    """Stand-in for DbConnector; the handler maps (sql, parameters) to result rows."""
+
+    def __init__(self, handler: Callable[[str, Optional[Sequence]], List[tuple]], schema: str = 'pdr',
+                 itersize: int = 0) -> None:
+        self.connection = FakeConnection(handler)
+        self.schema = schema
+        self.itersize = itersize
+
+    def get_schema(self) -> str:
+        return self.schema
+
+    def get_connection(self) -> FakeConnection:
+        return self.connection
+
+    def close(self) -> None:
+        pass
+
+    @property
+    def query_count(self) -> int:
+        return len(self.connection.queries)
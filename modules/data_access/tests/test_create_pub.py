@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import unittest
+
+import pandas as pd
+
+from data_access.create_pub import create_pub, create_pubs
+from data_access.tests.fake_connector import FakeConnector
+
+
+def get_manifest(site: str) -> pd.DataFrame:
+    files = [f'NEON.D10.{site}.DP1.00041.001.001.501.001.ST_1_minute.2019-01.basic.20210720T001022Z.csv',
+             f'NEON.D10.{site}.DP1.00041.001.EML.20190101-20190201.20210720T001022Z.xml',
+             f'NEON.D10.{site}.DP1.00041.001.readme.20210720T001022Z.txt']
+    return pd.DataFrame({'file': files,
+                         'hasData': [False, True, False],
+                         'visibility': 'public',
+                         'size': [94064, 100, 200],
+                         'checksum': ['a', 'b', 'c'],
+                         'objectId': [f'egress/{file}' for file in files]})
+
+
+class CreatePubTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dp_pub_id = 0
+
+    def handler(self, sql: str, parameters):
+        if 'RETURNING dp_pub_id' in sql:
+            self.dp_pub_id += 1
+            return [(self.dp_pub_id,)]
+        if 'select' in sql:
+            # an existing pub for CPER is replaced
+            return [(99, 'P')] if parameters[1] == 'CPER' else []
+        return []
+
+    def test_create_pubs(self):
+        sites = ['CPER', 'ONAQ', 'HARV']
+        connector = FakeConnector(self.handler)
+        for site in sites:
+            create_pub(connector, get_manifest(site), 'v1', 'test')
+        single_queries = connector.query_count
+        self.assertEqual(3, connector.connection.commits)
+
+        bulk_connector = FakeConnector(self.handler)
+        self.dp_pub_id = 0
+        object_count = create_pubs(bulk_connector, (get_manifest(site) for site in sites), 'v1', 'test',
+                                   commit_size=2)
+        self.assertEqual(9, object_count)
+        self.assertEqual(2, bulk_connector.connection.commits)
+        # one select, one delete for CPER, one dp_pub and one dp_pub_object insert per manifest
+        self.assertEqual(10, bulk_connector.query_count)
+        self.assertEqual(16, single_queries)
+        dp_pub_parameters = [parameters for sql, parameters in connector.connection.queries
+                             if 'INSERT INTO pdr.dp_pub\n' in sql]
+        bulk_dp_pub_parameters = [parameters for sql, parameters in bulk_connector.connection.queries
+                                  if 'INSERT INTO pdr.dp_pub\n' in sql]
+        self.assertEqual([parameters[:7] + parameters[9:] for parameters in dp_pub_parameters],
+                         [parameters[:7] + parameters[9:] for parameters in bulk_dp_pub_parameters])
+        self.assertEqual(('NEON.DOM.SITE.DP1.00041.001', 'CPER', 'basic'), dp_pub_parameters[0][:3])
+        self.assertEqual('Y', dp_pub_parameters[0][5])
+        object_sql = [sql for sql, parameters in bulk_connector.connection.queries if 'dp_pub_object' in sql]
+        self.assertEqual(3, len(object_sql))
+        self.assertIn("(nextval('dp_pub_object_id_seq1'), 1, 'DATA', 'egress/NEON.D10.CPER", object_sql[0])
+        self.assertIn("'METADATA'", object_sql[0])
+        self.assertIn("'README'", object_sql[0])
+
+    def test_create_pubs_rollback(self):
+        connector = FakeConnector(self.handler)
+        manifest = get_manifest('CPER')
+        manifest['file'] = 'manifest.csv'
+        with self.assertRaises(ValueError):
+            create_pubs(connector, [get_manifest('ONAQ'), manifest], 'v1', 'test')
+        self.assertEqual(1, connector.connection.rollbacks)
+        self.assertEqual(0, connector.connection.commits)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import os
+import time
+import unittest
+from contextlib import closing
+
+import data_access.db_config_reader as db_config_reader
+from data_access.create_pub import create_pub, create_pubs
+from data_access.db_connector import DbConnector
+from data_access.tests.test_create_pub import get_manifest
+
+SCHEMA = 'create_pub_benchmark'
+
+
+class LocalDbConnector(DbConnector):
+    """A connector to a local PostgreSQL, which usually runs without SSL."""
+
+    def _connect_parameters(self) -> dict:
+        parameters = super()._connect_parameters()
+        parameters['sslmode'] = os.environ.get('DB_SSLMODE', 'prefer')
+        return parameters
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS') and os.environ.get('DB_HOST'),
+                     'Benchmark skipped, it needs a local PostgreSQL set in the DB_* variables.')
+class CreatePubBenchmarkTest(unittest.TestCase):
+    """Time creating the pub records of 500 manifests of 300 objects row by row and in bulk."""
+
+    def setUp(self):
+        config = db_config_reader.read_from_environment()._replace(schema=SCHEMA)
+        self.connector = LocalDbConnector(config)
+        self.execute(f'''
+            drop schema if exists {SCHEMA} cascade;
+            create schema {SCHEMA};
+            create sequence {SCHEMA}.dp_pub_id_seq1;
+            create sequence {SCHEMA}.dp_pub_object_id_seq1;
+            create table {SCHEMA}.dp_pub (dp_pub_id integer primary key, dp_idq varchar(50), site varchar(10),
+                package_type varchar(20), data_interval_start date, data_interval_end date, has_data varchar(1),
+                status varchar(10), create_date timestamp, update_date timestamp, release_status varchar(1),
+                change_by varchar(50));
+            create table {SCHEMA}.dp_pub_object (dp_pub_object_id integer primary key,
+                dp_pub_id integer references {SCHEMA}.dp_pub (dp_pub_id) on delete cascade, object_type varchar(20),
+                object_id varchar(500), object_size bigint, checksum varchar(50), tran_date timestamp,
+                supplier_version_id varchar(50));
+        ''')
+        manifest = get_manifest('SITE')
+        self.manifests = []
+        for index in range(0, 500):
+            site = f'S{index:03d}'
+            files = [file.replace('SITE', site) for file in manifest['file']] * 100
+            self.manifests.append(manifest.loc[[0, 1, 2] * 100].assign(file=files, objectId=files))
+
+    def tearDown(self):
+        self.execute(f'drop schema if exists {SCHEMA} cascade')
+        self.connector.close()
+
+    def execute(self, sql: str) -> None:
+        connection = self.connector.get_connection()
+        with closing(connection.cursor()) as cursor:
+            cursor.execute(sql)
+        connection.commit()
+
+    def test_create_pub(self):
+        rows = sum(len(manifest) for manifest in self.manifests)
+        start = time.perf_counter()
+        for manifest in self.manifests:
+            create_pub(self.connector, manifest, 'v1', 'benchmark')
+        single_time = time.perf_counter() - start
+        start = time.perf_counter()
+        self.assertEqual(rows, create_pubs(self.connector, self.manifests, 'v1', 'benchmark', commit_size=100))
+        bulk_time = time.perf_counter() - start
+        print(f'\n{rows} objects: row by row {rows / single_time:.0f} rows/s, bulk {rows / bulk_time:.0f} rows/s')
+
+
+if __name__ == '__main__':
+    unittest.main()
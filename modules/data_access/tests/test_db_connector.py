@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+import threading
+import unittest
+
+from data_access.db_connector import DbConfig, DbConnector, PooledDbConnector, execute, get_cursor, \
+    to_positional_parameters
+from data_access.get_assets import get_assets
+from data_access.get_named_location_context import get_named_location_context
+from data_access.tests.fake_connector import FakeConnection, FakeConnector
+
+
+def handler(sql, parameters):
+    if sql.startswith('prepare'):
+        return []
+    if 'avro_schema_name' in sql:
+        return [(n, 'prt') for n in range(0, 5)]
+    return [('context',)]
+
+
+class FakeDbConnector(DbConnector):
+
+    def _connect(self):
+        return FakeConnection(handler)
+
+
+class FakePool:
+
+    def __init__(self, max_connections: int) -> None:
+        self.max_connections = max_connections
+        self.connections = {}
+        self.returned = []
+        self.closed = False
+
+    def getconn(self, key=None):
+        if key in self.connections:
+            return self.connections[key]
+        if len(self.connections) >= self.max_connections:
+            raise Exception('connection pool exhausted')
+        connection = FakeConnection(handler)
+        self.connections[key] = connection
+        return connection
+
+    def putconn(self, connection, key=None):
+        self.returned.append(key)
+
+    def closeall(self):
+        self.closed = True
+
+
+class FakePooledDbConnector(PooledDbConnector):
+
+    def _create_pool(self):
+        return FakePool(self.max_connections)
+
+
+class DbConnectorTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.config = DbConfig(host='host', user='user', password='password', database_name='db', schema='pdr')
+
+    def test_to_positional_parameters(self) -> None:
+        sql = 'select * from t where a = %s and b = %s'
+        self.assertEqual(to_positional_parameters(sql), 'select * from t where a = $1 and b = $2')
+
+    def test_prepared_statements(self) -> None:
+        connector = FakeDbConnector(self.config, prepare_statements=True)
+        for n in range(0, 3):
+            self.assertEqual(get_named_location_context(connector, n), ['context'])
+        queries = [sql for sql, parameters in connector.get_connection().queries]
+        self.assertEqual(len(queries), 4)
+        self.assertTrue(queries[0].startswith('prepare named_location_context as'))
+        self.assertIn('named_location_id = $1', queries[0])
+        self.assertEqual(queries[1:], ['execute named_location_context (%s)'] * 3)
+
+    def test_unprepared_statements(self) -> None:
+        connector = FakeDbConnector(self.config)
+        cursor = connector.get_connection().cursor()
+        execute(connector, cursor, 'name', 'select %s', [1])
+        self.assertEqual(connector.get_connection().queries, [('select %s', [1])])
+
+    def test_server_side_cursor(self) -> None:
+        connector = FakeDbConnector(self.config, itersize=500)
+        assets = list(get_assets(connector, 'prt'))
+        self.assertEqual(len(assets), 5)
+        cursor = connector.get_connection().cursors[0]
+        self.assertEqual(cursor.name, 'get_assets')
+        self.assertEqual(cursor.itersize, 500)
+
+    def test_client_side_cursor(self) -> None:
+        connector = FakeConnector(handler)
+        cursor = get_cursor(connector, 'get_assets')
+        self.assertIsNone(cursor.name)
+
+    def test_pooled_connections(self) -> None:
+        connector = FakePooledDbConnector(self.config, max_connections=4, prepare_statements=True)
+        connections = {}
+        barrier = threading.Barrier(3)
+
+        def run(index: int) -> None:
+            connections[index] = connector.get_connection()
+            get_named_location_context(connector, index)
+            get_named_location_context(connector, index)
+            barrier.wait()
+
+        threads = [threading.Thread(target=run, args=(n,)) for n in range(0, 3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(connection) for connection in connections.values()}), 3)
+        for connection in connections.values():
+            # each connection prepares the statement once
+            self.assertEqual(len(connection.queries), 3)
+        main_connection = connector.get_connection()
+        self.assertIs(main_connection, connector.get_connection())
+        connector.close()
+        self.assertEqual(len(connector.pool.returned), 4)
+        self.assertTrue(connector.pool.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
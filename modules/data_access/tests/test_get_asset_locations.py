@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+import unittest
+from datetime import datetime
+
+import geojson
+
+from data_access.get_asset_locations import AssetLocationCache, get_asset_locations
+from data_access.tests.fake_connector import FakeConnector
+from data_access.types.asset import Asset
+
+
+class GetAssetLocationsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.names = {1: 'D03', 10: 'BARC', 11: 'SUGG'}
+        self.types = {1: 'Domain', 10: 'Site', 11: 'Site'}
+        self.tree = {10: 1, 11: 1}
+        for key in range(100, 110):
+            self.names[key] = f'CFGLOC{key}'
+            self.types[key] = 'CONFIG'
+            self.tree[key] = 10 + key % 2
+        self.properties = [(10, 'Site Name', 'Barco Lake', None, None)]
+        self.properties.extend((key, 'HOR', '000', None, None) for key in range(100, 110, 3))
+        self.context = [(key, f'context-{key % 3}') for key in range(100, 110)]
+        self.assets = [Asset(id=asset_id, type='prt') for asset_id in range(1000, 1030)]
+        self.install_rows = []
+        self.definitions = []
+        for asset in self.assets:
+            key = 100 + asset.id % 10
+            self.install_rows.append((key, datetime(2019, 1, 1), datetime(2019, 6, 1), self.names[key], 'CONFIG',
+                                      asset.id))
+            self.install_rows.append((key + 1 if key < 109 else 100, datetime(2019, 6, 1), None,
+                                      self.names[key + 1 if key < 109 else 100], 'CONFIG', asset.id))
+            self.definitions.append((asset.id, datetime(2018, 1, 1), datetime(2019, 6, 1), 'prt', 'old model',
+                                     'maker', '1.0'))
+            self.definitions.append((asset.id, datetime(2019, 6, 1), None, 'prt', 'new model', 'maker', '2.0'))
+
+    def ancestors(self, key):
+        depth = 1
+        while key in self.tree:
+            yield self.tree[key], depth
+            key = self.tree[key]
+            depth += 1
+
+    def handler(self, sql: str, parameters):
+        if 'locn_nam_locn' in sql:
+            key = parameters[0]
+            return [(key * 10, f'POINT Z ({key} 2 3)', datetime(2018, 1, 1), None, 0, 0, 0, 0, 0, 0, key,
+                     self.names[key])]
+        if 'property.locn_id' in sql:
+            return []
+        if 'with recursive' in sql:
+            return [(key, parent, self.names[parent], self.types[parent])
+                    for key in sorted(parameters[0]) for parent, depth in self.ancestors(key)]
+        if 'nam_locn_tree' in sql:
+            key = parameters[0]
+            parent = self.tree.get(key)
+            return [(parent, self.names[parent], self.types[parent])] if parent else []
+        if 'sw_version' in sql:
+            if 'avro_schema_name' in sql:
+                return self.definitions
+            (install_date, remove_date, asset_id) = parameters
+            return [row[3:] for row in self.definitions if row[0] == asset_id and row[1] <= install_date and
+                    (row[2] is None or (remove_date is not None and row[2] >= remove_date))]
+        if 'is_asset_location' in sql:
+            if 'avro_schema_name' in sql:
+                return sorted(self.install_rows, key=lambda row: (row[5], row[1]))
+            return [row for row in self.install_rows if row[5] == parameters[0]]
+        if 'ANY' in sql:
+            keys = set(parameters[0])
+            rows = self.context if 'named_location_context' in sql else self.properties
+            return [row for row in rows if row[0] in keys]
+        rows = self.context if 'named_location_context' in sql else self.properties
+        return [row[1:] for row in rows if row[0] == parameters[0]]
+
+    def test_cache_matches_per_asset_queries(self) -> None:
+        single_connector = FakeConnector(self.handler)
+        single = [get_asset_locations(single_connector, asset) for asset in self.assets]
+        cached_connector = FakeConnector(self.handler)
+        cache = AssetLocationCache(cached_connector, 'prt')
+        cached = [get_asset_locations(cached_connector, asset, cache=cache) for asset in self.assets]
+        self.assertEqual([geojson.dumps(locations, sort_keys=True, default=str) for locations in single],
+                         [geojson.dumps(locations, sort_keys=True, default=str) for locations in cached])
+        feature = cached[0]['features'][1]
+        self.assertEqual('new model', feature['asset_model'])
+        self.assertEqual('SUGG', feature['properties']['site'])
+        # five batched queries plus two geolocation queries (and one properties query) per named location
+        self.assertEqual(5 + 3 * 12, cached_connector.query_count)
+        self.assertGreater(single_connector.query_count, 10 * cached_connector.query_count)
+
+    def test_other_source_type(self) -> None:
+        connector = FakeConnector(self.handler)
+        cache = AssetLocationCache(connector, 'pqs1')
+        locations = get_asset_locations(connector, self.assets[0], cache=cache)
+        self.assertEqual(2, len(locations['features']))
+        self.assertFalse(cache.prefetched)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+import tempfile
+import unittest
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+from data_access.get_group_loaders import get_group_loaders
+from data_access.tests.fake_connector import FakeConnector
+from group_loader.group_loader import load_groups
+
+
+class GetGroupLoadersTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.location_count = 20
+        # group ID: (name, hor, ver, visibility code, named location ID)
+        self.groups = {1: ('temp-air_1', '000', '010', 'public', 10),
+                       2: ('temp-air_2', '000', '020', 'private', 11),
+                       3: ('rel-humidity_1', '000', '030', 'public', 10),
+                       4: ('temp-airx_1', '000', '040', 'public', 11)}
+        self.tree = {10: 1, 11: 1}
+        self.names = {1: 'D10', 10: 'CPER', 11: 'STER'}
+        self.types = {1: 'Domain', 10: 'Site', 11: 'Site'}
+        self.named_location_groups = []
+        for n in range(0, self.location_count):
+            key = 100 + n
+            self.names[key] = f'CFGLOC{key}'
+            # rows are stored out of group order
+            if n % 4 == 0:
+                self.named_location_groups.append((key, 4))
+            if n % 3 == 0:
+                self.named_location_groups.append((key, 3))
+            self.named_location_groups.append((key, 1 + n % 2))
+        # (group ID, member group ID)
+        self.group_members = [(2, 3), (3, 4), (1, 3)]
+        self.active_periods = [(1, datetime(2020, 1, 1), None),
+                               (1, datetime(2019, 1, 1), datetime(2019, 6, 1)),
+                               (2, datetime(2021, 1, 1), datetime(2022, 1, 1))]
+        self.dp_ids = [(1, 'NEON.DOM.SITE.DP1.00003.001'), (2, 'NEON.DOM.SITE.DP1.00002.001'),
+                       (1, 'NEON.DOM.SITE.DP1.00002.001')]
+
+    @staticmethod
+    def like(name: str, pattern: str) -> bool:
+        return name.startswith(pattern[:-1].replace('\\_', '_'))
+
+    @staticmethod
+    def order(sql: str, rows: list) -> list:
+        """Sort rows as the query's order by does, with nulls last, leaving them in scan order otherwise."""
+        if 'order by' not in sql:
+            return rows
+        return sorted(rows, key=lambda row: tuple((value is None, value if value is not None else 0) for value in row))
+
+    def ancestors(self, key):
+        depth = 1
+        while key in self.tree:
+            parent = self.tree[key]
+            yield parent, depth
+            key = parent
+            depth += 1
+
+    def handler(self, sql: str, parameters):
+        if 'nl.nam_locn_name' in sql:
+            rows = {(key, self.names[key]) for key, group_id in self.named_location_groups
+                    if self.like(self.groups[group_id][0], parameters[0])}
+            return sorted(rows)
+        if 'g2.group_name' in sql:
+            rows = {(member_id, self.groups[member_id][0]) for group_id, member_id in self.group_members
+                    if self.like(self.groups[group_id][0], parameters[0])}
+            return sorted(rows)
+        if 'with recursive' in sql:
+            rows = []
+            for key in sorted(parameters[0]):
+                for parent, depth in self.ancestors(key):
+                    rows.append((key, parent, self.names[parent], self.types[parent]))
+            return rows
+        if 'nam_locn_tree' in sql:
+            key = parameters[0]
+            if key not in self.tree:
+                return []
+            parent = self.tree[key]
+            return [(parent, self.names[parent], self.types[parent])]
+        if 'ANY' in sql:
+            # a batched plan scans the rows in a different order than the per ID lookups
+            keys = parameters[0]
+            if 'named_location_group' in sql:
+                return self.order(sql, list(dict.fromkeys(
+                    (key, group_id) for key, group_id in reversed(self.named_location_groups) if key in keys)))
+            if 'group_member' in sql:
+                return self.order(sql, [(member_id, group_id) for group_id, member_id in reversed(self.group_members)
+                                        if member_id in keys])
+            if 'group_active_period' in sql:
+                return self.order(sql, [row for row in reversed(self.active_periods) if row[0] in keys])
+            if 'data_product_group' in sql:
+                return self.order(sql, [(key, dp_idq[14:27]) for key, dp_idq in reversed(self.dp_ids) if key in keys])
+            return self.order(sql, [(key, *self.groups[key][1:], self.names[self.groups[key][4]])
+                                    for key in reversed(keys)])
+        if 'like' in sql:
+            if 'group_id = %s' in sql:
+                name = self.groups[parameters[0]][0]
+                return [(name,)] if self.like(name, parameters[1]) else []
+            return [(key, group[0]) for key, group in self.groups.items() if self.like(group[0], parameters[0])]
+        key = parameters[0]
+        if 'named_location_group' in sql:
+            return self.order(sql, [(group_id,) for group_id in dict.fromkeys(
+                group_id for mem_id, group_id in self.named_location_groups if mem_id == key)])
+        if 'group_member' in sql:
+            return self.order(sql, [(group_id,) for group_id, member_id in self.group_members if member_id == key])
+        if 'group_active_period' in sql:
+            return self.order(sql, [row[1:] for row in self.active_periods if row[0] == key])
+        if 'data_product_group' in sql:
+            return self.order(sql, [(dp_idq[14:27],) for group_id, dp_idq in self.dp_ids if group_id == key])
+        group = self.groups[key]
+        return [(group[0], *group[1:], self.names[group[4]])]
+
+    @staticmethod
+    def read_files(path: Path) -> dict:
+        return {str(file.relative_to(path)): file.read_bytes() for file in sorted(path.rglob('*')) if file.is_file()}
+
+    def load(self, connector: FakeConnector, prefetch: bool) -> dict:
+        with tempfile.TemporaryDirectory() as directory:
+            out_path = Path(directory, 'out')
+            get_groups = partial(get_group_loaders, connector=connector, prefetch=prefetch)
+            load_groups(out_path=out_path, err_path=Path(directory, 'errored'), get_groups=get_groups,
+                        group_prefix='temp-air_')
+            return self.read_files(out_path)
+
+    def test_prefetch_matches_per_group_queries(self) -> None:
+        bulk = self.load(FakeConnector(self.handler), prefetch=True)
+        single = self.load(FakeConnector(self.handler), prefetch=False)
+        # the named locations and the member group
+        self.assertEqual(len(bulk), self.location_count + 1)
+        self.assertEqual(bulk, single)
+        self.assertIn(b'"group": "temp-air_1"', bulk['temp-air/CFGLOC100/CFGLOC100.json'])
+        self.assertIn(b'"domain": "D10"', bulk['temp-air/CFGLOC100/CFGLOC100.json'])
+        self.assertNotIn(b'temp-airx_1', bulk['temp-air/CFGLOC100/CFGLOC100.json'])
+        self.assertIn(b'"group": "temp-air_2"', bulk['temp-air/rel-humidity_1/rel-humidity_1.json'])
+
+    def test_prefetch_uses_constant_queries(self) -> None:
+        connector = FakeConnector(self.handler)
+        get_group_loaders(connector, 'temp-air_')
+        # members, group IDs, group names, active periods, data product IDs, properties and parents
+        self.assertEqual(connector.query_count, 9)
+        single_connector = FakeConnector(self.handler)
+        get_group_loaders(single_connector, 'temp-air_', prefetch=False)
+        self.assertGreater(single_connector.query_count, 10 * connector.query_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+import unittest
+from datetime import datetime
+
+from data_access.get_named_locations import get_named_locations
+from data_access.tests.fake_connector import FakeConnector
+
+
+class GetNamedLocationsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.location_count = 20
+        self.domain = (1, 'D03')
+        self.sites = {10: 'BARC', 11: 'SUGG'}
+        self.types = {1: 'Domain', 10: 'Site', 11: 'Site'}
+        self.tree = {10: 1, 11: 1}
+        self.names = {1: 'D03', 10: 'BARC', 11: 'SUGG'}
+        self.locations = []
+        self.active_periods = []
+        self.context = []
+        self.properties = [(10, 'IS Processing Default Start Date', None, None, datetime(2018, 1, 1))]
+        for n in range(0, self.location_count):
+            key = 100 + n
+            site_id = 10 + n % 2
+            self.locations.append((key, f'CFGLOC{key}', f'location {key}', 'CONFIG', 'prt'))
+            self.tree[key] = site_id
+            self.types[key] = 'CONFIG'
+            self.names[key] = f'CFGLOC{key}'
+            self.active_periods.append((key, datetime(2019, 1, 1), datetime(2019, 6, 1)))
+            self.active_periods.append((key, datetime(2020, 1, 1), None))
+            self.context.append((key, f'context-{n % 3}'))
+            self.properties.append((key, 'HOR', '000', None, None))
+            if n % 5 == 0:
+                self.properties.append((key, 'IS Processing Default Start Date', None, None, datetime(2019, 1, 1)))
+        # duplicate rows are returned for locations with several assets
+        self.locations.insert(1, self.locations[0])
+
+    def ancestors(self, key):
+        depth = 1
+        while key in self.tree:
+            parent = self.tree[key]
+            yield parent, depth
+            key = parent
+            depth += 1
+
+    def handler(self, sql: str, parameters):
+        if 'nam_locn_desc' in sql:
+            return self.locations
+        if 'with recursive' in sql:
+            rows = []
+            for key in sorted(parameters[0]):
+                for parent, depth in self.ancestors(key):
+                    rows.append((key, parent, self.names[parent], self.types[parent]))
+            return rows
+        if 'nam_locn_tree' in sql:
+            key = parameters[0]
+            if key not in self.tree:
+                return []
+            parent = self.tree[key]
+            return [(parent, self.names[parent], self.types[parent])]
+        if 'ANY' in sql:
+            keys = set(parameters[0])
+            if 'active_period' in sql:
+                return [row for row in self.active_periods if row[0] in keys]
+            if 'named_location_context' in sql:
+                return [row for row in self.context if row[0] in keys]
+            return [row for row in self.properties if row[0] in keys]
+        key = parameters[0]
+        if 'active_period' in sql:
+            return [row[1:] for row in self.active_periods if row[0] == key]
+        if 'named_location_context' in sql:
+            return [row[1:] for row in self.context if row[0] == key]
+        return [row[1:] for row in self.properties if row[0] == key]
+
+    def test_prefetch_matches_per_location_queries(self) -> None:
+        bulk_connector = FakeConnector(self.handler)
+        single_connector = FakeConnector(self.handler)
+        bulk = list(get_named_locations(bulk_connector, 'CONFIG', 'prt'))
+        single = list(get_named_locations(single_connector, 'CONFIG', 'prt', prefetch=False))
+        self.assertEqual(len(bulk), self.location_count + 1)
+        self.assertEqual(bulk, single)
+        self.assertEqual(bulk[0].site, 'BARC')
+        self.assertEqual(bulk[0].domain, 'D03')
+        self.assertEqual(bulk[3].properties[-1].value, '2018-01-01T00:00:00Z')
+        self.assertEqual(len(bulk[2].properties), 1)
+
+    def test_prefetch_uses_constant_queries(self) -> None:
+        connector = FakeConnector(self.handler)
+        list(get_named_locations(connector, 'CONFIG', 'prt'))
+        # locations, active periods, context, properties, parents and site properties
+        self.assertEqual(connector.query_count, 6)
+
+    def test_site_start_date_is_memoized(self) -> None:
+        connector = FakeConnector(self.handler)
+        list(get_named_locations(connector, 'CONFIG', 'prt', prefetch=False))
+        site_queries = [parameters for sql, parameters in connector.connection.queries
+                        if 'property' in sql and parameters[0] in self.sites]
+        self.assertEqual(len(site_queries), len(self.sites))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+import unittest
+from datetime import datetime
+from decimal import Decimal
+
+from data_access.get_thresholds import get_thresholds
+from data_access.tests.fake_connector import FakeConnector
+
+
+class GetThresholdsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.threshold_count = 50
+        self.threshold_rows = []
+        self.context_rows = []
+        for n in range(0, self.threshold_count):
+            uuid = f'uuid-{n}'
+            self.threshold_rows.append(('attr', 'temp', uuid, f'CFGLOC{n}', datetime(2020, 1, 1), None,
+                                        False, None, None, Decimal('1.5'), None))
+            if n % 3 != 0:
+                self.context_rows.append((uuid, 'soil'))
+            if n % 2 == 0:
+                self.context_rows.append((uuid, f'context-{n}'))
+
+    def handler(self, sql: str, parameters):
+        if 'threshold_context' in sql:
+            if 'threshold_context.threshold_uuid' in sql:
+                # bulk context query
+                return self.context_rows
+            uuid = parameters[0]
+            return [(row[1],) for row in self.context_rows if row[0] == uuid]
+        return self.threshold_rows
+
+    def test_prefetch_uses_constant_queries(self) -> None:
+        connector = FakeConnector(self.handler)
+        thresholds = list(get_thresholds(connector, 'temp'))
+        self.assertEqual(len(thresholds), self.threshold_count)
+        self.assertEqual(connector.query_count, 2)
+
+    def test_prefetch_matches_per_threshold_queries(self) -> None:
+        bulk_connector = FakeConnector(self.handler)
+        single_connector = FakeConnector(self.handler)
+        bulk = list(get_thresholds(bulk_connector, 'temp|other'))
+        single = list(get_thresholds(single_connector, 'temp|other', prefetch_context=False))
+        self.assertEqual(bulk, single)
+        self.assertEqual(single_connector.query_count, self.threshold_count + 1)
+        self.assertEqual(bulk[0].context, ['context-0'])
+        self.assertEqual(bulk[3].context, [])
+        self.assertEqual(bulk[4].context, ['soil', 'context-4'])
+
+    def test_prefetch_all_terms(self) -> None:
+        connector = FakeConnector(self.handler)
+        thresholds = list(get_thresholds(connector, 'none'))
+        self.assertEqual(len(thresholds), self.threshold_count)
+        self.assertEqual(connector.query_count, 2)
+        for sql, parameters in connector.connection.queries:
+            self.assertIsNone(parameters)
+            self.assertNotIn('ANY', sql)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,46 +1,59 @@
 #!/usr/bin/env python3
 from pathlib import Path
+from typing import List, NamedTuple, Optional
+
 import structlog
-import shutil
 
+from common.path_linker import PathLinker, walk_files
 from date_gap_filler.date_gap_filler_config import DateGapFillerConfig
 
 
 log = structlog.getLogger()
 
 
-def link_files(config: DateGapFillerConfig, out_path: Path, location, year, month, day) -> None:
-    output_directories = config.output_directories
-    index = config.empty_file_type_index
-    empty_file_path = config.empty_file_path
-    create_directories(output_directories, out_path)
-    symlink = config.symlink
-    for path in empty_file_path.rglob('*'):
-        if path.is_file():
-            empty_file_type = path.parts[index]
-            if empty_file_type in output_directories:
-                link_empty_file(path, Path(out_path, empty_file_type), location, year, month, day, symlink)
-
-
-def create_directories(output_directories: list, out_path: Path) -> None:
+class EmptyFileTemplate(NamedTuple):
+    """An empty file and the output directory, i.e. the empty file type, it is linked into."""
+    path: Path
+    directory: str
+
+    def get_filename(self, location: str, year: str, month: str, day: str) -> str:
+        filename = self.path.name
+        filename = filename.replace('location', location)
+        filename = filename.replace('year', year)
+        filename = filename.replace('month', month)
+        filename = filename.replace('day', day)
+        return filename
+
+
+def read_templates(config: DateGapFillerConfig) -> List[EmptyFileTemplate]:
+    """
+    Walk the empty file directory once, recording each empty file in an output directory.
+
+    :param config: The configuration.
+    :return: The templates in walk order.
+    """
+    templates = []
+    for path in walk_files(config.empty_file_path):
+        empty_file_type = path.parts[config.empty_file_type_index]
+        if empty_file_type in config.output_directories:
+            templates.append(EmptyFileTemplate(path=path, directory=empty_file_type))
+    return templates
+
+
+def link_files(config: DateGapFillerConfig, out_path: Path, location, year, month, day, linker: PathLinker = None,
+               templates: Optional[List[EmptyFileTemplate]] = None) -> None:
+    if linker is None:
+        linker = PathLinker(symlink=config.symlink)
+    if templates is None:
+        templates = read_templates(config)
+    create_directories(config.output_directories, out_path, linker)
+    for template in templates:
+        link_path = Path(out_path, template.directory, template.get_filename(location, year, month, day))
+        log.debug(f'source: {template.path}, link: {link_path}')
+        linker.link(template.path, link_path)
+
+
+def create_directories(output_directories: list, out_path: Path, linker: PathLinker) -> None:
     for directory in output_directories:
-        path = Path(out_path, directory)
-        path.mkdir(parents=True, exist_ok=True)
-
-
-def link_empty_file(path: Path, out_path: Path, location: str, year: str, month: str, day: str, symlink: bool) -> None:
-    filename = path.name
-    filename = filename.replace('location', location)
-    filename = filename.replace('year', year)
-    filename = filename.replace('month', month)
-    filename = filename.replace('day', day)
-    link_path = Path(out_path, filename)
-    log.debug(f'source: {path}, link: {link_path}')
-    link_path.parent.mkdir(parents=True, exist_ok=True)
-    if not link_path.exists():
-        if symlink:
-            log.debug(f'Linking path {link_path} to {path}.')
-            link_path.symlink_to(path)
-        else:
-            log.debug(f'Copying {path} to {link_path}.')
-            shutil.copy2(path,link_path)
+        linker.make_dirs(Path(out_path, directory))
+
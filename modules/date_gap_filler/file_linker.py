@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 from pathlib import Path
 from calendar import monthrange
+from typing import Dict, List, Optional
 import structlog
-import shutil
 
+from common.path_linker import PathLinker, walk_files
 from date_gap_filler.dates_between import date_is_between
 from date_gap_filler.date_gap_filler_config import DateGapFillerConfig
 from date_gap_filler.location_path_parser import LocationPathParser
@@ -30,60 +31,68 @@ class FileLinker:
         self.end_date = config.end_date
         self.location_dir = config.location_dir
         self.symlink = config.symlink
+        self.linker = PathLinker(symlink=config.symlink)
+        # the empty file templates and the data files by root data path, each read on first use
+        self.empty_file_templates: Optional[List[empty_files.EmptyFileTemplate]] = None
+        self.data_files: Optional[Dict[Path, List[Path]]] = None
 
     def link_files(self) -> None:
         """Process and link the location files, link available data files, and fill date gaps with empty files."""
-        for path in self.location_path.rglob('*'):
-            if path.is_file():
-                log.debug(f'processing location file: {path}')
-                source_type, year, month, day, location = self.location_path_parser.parse(path)
-                if not date_is_between(year=int(year), month=int(month), day=int(day),
-                                       start_date=self.start_date, end_date=self.end_date):
-                    continue
-                root_link_path = Path(self.out_path, source_type, year, month, day, location)
-                
-                # Link location file
-                self.link_location(root_link_path, path)
-
-                # Link any data files available for this location
-                sub_data_path_count = 0
-                log.debug(f'Data path: {self.data_path}')
-                if self.data_path is not None:
-                    repo = Path(*self.data_path.parts[0:3])
-                    root_data_path = self.get_data_path(repo, source_type, year, month, day, location)
-                    for sub_data_path in root_data_path.rglob('*'):
-                        if sub_data_path.is_file():
-                            self.link_data(root_link_path, sub_data_path)
-                            sub_data_path_count += 1
-
-                
-                # If no data has been linked from the data_path input, link the empty files
-                if sub_data_path_count == 0:
-                    empty_files.link_files(self.config, root_link_path, location, year, month, day)
+        for path in walk_files(self.location_path):
+            log.debug(f'processing location file: {path}')
+            source_type, year, month, day, location = self.location_path_parser.parse(path)
+            if not date_is_between(year=int(year), month=int(month), day=int(day),
+                                   start_date=self.start_date, end_date=self.end_date):
+                continue
+            root_link_path = Path(self.out_path, source_type, year, month, day, location)
+            
+            # Link location file
+            self.link_location(root_link_path, path)
+
+            # Link any data files available for this location
+            sub_data_path_count = 0
+            log.debug(f'Data path: {self.data_path}')
+            if self.data_path is not None:
+                repo = Path(*self.data_path.parts[0:3])
+                root_data_path = self.get_data_path(repo, source_type, year, month, day, location)
+                for sub_data_path in self.get_data_files(repo).get(root_data_path, []):
+                    self.link_data(root_link_path, sub_data_path)
+                    sub_data_path_count += 1
+
+            
+            # If no data has been linked from the data_path input, link the empty files
+            if sub_data_path_count == 0:
+                if self.empty_file_templates is None:
+                    self.empty_file_templates = empty_files.read_templates(self.config)
+                empty_files.link_files(self.config, root_link_path, location, year, month, day, self.linker,
+                                       self.empty_file_templates)
+
+    def get_data_files(self, repo: Path) -> Dict[Path, List[Path]]:
+        """
+        Index the data files by the root data path holding them, walking the data repo once. A
+        location-day without an entry has no data.
+
+        :param repo: The data repo.
+        :return: The data files by root data path.
+        """
+        if self.data_files is None:
+            self.data_files = {}
+            # the root data path is the repo followed by the five indexed path parts
+            root_length = len(repo.parts) + 5
+            for path in walk_files(repo):
+                if len(path.parts) > root_length:
+                    self.data_files.setdefault(Path(*path.parts[:root_length]), []).append(path)
+        return self.data_files
 
     def link_location(self, root_link_path: Path, path: Path) -> None:
         location_link = Path(root_link_path, self.location_dir, path.name)
-        location_link.parent.mkdir(parents=True, exist_ok=True)
-        if not location_link.exists():
-            if self.symlink:
-                log.debug(f'Linking path {location_link} to {path}.')
-                location_link.symlink_to(path)
-            else:
-                log.debug(f'Copying {path} to {location_link}.')
-                shutil.copy2(path,location_link)
+        self.linker.link(path, location_link)
 
 
     def link_data(self, root_link_path: Path, sub_data_path: Path) -> None:
         source_type, year, month, day, location, data_type = self.data_path_parser.parse(sub_data_path)
         data_link = Path(root_link_path, data_type, sub_data_path.name)
-        data_link.parent.mkdir(parents=True, exist_ok=True)
-        if not data_link.exists():
-            if self.symlink:
-                log.debug(f'Linking path {data_link} to {sub_data_path}.')
-                data_link.symlink_to(sub_data_path)
-            else:
-                log.debug(f'Copying {sub_data_path} to {data_link}.')
-                shutil.copy2(sub_data_path,data_link)
+        self.linker.link(sub_data_path, data_link)
 
 
     def get_data_path(self,repo:Path,source_type:str,year:str,month:str,day:str,location:str) -> Path:
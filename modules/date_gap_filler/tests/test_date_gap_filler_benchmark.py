@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import time
+import unittest
+from datetime import date
+from pathlib import Path
+
+import common.log_config as log_config
+from date_gap_filler.date_gap_filler import DateGapFiller
+from date_gap_filler.date_gap_filler_config import DateGapFillerConfig
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Benchmark skipped due to long process time.')
+class DateGapFillerBenchmarkTest(unittest.TestCase):
+    """Time filling a year of daily gaps for 50 locations, with data on every fourth day."""
+
+    def setUp(self):
+        log_config.configure('INFO')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        # the data repo is the first three path parts
+        self.data_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.data_path = Path(self.data_dir.name, 'prt/2020')
+        self.location_path = Path(root, 'location/repo/prt/2020')
+        self.empty_path = Path(root, 'empty/repo/prt')
+        self.out_path = Path(root, 'out')
+        self.output_directories = ['data', 'flags', 'location', 'uncertainty_coef', 'uncertainty_data']
+        for directory in self.output_directories:
+            if directory != 'location':
+                Path(self.empty_path, directory).mkdir(parents=True)
+                Path(self.empty_path, directory, f'prt_location_year-month-day_{directory}.ext').touch()
+        for day_of_year in range(1, 366):
+            day = date.fromordinal(date(2020, 1, 1).toordinal() + day_of_year - 1)
+            for n in range(50):
+                location = f'CFGLOC{n}'
+                day_path = f'{day.month:02d}/{day.day:02d}/{location}'
+                Path(self.location_path, day_path).mkdir(parents=True)
+                Path(self.location_path, day_path, f'{location}.json').touch()
+                if day_of_year % 4 == 0:
+                    Path(self.data_path, day_path, 'data').mkdir(parents=True)
+                    Path(self.data_path, day_path, 'data', f'prt_{location}_{day}.ext').touch()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        self.data_dir.cleanup()
+
+    def test_fill_gaps(self):
+        base = len(Path(self.temp_dir.name).parts)
+        config = DateGapFillerConfig(data_path=self.data_path,
+                                     location_path=self.location_path,
+                                     empty_file_path=self.empty_path,
+                                     out_path=self.out_path,
+                                     start_date=None,
+                                     end_date=None,
+                                     output_directories=self.output_directories,
+                                     empty_file_type_index=base + 3,
+                                     data_source_type_index=3,
+                                     data_year_index=4,
+                                     data_month_index=5,
+                                     data_day_index=6,
+                                     data_location_index=7,
+                                     data_type_index=8,
+                                     location_source_type_index=base + 2,
+                                     location_year_index=base + 3,
+                                     location_month_index=base + 4,
+                                     location_day_index=base + 5,
+                                     location_index=base + 6,
+                                     symlink=True)
+        start = time.perf_counter()
+        DateGapFiller(config).fill_gaps()
+        elapsed = time.perf_counter() - start
+        self.assertTrue(Path(self.out_path, 'prt/2020/01/01/CFGLOC0/data/prt_CFGLOC0_2020-01-01_data.ext').exists())
+        self.assertTrue(Path(self.out_path, 'prt/2020/01/04/CFGLOC0/data/prt_CFGLOC0_2020-01-04.ext').exists())
+        print(f'Filled 365 days for 50 locations in {elapsed:.2f}s')
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+import unittest
+from pathlib import Path
+
+from date_gap_filler.empty_files import EmptyFileTemplate
+
+
+class EmptyFilesTest(unittest.TestCase):
+
+    @staticmethod
+    def replace(name: str, location: str, year: str, month: str, day: str) -> str:
+        return name.replace('location', location).replace('year', year).replace('month', month).replace('day', day)
+
+    def test_get_filename(self):
+        names = ['prt_location_year-month-day.ext',
+                 'prt_location_year-month-day_flagsCal.ext',
+                 'location.json',
+                 'NEON.DOM.SITE.DP1.00001.001.location.year-month.basic.csv',
+                 'no_placeholders.ext',
+                 # overlapping placeholders are replaced in order
+                 'dayear.csv',
+                 'monthyearday.csv']
+        for name in names:
+            template = EmptyFileTemplate(path=Path('/empty/prt/data', name), directory='data')
+            for location in ['CFGLOC123', 'holiday']:
+                self.assertEqual(self.replace(name, location, '2020', '01', '02'),
+                                 template.get_filename(location, '2020', '01', '02'))
+        self.assertEqual('da2020.csv', EmptyFileTemplate(Path('dayear.csv'), 'data').get_filename('L', '2020', '07', '02'))
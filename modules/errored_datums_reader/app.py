@@ -7,8 +7,8 @@ from errored_datums_reader.reader import read_error_files
 from errored_datums_reader.writer import write_to_db
 
 
-def run(client: Client, db: Db) -> None:
+def run(client: Client, db: Db, workers: int = 8) -> None:
     """Read the error files and write the metadata to the database."""
-    files_by_pipeline = read_error_files(client)
+    files_by_pipeline = read_error_files(client, workers)
     with closing(db.connection):
         write_to_db(db, files_by_pipeline)
@@ -1,18 +1,31 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from pachyderm_sdk import Client
 from pachyderm_sdk.api import pfs
 from pachyderm_sdk.api.pfs import FileType
 
 
-def read_error_files(client: Client) -> defaultdict[str, list]:
-    """Read the files in the error directories and save the paths by pipeline name."""
+def read_error_files(client: Client, workers: int = 8) -> defaultdict[str, list]:
+    """Read the files in the error directories and save the paths by pipeline name, globbing pipelines concurrently."""
     files_by_pipeline: defaultdict[str, list] = defaultdict(list)
+    pipeline_names = []
+    commit_names = []
     for pipeline in client.pps.list_pipeline():
-        pipeline_name = pipeline.pipeline.name
-        commit_name = f'{pipeline.pipeline.project.name}/{pipeline_name}@master'
-        for file in client.pfs.glob_file(commit=pfs.Commit.from_uri(commit_name), pattern='/errored_datums/**'):
-            if file.file_type == FileType.FILE:
-                file_path = file.file.path
-                files_by_pipeline[pipeline_name].append(file_path)
+        pipeline_names.append(pipeline.pipeline.name)
+        commit_names.append(f'{pipeline.pipeline.project.name}/{pipeline.pipeline.name}@master')
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        file_paths = executor.map(lambda commit_name: read_pipeline_error_files(client, commit_name), commit_names)
+        for pipeline_name, pipeline_file_paths in zip(pipeline_names, file_paths):
+            if pipeline_file_paths:
+                files_by_pipeline[pipeline_name].extend(pipeline_file_paths)
     return files_by_pipeline
+
+
+def read_pipeline_error_files(client: Client, commit_name: str) -> list[str]:
+    """Read the paths of the files in the error directory of a pipeline commit."""
+    file_paths = []
+    for file in client.pfs.glob_file(commit=pfs.Commit.from_uri(commit_name), pattern='/errored_datums/**'):
+        if file.file_type == FileType.FILE:
+            file_paths.append(file.file.path)
+    return file_paths
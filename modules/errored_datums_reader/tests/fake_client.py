@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+from types import SimpleNamespace
+from typing import Dict, List
+
+from pachyderm_sdk.api.pfs import FileType
+
+from common.tests.fake_service import FakeService
+
+
+class FakePfs:
+
+    def __init__(self, client: 'FakeClient') -> None:
+        self.client = client
+
+    def glob_file(self, commit, pattern: str):
+        with self.client.request():
+            project_name, pipeline_name = str(commit).split('@')[0].split('/')
+            self.client.patterns.append(pattern)
+            return [SimpleNamespace(file=SimpleNamespace(path=path), file_type=FileType.FILE)
+                    for path in self.client.files_by_pipeline.get(pipeline_name, [])]
+
+
+class FakePps:
+
+    def __init__(self, client: 'FakeClient') -> None:
+        self.client = client
+
+    def list_pipeline(self):
+        return [pipeline_info(name) for name in self.client.files_by_pipeline]
+
+    def inspect_pipeline(self, pipeline, details: bool = False):
+        return pipeline_info(pipeline.name)
+
+
+def pipeline_info(name: str) -> SimpleNamespace:
+    return SimpleNamespace(pipeline=SimpleNamespace(name=name, project=SimpleNamespace(name='default')))
+
+
+class FakeClient(FakeService):
+    """Stand-in for the Pachyderm client serving file paths by pipeline name, with an optional latency per glob."""
+
+    def __init__(self, files_by_pipeline: Dict[str, List[str]], latency: float = 0) -> None:
+        super().__init__(latency)
+        self.files_by_pipeline = files_by_pipeline
+        self.patterns = []
+        self.pfs = FakePfs(self)
+        self.pps = FakePps(self)
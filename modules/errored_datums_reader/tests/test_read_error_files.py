@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+import unittest
+
+from errored_datums_reader.reader import read_error_files
+from errored_datums_reader.tests.fake_client import FakeClient
+
+
+class ReadErrorFilesTest(unittest.TestCase):
+
+    def test_read_error_files(self) -> None:
+        files_by_pipeline = {f'dag{n}_pipeline': [f'/errored_datums/2024/01/{day:02d}/CFGLOC{n}' for day in range(n)]
+                             for n in range(10)}
+        client = FakeClient(files_by_pipeline, latency=0.01)
+        result = read_error_files(client, workers=4)
+        self.assertEqual({name: paths for name, paths in files_by_pipeline.items() if paths}, dict(result))
+        self.assertEqual(10, len(client.patterns))
+        self.assertGreater(client.max_active, 1)
+        self.assertLessEqual(client.max_active, 4)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+import unittest
+from collections import defaultdict
+
+from data_access.tests.fake_connector import FakeConnector
+from errored_datums_reader.db_connector import Db
+from errored_datums_reader.writer import write_to_db
+
+
+class WriteErroredDatumsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.existing = [('dag1_pipeline', '/errored_datums/a'), ('dag1_pipeline', '/errored_datums/b'),
+                         ('dag2_pipeline', '/errored_datums/c')]
+        self.connector = FakeConnector(lambda sql, parameters: self.existing if 'select' in sql else [])
+        self.db = Db(self.connector.get_connection(), 'pdr')
+
+    def test_write_changes(self) -> None:
+        files_by_pipeline = defaultdict(list)
+        files_by_pipeline['dag1_pipeline'].extend(['/errored_datums/a', '/errored_datums/d'])
+        files_by_pipeline['dag3_pipeline'].append('/errored_datums/e')
+        changes = write_to_db(self.db, files_by_pipeline)
+        self.assertEqual({('dag1_pipeline', '/errored_datums/d'), ('dag3_pipeline', '/errored_datums/e')},
+                         changes.inserted)
+        self.assertEqual({('dag1_pipeline', '/errored_datums/b'), ('dag2_pipeline', '/errored_datums/c')},
+                         changes.deleted)
+        # one select, one delete and one insert in a single transaction
+        queries = [sql for sql, parameters in self.connector.connection.queries]
+        self.assertEqual(3, len(queries))
+        self.assertIn('delete from pdr.errored_datums', queries[1])
+        self.assertIn("('dag1_pipeline','/errored_datums/b')", queries[1])
+        self.assertIn("('dag3','dag3_pipeline','/errored_datums/e')", queries[2])
+        self.assertNotIn('/errored_datums/a', queries[2])
+        self.assertEqual(1, self.connector.connection.commits)
+
+    def test_no_changes(self) -> None:
+        files_by_pipeline = defaultdict(list)
+        for pipeline_name, file_path in self.existing:
+            files_by_pipeline[pipeline_name].append(file_path)
+        changes = write_to_db(self.db, files_by_pipeline)
+        self.assertEqual(set(), changes.inserted | changes.deleted)
+        self.assertEqual(1, self.connector.query_count)
+
+    def test_rollback(self) -> None:
+        def handler(sql, parameters):
+            if 'insert' in sql:
+                raise ValueError('insert failed')
+            return self.existing if 'select' in sql else []
+        self.connector.connection.handler = handler
+        with self.assertRaises(ValueError):
+            write_to_db(self.db, defaultdict(list, {'dag4_pipeline': ['/errored_datums/f']}))
+        self.assertEqual(0, self.connector.connection.commits)
+        self.assertEqual(1, self.connector.connection.rollbacks)
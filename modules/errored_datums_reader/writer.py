@@ -1,30 +1,69 @@
 from collections import defaultdict
 from contextlib import closing
+from typing import NamedTuple, Set, Tuple
+
+import structlog
+from psycopg2.extras import execute_values
 
 from errored_datums_reader.db_connector import Db
 
+log = structlog.get_logger()
 
-def write_to_db(db: Db, files_by_pipeline: defaultdict[str, list[str]]) -> None:
-    sql = f'''
-        insert into {db.schema}.errored_datums 
-            (dag_name, pipeline_name, file_path) 
-        values 
-            (%(dag_name)s, %(pipeline_name)s, %(file_path)s) 
+
+class Changes(NamedTuple):
+    """The rows to insert and delete to bring the table up to date."""
+    inserted: Set[Tuple[str, str]]
+    deleted: Set[Tuple[str, str]]
+
+
+def write_to_db(db: Db, files_by_pipeline: defaultdict[str, list[str]], page_size: int = 1000) -> Changes:
+    """
+    Update the errored datums table to the current error files in one transaction, inserting
+    new files and deleting resolved ones. Unchanged rows are left in place.
+
+    :param db: The database.
+    :param files_by_pipeline: The error file paths by pipeline name.
+    :param page_size: The number of rows per statement.
+    :return: The inserted and deleted (pipeline name, file path) rows.
+    """
+    insert_sql = f'''
+        insert into {db.schema}.errored_datums
+            (dag_name, pipeline_name, file_path)
+        values
+            %s
     '''
-    clear_existing_records(db=db)
+    delete_sql = f'''
+        delete from {db.schema}.errored_datums
+        using (values %s) as resolved (pipeline_name, file_path)
+        where
+            errored_datums.pipeline_name = resolved.pipeline_name
+        and
+            errored_datums.file_path = resolved.file_path
+    '''
+    current = {(pipeline_name, file_path) for pipeline_name, file_paths in files_by_pipeline.items()
+               for file_path in file_paths}
     with closing(db.connection.cursor()) as cursor:
-        for pipeline_name in files_by_pipeline.keys():
-            dag_name = pipeline_name.split('_')[0]
-            for file_path in files_by_pipeline[pipeline_name]:
-                params = dict(dag_name=dag_name, pipeline_name=pipeline_name, file_path=file_path)
-                cursor.execute(sql, params)
-        db.connection.commit()
+        try:
+            existing = read_existing_records(db, cursor)
+            changes = Changes(inserted=current - existing, deleted=existing - current)
+            if changes.deleted:
+                execute_values(cursor, delete_sql, sorted(changes.deleted), page_size=page_size)
+            if changes.inserted:
+                rows = [(pipeline_name.split('_')[0], pipeline_name, file_path)
+                        for pipeline_name, file_path in sorted(changes.inserted)]
+                execute_values(cursor, insert_sql, rows, page_size=page_size)
+            db.connection.commit()
+        except Exception:
+            db.connection.rollback()
+            raise
+    log.info('Updated errored datums', inserted=len(changes.inserted), deleted=len(changes.deleted),
+             unchanged=len(current & existing))
+    return changes
 
 
-def clear_existing_records(db: Db) -> None:
+def read_existing_records(db: Db, cursor) -> Set[Tuple[str, str]]:
     sql = f'''
-        delete from {db.schema}.errored_datums 
+        select pipeline_name, file_path from {db.schema}.errored_datums
     '''
-    with closing(db.connection.cursor()) as cursor:
-        cursor.execute(sql)
-        db.connection.commit()
+    cursor.execute(sql)
+    return {(pipeline_name, file_path) for pipeline_name, file_path in cursor.fetchall()}
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 from pathlib import Path
+from typing import List, Optional, Set
+
 import structlog
 
+from common.path_linker import PathLinker, walk_files
 from event_location_group.event_location_group_config import Config
 from event_location_group.data_path_parser import DataPathParser
 
@@ -15,31 +18,34 @@ class EventLocationGrouper:
         self.location_path = config.location_path
         self.out_path = config.out_path
         self.data_path_parser = DataPathParser(config)
+        self.linker = PathLinker()
+        # the location files, indexed on first use
+        self.location_files: Optional[List[Path]] = None
+        # the output directories already holding the location links
+        self.linked_roots: Set[Path] = set()
 
     def group_files(self) -> None:
         """Link event data and location files into output path."""
-        for path in self.data_path.rglob('*'):
-            if path.is_file():
-                source_type, year, month, day, source_id = self.data_path_parser.parse(path)
-                log.debug(f'file: {path.name} source_type: {source_type} source_id: {source_id}')
-                link_root_path = Path(self.out_path, source_type, year, month, day, source_id)
+        for path in walk_files(self.data_path):
+            source_type, year, month, day, source_id = self.data_path_parser.parse(path)
+            log.debug(f'file: {path.name} source_type: {source_type} source_id: {source_id}')
+            link_root_path = Path(self.out_path, source_type, year, month, day, source_id)
+            if link_root_path not in self.linked_roots:
                 self.link_location(link_root_path)
-                link_path = Path(link_root_path, 'data', path.name)
-                log.debug(f'data link: {link_path}')
-                link_path.parent.mkdir(parents=True, exist_ok=True)
-                if not link_path.exists():
-                    link_path.symlink_to(path)
+                self.linked_roots.add(link_root_path)
+            link_path = Path(link_root_path, 'data', path.name)
+            log.debug(f'data link: {link_path}')
+            self.linker.link(path, link_path)
 
     def link_location(self, link_root_path: Path) -> None:
         """
-        Link the location file into the target directory.
+        Link the location files into the target directory. The location directory is walked once.
 
         :param link_root_path: The target directory path.
         """
-        for path in self.location_path.rglob('*'):
-            if path.is_file():
-                link_path = Path(link_root_path, 'location', path.name)
-                log.debug(f'location link: {link_path}')
-                link_path.parent.mkdir(parents=True, exist_ok=True)
-                if not link_path.exists():
-                    link_path.symlink_to(path)
+        if self.location_files is None:
+            self.location_files = list(walk_files(self.location_path))
+        for path in self.location_files:
+            link_path = Path(link_root_path, 'location', path.name)
+            log.debug(f'location link: {link_path}')
+            self.linker.link(path, link_path)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import common.log_config as log_config
+from event_location_group.event_location_group_config import Config
+from event_location_group.event_location_grouper import EventLocationGrouper
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Benchmark skipped due to long process time.')
+class EventLocationGroupBenchmarkTest(unittest.TestCase):
+    """Time grouping increasing numbers of event files for two sources with 20 location files."""
+
+    def setUp(self):
+        log_config.configure('INFO')
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_scaling(self):
+        for event_count in [1000, 2000, 4000]:
+            root = Path(self.temp_dir.name, str(event_count))
+            data_path = Path(root, 'data/events/heater/2019/01/01')
+            location_path = Path(root, 'location')
+            for source_id in ['00001', '00002']:
+                Path(data_path, source_id).mkdir(parents=True)
+                for n in range(event_count):
+                    Path(data_path, source_id, f'heater_{source_id}_events_{n}.json').touch()
+            for n in range(20):
+                Path(location_path, 'heater', str(n)).mkdir(parents=True)
+                Path(location_path, 'heater', str(n), f'heater_{n}_locations.json').touch()
+            out_path = Path(root, 'out')
+            config = Config(data_path=data_path, location_path=location_path, out_path=out_path,
+                            source_type_index=len(root.parts) + 2, year_index=len(root.parts) + 3,
+                            month_index=len(root.parts) + 4, day_index=len(root.parts) + 5,
+                            source_id_index=len(root.parts) + 6)
+            start = time.perf_counter()
+            EventLocationGrouper(config).group_files()
+            elapsed = time.perf_counter() - start
+            for source_id in ['00001', '00002']:
+                source_path = Path(out_path, 'heater/2019/01/01', source_id)
+                self.assertEqual(event_count, len(os.listdir(Path(source_path, 'data'))))
+                self.assertEqual(20, len(os.listdir(Path(source_path, 'location'))))
+            print(f'{2 * event_count} event files: {elapsed:.2f}s, '
+                  f'{elapsed / (2 * event_count) * 1e6:.0f}us per file')
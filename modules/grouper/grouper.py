@@ -3,22 +3,20 @@ from pathlib import Path
 
 from structlog import get_logger
 
+from common.path_linker import PathLinker, walk_files
+
 log = get_logger()
 
 
-def group_files(*, path: Path, out_path: Path, relative_path_index: int) -> None:
+def group_files(*, path: Path, out_path: Path, relative_path_index: int, link_workers: int = 1) -> None:
     """
     Link files into the output directory.
 
     :param path: File or directory paths.
     :param out_path: The output path for writing results.
     :param relative_path_index: Trim path components before this index.
+    :param link_workers: The number of threads creating links.
     """
-    for path in path.rglob('*'):
-        if path.is_file():
-            parts = path.parts
-            link_path = Path(out_path, *parts[relative_path_index:])
-            log.debug(f'link: {link_path}')
-            link_path.parent.mkdir(parents=True, exist_ok=True)
-            if not link_path.exists():
-                link_path.symlink_to(path)
+    linker = PathLinker(workers=link_workers)
+    linker.link_all((file_path, Path(out_path, *file_path.parts[relative_path_index:]))
+                    for file_path in walk_files(path))
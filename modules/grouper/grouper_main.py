@@ -19,9 +19,11 @@ def main() -> None:
     out_path: Path = env.path('OUT_PATH')
     log_level: str = env.log_level('LOG_LEVEL', 'INFO')
     relative_path_index: int = env.int('RELATIVE_PATH_INDEX')
+    link_workers: int = env.int('LINK_WORKERS', 1)
     log_config.configure(log_level)
     log.debug(f'data_path: {data_path} out_path: {out_path}')
-    group_files(path=data_path, out_path=out_path, relative_path_index=relative_path_index)
+    group_files(path=data_path, out_path=out_path, relative_path_index=relative_path_index,
+                link_workers=link_workers)
 
 
 if __name__ == '__main__':
@@ -18,13 +18,15 @@ def main() -> None:
     out_path: Path = env.path('OUT_PATH')
     log_level: str = env.log_level('LOG_LEVEL', 'INFO')
     relative_path_index: int = env.int('RELATIVE_PATH_INDEX')
+    link_workers: int = env.int('LINK_WORKERS', 1)
     log_config.configure(log_level)
     log.debug(f'related_paths: {related_paths} out_path: {out_path}')
     paths = []
     for p in related_paths:
         path = os.environ[p]
         paths.append(Path(path))
-    join_files(related_paths=paths, out_path=out_path, relative_path_index=relative_path_index)
+    join_files(related_paths=paths, out_path=out_path, relative_path_index=relative_path_index,
+               link_workers=link_workers)
 
 
 if __name__ == '__main__':
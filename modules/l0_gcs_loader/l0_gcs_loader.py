@@ -1,12 +1,17 @@
-
 from google.cloud import storage
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 import environs
+import json
 import os
 import sys
 import re
+import time
 from datetime import datetime
 
+FILE_DATE = re.compile('[0-9]{4}-[0-1]{1}[0-9]{1}-[0-3]{1}[0-9]{1}')
+
 
 def l0_gcs_loader() -> None:
 
@@ -20,47 +25,125 @@ def l0_gcs_loader() -> None:
     month_index = env.int('MONTH_INDEX')
     day_index = env.int('DAY_INDEX')
     output_directory: Path = env.path('OUT_PATH')
+    download_workers = env.int('DOWNLOAD_WORKERS', 8) # Number of concurrent downloads
+    download_retries = env.int('DOWNLOAD_RETRIES', 3) # Attempts per file before failing
+    listing_path: Optional[Path] = env.path('LISTING_PATH', None) # Optional directory to share month listings between day triggers
+    listing_max_age = env.int('LISTING_MAX_AGE', 3600) # Seconds a shared month listing is reused
     storage_client = storage.Client()
     #print(f"L0 Bucket name : {ingest_bucket_name}")
     ingest_bucket = storage_client.bucket(ingest_bucket_name)
-    
+
     import_trigger: Path = env.path('import_trigger')
     pathname, extension = os.path.splitext(import_trigger)
     import_path = pathname.split('/')
     #print(f"impport_path is {import_path}")
-    
+
     if (source_type_index is None) & (source_type is None):
         sys.exit("One of SOURCE_TYPE_INDEX or SOURCE_TYPE environment variables is required.")
     elif source_type_index is not None:
         source_type = import_path[source_type_index]
-        
+
     if (source_type_out is None):
         source_type_out=source_type
-    
+
     download_year = import_path[year_index]
     download_month = import_path[month_index]
     download_day = import_path[day_index]
     gen_date = download_year+"-"+download_month+"-"+download_day
     #print(f"gen_date is {gen_date}")
-    
-    blobs = list(ingest_bucket.list_blobs(prefix=f"{bucket_version_path}/{source_type}/ms={download_year}-{download_month}"))
-    for blob in blobs:
-       # print("blob name is:  ", blob.name)
-        file_path_bucket = os.path.splitext(blob.name)[0]
+
+    prefix = f"{bucket_version_path}/{source_type}/ms={download_year}-{download_month}"
+    trigger_date = datetime(int(download_year), int(download_month), int(download_day))
+    blob_names = list_month(ingest_bucket, prefix, listing_path, listing_max_age, import_trigger)
+    downloads = []
+    for blob_name in blob_names:
+       # print("blob name is:  ", blob_name)
+        file_path_bucket = os.path.splitext(blob_name)[0]
         file_name_bucket = re.split('/', file_path_bucket)[-1]
         source_id = re.split('/', file_path_bucket)[-2]
         source_id = source_id.replace("source_id=","")
-        file_date = re.search('[0-9]{4}-[0-1]{1}[0-9]{1}-[0-3]{1}[0-9]{1}',file_name_bucket).group(0)
-        trigger_date = datetime(int(download_year), int(download_month), int(download_day))
-        bucket_file_date = datetime(int(re.split('-', file_date)[0]), int(re.split('-', file_date)[1]), int(re.split('-', file_date)[2]))
+        bucket_file_date = get_blob_date(blob_name)
         if(trigger_date == bucket_file_date):
             file_name = file_name_bucket + ".parquet"
-            file_path = Path(output_directory, source_type_out,download_year, download_month, download_day,source_id, "data",file_name )         
-            print("File path is:  ", file_path)
-            with blob.open("r") as f:
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-                l0_data_file= open(file_path, "wb")
-                l0_data_file.write(blob.download_as_string())
-                l0_data_file.close()
+            file_path = Path(output_directory, source_type_out,download_year, download_month, download_day,source_id, "data",file_name )
+            downloads.append((blob_name, file_path))
+    download_files(ingest_bucket, downloads, download_workers, download_retries)
+
+
+def get_blob_date(blob_name: str) -> datetime:
+    """Parse the date from a blob name, i.e., v2/prt/ms=2023-06/source_id=3119/prt_3119_2023-06-02.parquet."""
+    file_name_bucket = re.split('/', os.path.splitext(blob_name)[0])[-1]
+    file_date = FILE_DATE.search(file_name_bucket).group(0)
+    return datetime(int(re.split('-', file_date)[0]), int(re.split('-', file_date)[1]), int(re.split('-', file_date)[2]))
+
+
+def list_month(bucket, prefix: str, listing_path: Optional[Path], listing_max_age: int,
+               import_trigger: Path) -> List[str]:
+    """
+    List the blob names under a month prefix. If a listing directory is given, a listing saved there
+    by another day trigger within listing_max_age seconds is reused when it was saved after the import
+    trigger, otherwise the bucket is listed and the listing is saved.
+
+    :param bucket: The bucket.
+    :param prefix: The month prefix.
+    :param listing_path: The directory holding shared month listings.
+    :param listing_max_age: The number of seconds a saved listing is reused.
+    :param import_trigger: The import trigger file, written once the day's blobs have landed.
+    :return: The blob names.
+    """
+    listing_file = None
+    if listing_path is not None:
+        listing_file = Path(listing_path, prefix.replace('/', '_') + '.json')
+        try:
+            listing_time = listing_file.stat().st_mtime
+            # a listing saved before the trigger may miss blobs of the day that landed since
+            if time.time() - listing_time < listing_max_age and listing_time > import_trigger.stat().st_mtime:
+                with open(listing_file) as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+    blob_names = [blob.name for blob in bucket.list_blobs(prefix=prefix)]
+    if listing_file is not None:
+        # write then rename so concurrent triggers never read a partial listing
+        listing_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = listing_file.with_name(f'{listing_file.name}.{os.getpid()}')
+        with open(temp_file, 'w') as f:
+            json.dump(blob_names, f)
+        os.replace(temp_file, listing_file)
+    return blob_names
+
+
+def download_files(bucket, downloads: List[tuple], workers: int, retries: int) -> None:
+    """
+    Stream blobs to files in a bounded thread pool.
+
+    :param bucket: The bucket.
+    :param downloads: The blob names and file paths.
+    :param workers: The number of concurrent downloads.
+    :param retries: The number of attempts per file.
+    """
+    for blob_name, file_path in downloads:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        futures = [executor.submit(download_file, bucket, blob_name, file_path, retries)
+                   for blob_name, file_path in downloads]
+        for future in futures:
+            future.result()
+
+
+def download_file(bucket, blob_name: str, file_path: Path, retries: int) -> None:
+    """Download a blob to a file, retrying with exponential backoff."""
+    print("File path is:  ", file_path)
+    for attempt in range(1, retries + 1):
+        try:
+            bucket.blob(blob_name).download_to_filename(str(file_path))
+            return
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            print(f"Retrying download of {blob_name} after error: {e}")
+            time.sleep(2 ** (attempt - 1))
+
+
 if __name__ == '__main__':
     l0_gcs_loader()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+import os
+import time
+from pathlib import Path
+from unittest import TestCase, mock
+
+from testfixtures import TempDirectory
+
+from common.tests.fake_bucket import FakeBucket
+import l0_gcs_loader.l0_gcs_loader as l0_gcs_loader
+
+
+class L0GcsLoaderTest(TestCase):
+
+    def setUp(self):
+        self.temp_dir = TempDirectory()
+        self.out_path = Path(self.temp_dir.path, 'out')
+        self.listing_path = Path(self.temp_dir.path, 'listings')
+        prefix = 'v2/prt/ms=2023-06'
+        self.contents = {
+            f'{prefix}/source_id=14491/prt_14491_2023-06-02.parquet': os.urandom(1024),
+            f'{prefix}/source_id=14491/prt_14491_2023-06-03.parquet': os.urandom(1024),
+            f'{prefix}/source_id=3119/prt_3119_2023-06-02.parquet': os.urandom(4096),
+            'v2/prt/ms=2023-07/source_id=3119/prt_3119_2023-07-02.parquet': os.urandom(1024)}
+        self.bucket = FakeBucket(self.contents)
+        self.client = mock.Mock()
+        self.client.bucket.return_value = self.bucket
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def load(self, day: str, trigger_age: float = 60) -> None:
+        """Run the loader for a day trigger written trigger_age seconds ago."""
+        trigger_root = Path(self.temp_dir.path, 'import_trigger')
+        import_trigger = Path(trigger_root, 'prt/2023/06', day)
+        import_trigger.parent.mkdir(parents=True, exist_ok=True)
+        import_trigger.touch()
+        trigger_time = time.time() - trigger_age
+        os.utime(import_trigger, (trigger_time, trigger_time))
+        index = len(str(trigger_root).split('/'))
+        environment = {'BUCKET_NAME': 'bucket',
+                       'BUCKET_VERSION_PATH': 'v2',
+                       'SOURCE_TYPE_INDEX': str(index),
+                       'YEAR_INDEX': str(index + 1),
+                       'MONTH_INDEX': str(index + 2),
+                       'DAY_INDEX': str(index + 3),
+                       'OUT_PATH': str(self.out_path),
+                       'DOWNLOAD_WORKERS': '4',
+                       'LISTING_PATH': str(self.listing_path),
+                       'import_trigger': str(import_trigger)}
+        with mock.patch.dict(os.environ, environment), \
+                mock.patch.object(l0_gcs_loader.storage, 'Client', return_value=self.client), \
+                mock.patch.object(l0_gcs_loader.time, 'sleep'):
+            l0_gcs_loader.l0_gcs_loader()
+
+    def test_load(self):
+        self.bucket.failures['v2/prt/ms=2023-06/source_id=3119/prt_3119_2023-06-02.parquet'] = 2
+        self.load('02')
+        files = sorted(path.relative_to(self.out_path) for path in self.out_path.rglob('*') if path.is_file())
+        self.assertEqual([Path('prt/2023/06/02/14491/data/prt_14491_2023-06-02.parquet'),
+                          Path('prt/2023/06/02/3119/data/prt_3119_2023-06-02.parquet')], files)
+        self.assertEqual(self.contents['v2/prt/ms=2023-06/source_id=14491/prt_14491_2023-06-02.parquet'],
+                         Path(self.out_path, files[0]).read_bytes())
+        self.assertEqual(self.contents['v2/prt/ms=2023-06/source_id=3119/prt_3119_2023-06-02.parquet'],
+                         Path(self.out_path, files[1]).read_bytes())
+        # the failing download was retried
+        self.assertEqual(4, len(self.bucket.downloads))
+        # a sibling day trigger reuses the saved month listing
+        self.load('03')
+        self.assertEqual(1, self.bucket.listings)
+        self.assertEqual(self.contents['v2/prt/ms=2023-06/source_id=14491/prt_14491_2023-06-03.parquet'],
+                         Path(self.out_path, 'prt/2023/06/03/14491/data/prt_14491_2023-06-03.parquet').read_bytes())
+
+    def test_stale_listing(self):
+        # the 2023-06-02 trigger saves the month listing while the 2023-06-03 blobs are still landing
+        late_blob = 'v2/prt/ms=2023-06/source_id=3119/prt_3119_2023-06-03.parquet'
+        self.load('02')
+        self.contents[late_blob] = os.urandom(1024)
+        # the 2023-06-03 trigger is written once all of the day's blobs have landed
+        self.load('03', trigger_age=-1)
+        self.assertEqual(2, self.bucket.listings)
+        self.assertEqual(self.contents['v2/prt/ms=2023-06/source_id=14491/prt_14491_2023-06-03.parquet'],
+                         Path(self.out_path, 'prt/2023/06/03/14491/data/prt_14491_2023-06-03.parquet').read_bytes())
+        self.assertEqual(self.contents[late_blob],
+                         Path(self.out_path, 'prt/2023/06/03/3119/data/prt_3119_2023-06-03.parquet').read_bytes())
+        # the fresh listing was saved for later triggers
+        self.load('02')
+        self.assertEqual(2, self.bucket.listings)
+
+    def test_retries_exhausted(self):
+        self.bucket.failures['v2/prt/ms=2023-06/source_id=3119/prt_3119_2023-06-02.parquet'] = 3
+        with self.assertRaises(ConnectionError):
+            self.load('02')
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 from pathlib import Path
+from common.path_linker import PathLinker, walk_files
 from level1_consolidate.level1_consolidate_config import Config
 
 import structlog
@@ -26,13 +27,11 @@ class Level1Consolidate:
         Consolidate paths to the output structure for level 1 data. 
 
         """
-        for path in self.in_path.rglob('*'):
-            if path.is_file():
-                link_path = self.consolidate_path(path)
-                if link_path is not None and not link_path.exists():
-                    link_path.parent.mkdir(parents=True, exist_ok=True)
-                    log.debug(f'path: {path} link_path: {link_path}')
-                    link_path.symlink_to(path)
+        linker = PathLinker()
+        for path in walk_files(self.in_path):
+            link_path = self.consolidate_path(path)
+            if link_path is not None:
+                linker.link(path, link_path)
     def consolidate_path(self, path: Path) -> Path:
         """
         Place an file in the output according to the desired path structure.
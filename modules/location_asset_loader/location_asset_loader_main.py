@@ -9,7 +9,7 @@ import common.log_config as log_config
 from data_access.db_config_reader import read_from_mount
 from data_access.db_connector import DbConnector
 from data_access.get_assets import get_assets
-from data_access.get_asset_locations import get_asset_locations
+from data_access.get_asset_locations import AssetLocationCache, get_asset_locations
 
 import location_asset_loader.location_asset_loader as location_asset_loader
 
@@ -22,12 +22,16 @@ def main() -> None:
     out_path: Path = env.path('OUT_PATH')
     err_path: Path = env.path('ERR_PATH')
     log_level: str = env.log_level('LOG_LEVEL', 'INFO')
+    prepare_statements: bool = env.bool('DB_PREPARE_STATEMENTS', False)
+    itersize: int = env.int('DB_ITERSIZE', 0)
     log_config.configure(log_level)
     log.debug(f'out_path: {out_path}')
     db_config = read_from_mount(Path('/var/db_secret'))
-    with closing(DbConnector(db_config)) as connector:
+    with closing(DbConnector(db_config, prepare_statements=prepare_statements, itersize=itersize)) as connector:
         get_assets_partial = partial(get_assets, connector)
-        get_asset_locations_partial = partial(get_asset_locations, connector)
+        # metadata shared by the assets of the source type is read once per run
+        cache = AssetLocationCache(connector, source_type)
+        get_asset_locations_partial = partial(get_asset_locations, connector, cache=cache)
         location_asset_loader.write_files(get_assets=get_assets_partial,
                                           get_asset_locations=get_asset_locations_partial,
                                           out_path=out_path,
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Callable, Iterator, Set
+from typing import Callable, Iterator, List, NamedTuple
 
 import geojson
 import structlog
@@ -12,32 +14,88 @@ from common.err_datum import err_datum_path
 
 log = structlog.get_logger()
 
+WRITTEN = 'written'
+ERRORED = 'errored'
 
-def load_locations(out_path: Path, err_path: Path, get_locations: Callable[[str], Iterator[NamedLocation]], source_type: str) -> None:
+
+class LoadCounts(NamedTuple):
+    """The number of location files written and errored."""
+    written: int
+    errored: int
+
+
+def load_locations(out_path: Path, err_path: Path, get_locations: Callable[[str], Iterator[NamedLocation]],
+                   source_type: str, workers: int = 1) -> LoadCounts:
     """
     Write location files into the output path.
     :param out_path: The path for writing files.
     :param err_path: The error directory, i.e., errored.
     :param get_locations: A function yielding named locations.
     :param source_type: sensor type.
+    :param workers: The number of threads serializing and writing locations while the next are read.
+    :return: The file counts.
     """
     # DirErrBase: the user specified error directory, i.e., /tmp/out/errored
     DirErrBase = Path(err_path)
-    dataDir_routed = Path("")
-    for named_location in get_locations(source_type=source_type):
-        schema_names: Set = named_location.schema_names
-        location_name: str = named_location.name
-        for schema_name in schema_names:
-            path = Path(out_path, schema_name, location_name, f'{location_name}.json')
+    counts = Counter()
+    named_locations = get_locations(source_type=source_type)
+    if workers > 1:
+        pending = set()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for named_location in named_locations:
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        counts.update(future.result())
+                pending.add(executor.submit(write_location, named_location, out_path, DirErrBase))
+            for future in wait(pending).done:
+                counts.update(future.result())
+    else:
+        for named_location in named_locations:
+            counts.update(write_location(named_location, out_path, DirErrBase))
+    load_counts = LoadCounts(written=counts[WRITTEN], errored=counts[ERRORED])
+    log.info('Loaded location files', **load_counts._asdict())
+    return load_counts
+
+
+def write_location(named_location: NamedLocation, out_path: Path, DirErrBase: Path) -> List[str]:
+    """
+    Serialize a named location once and write it under each of its schema names.
+
+    :param named_location: The named location.
+    :param out_path: The path for writing files.
+    :param DirErrBase: The error directory.
+    :return: The result for each file, written or errored.
+    """
+    location_name: str = named_location.name
+    paths = [Path(out_path, schema_name, location_name, f'{location_name}.json')
+             for schema_name in named_location.schema_names]
+    results = []
+    try:
+        geojson_data = geojson_converter.convert_named_location(named_location)
+        file_data = geojson.dumps(geojson_data, indent=4, sort_keys=True, default=str).encode()
+    except:
+        err_msg = sys.exc_info()
+        for path in paths:
             path.parent.mkdir(parents=True, exist_ok=True)
-            dataDir_routed = path.parent
-            try:
-                geojson_data = geojson_converter.convert_named_location(named_location)
-                file_data = geojson.dumps(geojson_data, indent=4, sort_keys=True, default=str)
-                with open(path, 'w') as file:
-                    log.debug(f'writing file: {path}')
-                    file.write(file_data)
-            except:
-                err_msg = sys.exc_info()
-                err_datum_path(err=err_msg,DirDatm=str(dataDir_routed),DirErrBase=DirErrBase,
-                               RmvDatmOut=True,DirOutBase=out_path)
\ No newline at end of file
+            err_datum_path(err=err_msg,DirDatm=str(path.parent),DirErrBase=DirErrBase,
+                           RmvDatmOut=True,DirOutBase=out_path)
+            results.append(ERRORED)
+        return results
+    for path in paths:
+        try:
+            results.append(write_file(path, file_data))
+        except:
+            err_msg = sys.exc_info()
+            err_datum_path(err=err_msg,DirDatm=str(path.parent),DirErrBase=DirErrBase,
+                           RmvDatmOut=True,DirOutBase=out_path)
+            results.append(ERRORED)
+    return results
+
+
+def write_file(path: Path, file_data: bytes) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as file:
+        log.debug(f'writing file: {path}')
+        file.write(file_data)
+    return WRITTEN
@@ -21,11 +21,13 @@ def main() -> None:
     out_path: Path = env.path('OUT_PATH')
     err_path: Path = env.path('ERR_PATH')
     log_level: str = env.log_level('LOG_LEVEL', 'INFO')
+    write_workers: int = env.int('WRITE_WORKERS', 4)
     log_config.configure(log_level)
     db_config = read_from_mount(Path('/var/db_secret'))
     with closing(DbConnector(db_config)) as connector:
         get_named_locations_partial = partial(get_named_locations, connector=connector, location_type=location_type)
-        load_locations(out_path=out_path, err_path=err_path, get_locations=get_named_locations_partial, source_type=source_type)
+        load_locations(out_path=out_path, err_path=err_path, get_locations=get_named_locations_partial, source_type=source_type,
+                       workers=write_workers)
 
 
 if __name__ == "__main__":
@@ -36,6 +36,31 @@ class LocationLoaderTest(DatabaseBackedTest):
         file_path = Path(self.out_path, 'pqs1/CFGLOC100243/CFGLOC100243.json')
         self.assertTrue(file_path.exists())
 
+    @staticmethod
+    def get_named_location(name: str, schema_names: List[str], description: str = 'A test location.') -> NamedLocation:
+        active_period = ActivePeriod(start_date=to_datetime('2020-01-01T00:00:00Z'),
+                                     end_date=to_datetime('2020-03-01T00:00:00Z'))
+        return NamedLocation(name=name,
+                             type='CONFIG',
+                             description=description,
+                             site='CPER',
+                             domain='D10',
+                             schema_names=schema_names,
+                             context=list(schema_names),
+                             active_periods=[active_period],
+                             properties=[Property(name='property1', value='value1')])
+
+    def test_load_locations_workers(self):
+        named_locations = [self.get_named_location(f'CFGLOC{n}', ['prt', 'pqs1']) for n in range(20)]
+        counts = location_loader.load_locations(out_path=self.out_path, err_path=self.err_path,
+                                                get_locations=lambda source_type: iter(named_locations),
+                                                source_type='prt', workers=4)
+        self.assertEqual((40, 0), counts)
+        for n in range(20):
+            for schema_name in ['prt', 'pqs1']:
+                file_path = Path(self.out_path, schema_name, f'CFGLOC{n}', f'CFGLOC{n}.json')
+                self.assertEqual(f'CFGLOC{n}', json.loads(file_path.read_text())['features'][0]['properties']['name'])
+
     def test_location_loader(self):
         site = 'CPER'
         domain = 'D10'
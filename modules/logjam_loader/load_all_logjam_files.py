@@ -1,78 +1,129 @@
 #!/usr/bin/env python3
 
 import os
-from contextlib import closing
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 import environs
-import xml.etree.ElementTree as ET
-import sys
 from google.cloud import storage
-from data_access.db_config_reader import read_from_mount
-from data_access.db_connector import DbConnector
-import datetime
-import pandas as pd
-import io
-from io import BytesIO
-from io import StringIO
+from structlog import get_logger
+
+import common.log_config as log_config
+from common.path_linker import walk_files
+
+log = get_logger()
+
+
+class ProgressLog:
+    """Log download progress at most once per interval."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.start = time.monotonic()
+        self.last = self.start
+
+    def update(self, loaded: int, failed: int) -> None:
+        now = time.monotonic()
+        if now - self.last >= self.interval:
+            self.last = now
+            log.info('Loading logjam files', loaded=loaded, failed=failed, seconds=round(now - self.start, 1))
 
 
 def load() -> None:
     env = environs.Env()
     ingest_bucket_name = env.str('LOGJAM_INGEST_BUCKET')
     in_path: Path = env.path('IN_PATH')
-    print("IN_PATH value is:", in_path)
     output_directory: Path = env.path('OUT_PATH')
-    db_config = read_from_mount(Path('/var/db_secret'))
+    starting_path_index: int = env.int('STARTING_PATH_INDEX')
+    download_workers = env.int('DOWNLOAD_WORKERS', 8) # Number of concurrent downloads
+    log_interval = env.float('LOG_INTERVAL', 30) # Seconds between progress messages
+    log_level: str = env.log_level('LOG_LEVEL', 'INFO')
+    log_config.configure(log_level)
     storage_client = storage.Client()
     ingest_bucket = storage_client.bucket(ingest_bucket_name)
-    starting_path_index: int = env.int('STARTING_PATH_INDEX')
-    print("starting_path_index value is:", starting_path_index)
-    
-    with closing(DbConnector(db_config)) as connector:
-        now = datetime.datetime.now()
-        try:
-            data_path_start = Path(*in_path.parts[0:starting_path_index + 1])  # starting index
-            print("Starting New Datum in the load_all_logjam_files pipeline ", data_path_start)
-            for path in data_path_start.rglob('*'):
-                if path.is_file():
-                    pathname, extension = os.path.splitext(path)
-                    print("pathname is: ", pathname)
-                    path_split = pathname.split('/')
-                    print("path_split is: ", path_split)
-                    
-                    folder = path_split[-4]
-                    print("folder is: ", folder)
-                    
-                    sourcetype = path_split[-3]
-                    print("sourcetype is: ", sourcetype)
-                    
-                    asset = path_split[-2]
-                    print("asset is: ", asset)
-
-                    filename = path_split[-1] + ".csv"
-                    if filename == '.csv.csv':
-                        print("Not a recognized file.")
-                    else:
-                        print("FileName is: ", filename)
-                        gcs_path = os.path.join(folder,sourcetype,asset,filename)
-                        print("gcs_path is: ", gcs_path)
-                    
-                        blob = ingest_bucket.blob(gcs_path)
-                        try:
-                            output_path = Path(output_directory,asset,filename)
-                            print('Output Path is:', output_path)
-                            output_path.parent.mkdir(parents=True, exist_ok=True)
-                            print('Output Path is:', output_path)
-                            with open(output_path, "wb") as output_file:
-                                output_file.write(blob.download_as_string())
-                            
-                        except Exception:
-                            exc_type, exc_obj, exc_tb = sys.exc_info()
-                            print("Exception at line " + str(exc_tb.tb_lineno) + ": " + str(sys.exc_info()))
-
-        except Exception:
-            exception_type, exception_obj, exception_tb = sys.exc_info()
-            print("Exception at line " + str(exception_tb.tb_lineno) + ": " + str(sys.exc_info()))
+
+    data_path_start = Path(*in_path.parts[0:starting_path_index + 1])  # starting index
+    log.info('Starting new datum in the load_all_logjam_files pipeline', path=str(data_path_start))
+    load_files(ingest_bucket, get_downloads(data_path_start, output_directory), download_workers, log_interval)
+
+
+def get_downloads(data_path: Path, output_directory: Path) -> Iterator[Tuple[str, Path]]:
+    """
+    Walk the trigger files, yielding the bucket path and output path of each logjam file.
+
+    :param data_path: The trigger directory, with files at folder/source type/asset/file.
+    :param output_directory: The output root.
+    :return: The bucket and output paths.
+    """
+    for path in walk_files(data_path):
+        pathname, extension = os.path.splitext(path)
+        path_split = pathname.split('/')
+        folder = path_split[-4]
+        sourcetype = path_split[-3]
+        asset = path_split[-2]
+        filename = path_split[-1] + ".csv"
+        if filename == '.csv.csv':
+            log.warning('Not a recognized file.', path=str(path))
+            continue
+        gcs_path = os.path.join(folder, sourcetype, asset, filename)
+        yield gcs_path, Path(output_directory, asset, filename)
+
+
+def load_files(bucket, downloads: Iterable[Tuple[str, Path]], workers: int = 8,
+               log_interval: float = 30) -> Dict[str, str]:
+    """
+    Stream blobs to files in a bounded thread pool while the downloads are produced. At most twice
+    the number of workers downloads are queued at a time.
+
+    :param bucket: The logjam bucket.
+    :param downloads: The bucket and output paths.
+    :param workers: The number of concurrent downloads.
+    :param log_interval: The minimum number of seconds between progress messages.
+    :return: The errors of the failed downloads by bucket path.
+    """
+    workers = max(workers, 1)
+    progress = ProgressLog(log_interval)
+    failures: Dict[str, str] = {}
+    loaded = 0
+    pending = {}
+
+    def collect(futures) -> None:
+        nonlocal loaded
+        for future in futures:
+            gcs_path = pending.pop(future)
+            error = future.result()
+            if error is None:
+                loaded += 1
+            else:
+                failures[gcs_path] = error
+        progress.update(loaded, len(failures))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for gcs_path, output_path in downloads:
+            if len(pending) >= 2 * workers:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+            pending[executor.submit(download_blob, bucket, gcs_path, output_path)] = gcs_path
+        collect(wait(pending).done)
+
+    log.info('Loaded logjam files', loaded=loaded, failed=len(failures),
+             seconds=round(time.monotonic() - progress.start, 1))
+    if failures:
+        log.error('Failed to load logjam files', failed=len(failures), errors=failures)
+    return failures
+
+
+def download_blob(bucket, gcs_path: str, output_path: Path) -> Optional[str]:
+    """Stream a blob to a file, returning the error or None. A partial file is removed."""
+    log.debug('Downloading', gcs_path=gcs_path, output_path=str(output_path))
+    try:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        bucket.blob(gcs_path).download_to_filename(str(output_path))
+        return None
+    except Exception as e:
+        if output_path.exists():
+            output_path.unlink()
+        return f'{type(e).__name__}: {e}'
 
 
 if __name__ == '__main__':
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+import unittest
+from pathlib import Path
+
+from testfixtures import TempDirectory
+
+from common.tests.fake_bucket import FakeBucket
+from logjam_loader.load_all_logjam_files import get_downloads, load_files
+
+
+class LoadAllLogjamFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = TempDirectory()
+        self.in_path = Path(self.temp_dir.path, 'in/2024/01/02/logjam_prod/leveltroll400')
+        self.out_path = Path(self.temp_dir.path, 'out')
+        self.contents = {}
+        for asset in ['1001', '1002']:
+            for n in range(3):
+                self.temp_dir.write(f'in/2024/01/02/logjam_prod/leveltroll400/{asset}/{asset}_{n}.csv', b'')
+                self.contents[f'logjam_prod/leveltroll400/{asset}/{asset}_{n}.csv'] = \
+                    f'time,level\n2024-01-02T00:00:00Z,{n}.5\n'.encode() * 10
+        self.temp_dir.write('in/2024/01/02/logjam_prod/leveltroll400/1001/.csv.csv', b'')
+        self.bucket = FakeBucket(self.contents, latency=0.01)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_downloads(self):
+        downloads = sorted(get_downloads(self.in_path, self.out_path))
+        self.assertEqual(6, len(downloads))
+        self.assertEqual(('logjam_prod/leveltroll400/1001/1001_0.csv', Path(self.out_path, '1001/1001_0.csv')),
+                         downloads[0])
+
+    def test_load_files(self):
+        self.bucket.broken.add('logjam_prod/leveltroll400/1002/1002_1.csv')
+        failures = load_files(self.bucket, get_downloads(self.in_path, self.out_path), workers=2)
+        self.assertEqual(['logjam_prod/leveltroll400/1002/1002_1.csv'], list(failures))
+        self.assertIn('ConnectionError', failures['logjam_prod/leveltroll400/1002/1002_1.csv'])
+        # the partial file of the failed download is removed
+        self.assertFalse(Path(self.out_path, '1002/1002_1.csv').exists())
+        for gcs_path, content in self.contents.items():
+            if gcs_path not in failures:
+                self.assertEqual(content, Path(self.out_path, *gcs_path.split('/')[2:]).read_bytes())
+        self.assertLessEqual(self.bucket.max_active, 2)
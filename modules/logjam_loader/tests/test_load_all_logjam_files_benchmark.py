@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from common.tests.fake_bucket import FakeBucket
+from logjam_loader.load_all_logjam_files import load_files
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Benchmark skipped due to long process time.')
+class LoadAllLogjamFilesBenchmarkTest(unittest.TestCase):
+    """Time loading 1000 logjam files from a bucket with 10ms of latency per download."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_throughput(self):
+        contents = {f'logjam_prod/leveltroll400/{n % 50}/{n}.csv': b'time,level\n' * 100 for n in range(1000)}
+        for workers in [1, 4, 16, 32]:
+            bucket = FakeBucket(contents, latency=0.01)
+            out_path = Path(self.temp_dir.name, str(workers))
+            downloads = ((gcs_path, Path(out_path, *gcs_path.split('/')[2:])) for gcs_path in contents)
+            start = time.perf_counter()
+            failures = load_files(bucket, downloads, workers=workers)
+            elapsed = time.perf_counter() - start
+            self.assertEqual({}, failures)
+            print(f'{len(contents)} files with {workers} workers: {elapsed:.2f}s, {len(contents) / elapsed:.0f} files/s')
@@ -35,12 +35,10 @@ def write_publication_files(config: PublicationConfig) -> None:
                 domain = path.name.split('.')[1]
                 (start_date, end_date) = get_full_month(int(path_parts.year), int(path_parts.month))
                 workbook_path = config.path_config.workbook_path
-                workbook_rows: list[dict] = workbook_parser.parse_workbook_file(workbook_path,
-                                                                                path_parts.data_product)
+                workbook = workbook_parser.read_workbook_file(workbook_path, path_parts.data_product)
                 for table in config.data_loader.get_tables(config.partial_table_name):
-                    table_workbook_rows = workbook_parser.filter_workbook_rows(workbook_rows,
-                                                                               table.name,
-                                                                               path_parts.package_type)
+                    table_workbook_rows = workbook_parser.get_table_rows(workbook, table.name,
+                                                                         path_parts.package_type)
                     if not table_workbook_rows:
                         continue
                     results = config.data_loader.get_site_results(table, path_parts.site, start_date, end_date)
@@ -2,6 +2,9 @@ import csv
 from collections import OrderedDict
 from pathlib import Path
 from structlog import get_logger
+
+import common.workbook_index as workbook_index
+from common.workbook_index import WorkbookIndex
 log = get_logger()
 
 
@@ -17,6 +20,25 @@ def parse_workbook_file(workbook_path: Path, data_product_idq: str) -> list[dict
     raise SystemExit(f'Publication workbook "{expected_filename}" not found.')
 
 
+def read_workbook_file(workbook_path: Path, data_product_idq: str) -> WorkbookIndex:
+    """Read the indexed publication workbook file, parsing each workbook once per process."""
+    expected_filename = f'publication_workbook_NEON.DOM.SITE.{data_product_idq}.txt'
+    workbook = workbook_index.find_workbook(workbook_path, expected_filename)
+    if workbook is None:
+        raise SystemExit(f'Publication workbook "{expected_filename}" not found.')
+    return workbook
+
+
+def get_table_rows(workbook: WorkbookIndex, table_name: str, package_type: str) -> list[dict]:
+    """Get the indexed workbook rows for a table and download package type."""
+    table = workbook.tables.get(table_name)
+    if table is None:
+        return []
+    if package_type in table.package_rows:
+        return table.package_rows[package_type]
+    return filter_workbook_rows(table.rows, table_name, package_type)
+
+
 def get_workbook_header(workbook_rows: list[dict]) -> list[str]:
     """Get the publication workbook header."""
     rows_by_rank: dict[int, str] = {}
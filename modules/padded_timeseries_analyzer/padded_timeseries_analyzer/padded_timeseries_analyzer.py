@@ -2,6 +2,7 @@
 import os
 import sys
 from pathlib import Path
+from typing import Dict, Iterator, List
 import re
 
 from structlog import get_logger
@@ -31,59 +32,75 @@ class PaddedTimeSeriesAnalyzer:
 
     def analyze(self) -> None:
         """Verify all necessary data files are present in the input."""
-        dataDir_routed = Path("")
         manifest_file = AnalyzerConfig.manifest_filename
-        for root,directories,files in os.walk(str(self.data_path)):
-            for dir in directories:
-                if dir == 'data':
-                    try:
-                        dataDir = Path(root,dir)
-                        open(Path(dataDir,manifest_file))
-                    except:
-                        dataDir_routed = Path(root,dir).parent
+        self.index_directories()
+        for root in self.roots:
+            files = self.files_by_dir[root]
+            for dir in self.directories_by_dir[root]:
+                if dir == AnalyzerConfig.data_dir:
+                    dataDir = Path(root, dir)
+                    if not self.has_manifest(dataDir):
+                        dataDir_routed = dataDir.parent
                         err_msg = "No manifest_file found in data path directory"
                         err_datum_path(err=err_msg,DirDatm=str(dataDir_routed),DirErrBase=self.DirErrBase,
                                        RmvDatmOut=True,DirOutBase=self.out_path)
-            for filename in files:
+            if manifest_file in files:
                 try:
-                    if filename == manifest_file:
-                        # read manifest
-                        dates = [date.rstrip() for date in open(Path(root, filename))]
-                        # check for existence of complete manifest
-                        dates_not_found = []
-                        for date in dates:
-                            dates_not_found.append(date)
-                        for date in dates:
-                            for data_file in os.listdir(root):
-                                log.debug(f'data_file: {data_file}')
-                                if data_file != manifest_file:
-                                    data_file_date = self.get_data_file_date(data_file)
-                                    log.debug(f'checking data file date: {data_file_date} and '
-                                              f'manifest date {date} in {dates_not_found}')
-                                    if date in data_file_date and date in dates_not_found:
-                                        log.debug(f'found data for: {date}')
-                                        dates_not_found.remove(date)
-                        # if complete link to output
-                        if not dates_not_found:
-                            for data_file in os.listdir(root):
-                                if data_file != manifest_file:
-                                    file_path = Path(root, data_file)
-                                    link_path = Path(self.out_path, *file_path.parts[self.relative_path_index:])
-                                    log.debug(f'linking {file_path} to {link_path}')
-                                    link_path.parent.mkdir(parents=True, exist_ok=True)
-                                    if not link_path.exists():
-                                        link_path.symlink_to(file_path)
-                                    self.link_thresholds(file_path, link_path)
-                            # go up one directory to find any ancillary files to link
-                            self.link_ancillary_files(Path(root))
+                    self.check_manifest(root, files)
                 except Exception:
                     exception_type,exception_obj,exception_tb = sys.exc_info()
                     log.error("Exception at line " + str(exception_tb.tb_lineno) + ": " + str(sys.exc_info()))
-                    dataDir_routed = Path(root, filename).parent.parent
+                    dataDir_routed = Path(root, manifest_file).parent.parent
                     err_msg  = sys.exc_info()
                     err_datum_path(err=err_msg,DirDatm=str(dataDir_routed),DirErrBase=self.DirErrBase,
                                        RmvDatmOut=True,DirOutBase=self.out_path)
 
+    def index_directories(self) -> None:
+        """Walk the input once, recording the files and subdirectories of every directory."""
+        self.roots: List[str] = []
+        self.files_by_dir: Dict[str, List[str]] = {}
+        self.directories_by_dir: Dict[str, List[str]] = {}
+        for root, directories, files in os.walk(str(self.data_path)):
+            self.roots.append(root)
+            self.files_by_dir[root] = files
+            self.directories_by_dir[root] = directories
+
+    def has_manifest(self, data_dir: Path) -> bool:
+        files = self.files_by_dir.get(str(data_dir))
+        if files is None:
+            # not walked, e.g. a linked directory
+            return Path(data_dir, AnalyzerConfig.manifest_filename).is_file()
+        return AnalyzerConfig.manifest_filename in files
+
+    def check_manifest(self, root: str, files: List[str]) -> None:
+        """
+        Link the data directory to the output if it holds a data file for every manifest date.
+
+        :param root: The data directory.
+        :param files: The file names in the directory.
+        """
+        manifest_file = AnalyzerConfig.manifest_filename
+        with open(Path(root, manifest_file)) as file:
+            dates = {date.rstrip() for date in file} - {''}
+        data_files = [data_file for data_file in files if data_file != manifest_file]
+        data_file_dates = {self.get_data_file_date(data_file) for data_file in data_files} if dates else set()
+        dates_not_found = dates - data_file_dates
+        log.debug(f'{root} manifest dates not found: {sorted(dates_not_found)}')
+        # if complete link to output
+        if not dates_not_found:
+            link_root = Path(self.out_path, *Path(root).parts[self.relative_path_index:])
+            if data_files:
+                link_root.mkdir(parents=True, exist_ok=True)
+            for data_file in data_files:
+                file_path = Path(root, data_file)
+                link_path = Path(link_root, data_file)
+                log.debug(f'linking {file_path} to {link_path}')
+                if not link_path.exists():
+                    link_path.symlink_to(file_path)
+            if data_files:
+                self.link_thresholds(file_path, link_path)
+            # go up one directory to find any ancillary files to link
+            self.link_ancillary_files(Path(root))
 
     @staticmethod
     def link_thresholds(data_file_path: Path, data_file_link_path: Path) -> None:
@@ -109,13 +126,34 @@ class PaddedTimeSeriesAnalyzer:
 
         :param root: The root directory to find files.
         """
-        for file_path in root.parent.rglob('*'):
-            if file_path.is_file():
-                if '/'+AnalyzerConfig.data_dir+'/' not in str(file_path) and AnalyzerConfig.threshold_dir not in str(file_path):
-                    link_path = Path(self.out_path, *file_path.parts[self.relative_path_index:])
-                    link_path.parent.mkdir(parents=True, exist_ok=True)
-                    if not link_path.exists():
-                        link_path.symlink_to(file_path)
+        for file_path in self.get_files_below(root.parent):
+            if '/'+AnalyzerConfig.data_dir+'/' not in str(file_path) and AnalyzerConfig.threshold_dir not in str(file_path):
+                link_path = Path(self.out_path, *file_path.parts[self.relative_path_index:])
+                link_path.parent.mkdir(parents=True, exist_ok=True)
+                if not link_path.exists():
+                    link_path.symlink_to(file_path)
+
+    def get_files_below(self, path: Path) -> Iterator[Path]:
+        """
+        Get all indexed files in a directory and its subdirectories.
+
+        :param path: The directory.
+        :return: The file paths.
+        """
+        root = str(path)
+        if root not in self.files_by_dir:
+            yield from (file_path for file_path in path.rglob('*') if file_path.is_file())
+            return
+        # descend through the walked subdirectories of each directory
+        directories = [root]
+        while directories:
+            directory = directories.pop()
+            for filename in self.files_by_dir[directory]:
+                yield Path(directory, filename)
+            for subdirectory in reversed(self.directories_by_dir[directory]):
+                subdirectory = os.path.join(directory, subdirectory)
+                if subdirectory in self.files_by_dir:
+                    directories.append(subdirectory)
 
     @staticmethod
     def get_data_file_date(filename: str) -> str:
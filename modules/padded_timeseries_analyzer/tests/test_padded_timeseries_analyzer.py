@@ -60,6 +60,27 @@ class PaddedTimeSeriesAnalyzerTest(TestCase):
         analyzer.analyze()
         self.check_output()
 
+    def test_incomplete_manifest(self):
+        next_data_path = Path(self.input_root, self.source_dir, AnalyzerConfig.data_dir, self.next_data_file)
+        self.fs.remove_object(str(next_data_path))
+        analyzer = PaddedTimeSeriesAnalyzer(self.input_data_dir, self.out_dir, self.err_dir, self.relative_path_index)
+        analyzer.analyze()
+        output_root = Path(self.out_dir, self.source_dir)
+        self.assertFalse(Path(output_root, AnalyzerConfig.data_dir, self.source_data_file).exists())
+        self.assertFalse(Path(output_root, AnalyzerConfig.location_dir, AnalyzerConfig.location_filename).exists())
+
+    def test_hyphenated_sibling(self):
+        # a sibling named with a hyphen sorts between the directory and its subdirectories
+        sibling_dir = Path(self.input_root, f'{self.source_dir}-b')
+        self.fs.create_file(Path(sibling_dir, AnalyzerConfig.data_dir, self.source_data_file))
+        analyzer = PaddedTimeSeriesAnalyzer(self.input_data_dir, self.out_dir, self.err_dir, self.relative_path_index)
+        analyzer.index_directories()
+        source_root = Path(self.input_root, self.source_dir)
+        files = sorted(analyzer.get_files_below(source_root))
+        self.assertEqual(sorted(path for path in source_root.rglob('*') if path.is_file()), files)
+        analyzer.analyze()
+        self.check_output()
+
     def test_main(self):
         os.environ['DATA_PATH'] = str(self.input_data_dir)
         os.environ['OUT_PATH'] = str(self.out_dir)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import time
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+from padded_timeseries_analyzer.padded_timeseries_analyzer.analyzer_config import AnalyzerConfig
+from padded_timeseries_analyzer.padded_timeseries_analyzer.padded_timeseries_analyzer import PaddedTimeSeriesAnalyzer
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Benchmark skipped due to long process time.')
+class PaddedTimeSeriesAnalyzerBenchmarkTest(unittest.TestCase):
+    """Time the analyzer on wide (+/- 7 day) pads for many locations."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_data_dir = Path(self.temp_dir.name, 'in', 'prt', '2018', '01', '10')
+        self.out_dir = Path(self.temp_dir.name, 'out')
+        self.err_dir = Path(self.out_dir, 'errored')
+        self.relative_path_index = 3
+        self.location_count = 50
+        day = date(2018, 1, 10)
+        dates = [str(day + timedelta(days=n)) for n in range(-7, 8)]
+        for n in range(0, self.location_count):
+            location = f'CFGLOC{100000 + n}'
+            location_root = Path(self.input_data_dir, location)
+            data_root = Path(location_root, AnalyzerConfig.data_dir)
+            data_root.mkdir(parents=True)
+            for data_date in dates:
+                Path(data_root, f'prt_{location}_{data_date}.ext').touch()
+            Path(data_root, AnalyzerConfig.manifest_filename).write_text('\n'.join(dates))
+            for ancillary_dir in [AnalyzerConfig.location_dir, 'calibration/resistance', 'uncertainty_coef']:
+                Path(location_root, ancillary_dir).mkdir(parents=True)
+                for m in range(0, 4):
+                    Path(location_root, ancillary_dir, f'{location}_{m}.json').touch()
+            Path(location_root, AnalyzerConfig.threshold_dir).mkdir()
+            Path(location_root, AnalyzerConfig.threshold_dir, AnalyzerConfig.threshold_filename).touch()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_analyze(self):
+        analyzer = PaddedTimeSeriesAnalyzer(self.input_data_dir, self.out_dir, self.err_dir, self.relative_path_index)
+        start = time.perf_counter()
+        analyzer.analyze()
+        elapsed = time.perf_counter() - start
+        print(f'\nanalyzed {self.location_count} locations in {elapsed:.3f}s')
+        links = [path for path in self.out_dir.rglob('*') if path.is_symlink()]
+        # 15 data files, 12 ancillary files and 1 threshold file per location
+        self.assertEqual(self.location_count * 28, len(links))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 import sys
 from pathlib import Path
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
 
 import pyarrow
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 import structlog
 
@@ -28,6 +30,11 @@ class ParquetFileMerger:
         self.in_path = config.in_path
         self.out_path = config.out_path
         self.duplication_threshold = config.duplication_threshold
+        self.merge_engine = config.merge_engine
+        self.compression = config.compression
+        self.compression_level = config.compression_level
+        self.row_group_size = config.row_group_size
+        self.parallelism = config.parallelism
         self.path_parser = PathParser(config)
 
     def merge(self) -> None:
@@ -39,12 +46,13 @@ class ParquetFileMerger:
                 key_files[key] = [path]
             else:
                 key_files[key].append(path)
-        for key in key_files:
+        link_paths: List[Path] = []
+        merge_groups: Dict[str, List[Path]] = {}
+        for key in sorted(key_files):
             # Link if there is only one file for the key
-            paths = key_files[key]
-            if len(key_files[key]) == 1:
-                path = key_files[key][0]
-                link(path, self.to_output_path(path))
+            paths = sorted(key_files[key])
+            if len(paths) == 1:
+                link_paths.append(paths[0])
             else:
                 site_keys = {}
                 for path in paths:
@@ -57,17 +65,91 @@ class ParquetFileMerger:
                     files_to_merge: List[Path] = []
                     for site_key in site_keys:
                         files_to_merge.extend(site_keys[site_key])
-                    self.write_merged_files(files_to_merge)
+                    merge_groups[key] = files_to_merge
                 else:
-                    for site_key in site_keys:
-                        paths = site_keys[site_key]
-                        for path in paths:
-                            link(path, self.to_output_path(path))
+                    link_paths.extend(paths)
+        # links are cheap, create them in this process rather than paying pool overhead
+        for path in link_paths:
+            link(path, self.to_output_path(path))
+        if self.parallelism > 1 and len(merge_groups) > 1:
+            self.write_merged_groups(merge_groups)
+        else:
+            for files_to_merge in merge_groups.values():
+                self.write_merged_files(files_to_merge)
+
+    def write_merged_groups(self, merge_groups: Dict[str, List[Path]]) -> None:
+        """
+        Merge independent key groups in a process pool. Every group is attempted and
+        failures are reported per key before exiting.
+
+        :param merge_groups: File paths to merge by key.
+        """
+        errors: Dict[str, str] = {}
+        with ProcessPoolExecutor(max_workers=self.parallelism) as executor:
+            futures = {key: executor.submit(self.write_merged_files, files) for key, files in merge_groups.items()}
+            for key, future in futures.items():
+                try:
+                    future.result()
+                except BaseException as error:
+                    errors[key] = repr(error)
+        for key, error in errors.items():
+            log.error(f"Merging files for key {key} failed: {error}")
+        if errors:
+            sys.exit(1)
 
     def write_merged_files(self, input_files: List[Path]) -> None:
         """
         Merge files from same source at different sites occurring on the same day.
 
+        :param input_files: File paths organized by source ID.
+        """
+        if self.merge_engine == 'pandas':
+            self.write_merged_files_pandas(input_files)
+        else:
+            self.write_merged_files_arrow(input_files)
+
+    def write_merged_files_arrow(self, input_files: List[Path]) -> None:
+        """
+        Merge files by concatenating the Arrow tables and sorting with Arrow compute,
+        without converting to pandas.
+
+        :param input_files: File paths organized by source ID.
+        """
+        path = input_files[0]
+        tables: List[pyarrow.Table] = [read_table(path)]
+        tb1_schema = tables[0].schema.metadata['parquet.avro.schema'.encode('UTF-8')]
+        for f in input_files[1:]:
+            tbf = read_table(f)
+            tbf_schema = tbf.schema.metadata['parquet.avro.schema'.encode('UTF-8')]
+            if tbf_schema != tb1_schema:
+                log.error(f"{f} schema does not match {path} schema")
+                sys.exit(1)
+            log.info(f"Merging {f} with {path}")
+            tables.append(tbf)
+        table = pyarrow.concat_tables(tables)
+        del tables
+        table = table.sort_by('readout_time')
+        duplicated_columns = [name.encode('UTF-8') for name in table.column_names
+                              if get_duplication_ratio(table.column(name)) > self.duplication_threshold]
+        table = table.replace_schema_metadata({
+            'parquet.avro.schema': tb1_schema,
+            'writer.model.name': 'avro'
+        })
+        output_file_path = self.to_output_path(path)
+        log.info(f"writing merged parquet file {output_file_path}")
+        pq.write_table(table,
+                       output_file_path,
+                       row_group_size=self.row_group_size,
+                       use_dictionary=duplicated_columns,
+                       compression=self.compression,
+                       compression_level=self.compression_level,
+                       coerce_timestamps='ms',
+                       allow_truncated_timestamps=False)
+
+    def write_merged_files_pandas(self, input_files: List[Path]) -> None:
+        """
+        Merge files by appending pandas data frames.
+
         :param input_files: File paths organized by source ID.
         """
         path = input_files[0]
@@ -106,9 +188,10 @@ class ParquetFileMerger:
         log.info(f"writing merged parquet file {output_file_path}")
         pq.write_table(table,
                        output_file_path,
+                       row_group_size=self.row_group_size,
                        use_dictionary=duplicated_columns,
-                       compression='gzip',
-                       compression_level=5,
+                       compression=self.compression,
+                       compression_level=self.compression_level,
                        coerce_timestamps='ms',
                        allow_truncated_timestamps=False)
 
@@ -124,3 +207,29 @@ class ParquetFileMerger:
         output_path = Path(self.out_path, source_type, year, month, day, source_id, 'data', filename)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         return output_path
+
+
+def read_table(path: Path) -> pyarrow.Table:
+    """
+    Read a parquet file into a table. The file bytes are read first so pyarrow
+    can seek() the buffer if the path is a named pipe.
+
+    :param path: A file path.
+    :return: The table.
+    """
+    with open(path, 'rb') as open_file:
+        buffer = pyarrow.py_buffer(open_file.read())
+    return pq.read_table(pyarrow.BufferReader(buffer))
+
+
+def get_duplication_ratio(column: pyarrow.ChunkedArray) -> float:
+    """
+    Get the fraction of duplicated values in a column, as pandas duplicated() counts them.
+
+    :param column: The column.
+    :return: The ratio of duplicated values to the number of values less one, 0 for nested types.
+    """
+    if pyarrow.types.is_nested(column.type) or len(column) < 2:
+        return 0
+    distinct = pc.count_distinct(column, mode='all').as_py()
+    return (len(column) - distinct) / (len(column) - 1)
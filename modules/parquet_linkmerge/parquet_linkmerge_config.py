@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-from typing import NamedTuple
+from typing import NamedTuple, Optional
 from pathlib import Path
 
 
@@ -12,3 +12,8 @@ class Config(NamedTuple):
     month_index: int
     day_index: int
     source_id_index: int
+    merge_engine: str = 'arrow'
+    compression: str = 'gzip'
+    compression_level: Optional[int] = 5
+    row_group_size: Optional[int] = None
+    parallelism: int = 1
@@ -23,6 +23,13 @@ def main() -> None:
     month_index: int = env.int('MONTH_INDEX')
     day_index: int = env.int('DAY_INDEX')
     source_id_index: int = env.int('SOURCE_ID_INDEX')
+    # 'arrow' merges tables directly, 'pandas' is the original data frame merge
+    merge_engine: str = env.str('MERGE_ENGINE', 'arrow')
+    compression: str = env.str('COMPRESSION', 'gzip')
+    compression_level: int = env.int('COMPRESSION_LEVEL', 5 if compression == 'gzip' else None)
+    row_group_size: int = env.int('ROW_GROUP_SIZE', None)
+    # number of processes merging key groups concurrently
+    parallelism: int = env.int('PARALLELISM', 1)
     log_config.configure(log_level)
     config = Config(in_path=in_path,
                     out_path=out_path,
@@ -31,7 +38,12 @@ def main() -> None:
                     year_index=year_index,
                     month_index=month_index,
                     day_index=day_index,
-                    source_id_index=source_id_index)
+                    source_id_index=source_id_index,
+                    merge_engine=merge_engine,
+                    compression=compression,
+                    compression_level=compression_level,
+                    row_group_size=row_group_size,
+                    parallelism=parallelism)
     parquet_file_merger = ParquetFileMerger(config)
     parquet_file_merger.merge()
 
@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 import os
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
 import structlog
 
+import pyarrow.parquet as pq
+
 from pyfakefs.fake_filesystem_unittest import TestCase
 
 from common import log_config as log_config
@@ -86,3 +90,88 @@ class ParquetLinkMergeTest(TestCase):
         self.assertTrue(Path(self.out_path, self.metadata_path, '02/6974/data/prt_6974_2019-10-02.parquet').exists())
         self.assertTrue(Path(self.out_path, self.metadata_path, '02/6848/data/prt_6848_2019-10-02.parquet').exists())
         # self.assertTrue(Path(self.out_path, self.metadata_path, '03/6848/data/prt_6848_2019-10-03.parquet').exists())
+
+
+class ParquetMergeEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        log_config.configure('DEBUG')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.in_path = Path(self.temp_dir.name, 'in')
+        self.out_path = Path(self.temp_dir.name, 'out')
+        self.input_files = []
+        for file_name in ['UNDE_prt_6848_2019-10-02.parquet', 'WREF_prt_6848_2019-10-02.parquet']:
+            path = Path(self.in_path, 'prt/2019/10/02/6848/data', file_name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(Path(os.path.dirname(__file__), file_name), path)
+            self.input_files.append(path)
+        self.output_file = Path(self.out_path, 'prt/2019/10/02/6848/data/prt_6848_2019-10-02.parquet')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def get_config(self, **kwargs) -> Config:
+        # the temporary directory adds its own path parts ahead of the input path
+        offset = len(self.in_path.parts) - 1
+        return Config(in_path=self.in_path,
+                      out_path=self.out_path,
+                      duplication_threshold=0.3,
+                      source_type_index=offset + 1,
+                      year_index=offset + 2,
+                      month_index=offset + 3,
+                      day_index=offset + 4,
+                      source_id_index=offset + 5,
+                      **kwargs)
+
+    def merge(self, **kwargs):
+        ParquetFileMerger(self.get_config(**kwargs)).merge()
+        return pq.read_table(self.output_file)
+
+    def test_arrow_merge_matches_pandas_merge(self):
+        pandas_table = self.merge(merge_engine='pandas')
+        self.output_file.unlink()
+        arrow_table = self.merge(merge_engine='arrow')
+        row_count = sum(pq.read_metadata(path).num_rows for path in self.input_files)
+        self.assertEqual(arrow_table.num_rows, row_count)
+        self.assertEqual(arrow_table.schema.metadata, pandas_table.schema.metadata)
+        self.assertEqual(arrow_table.column_names, pandas_table.column_names)
+        readout_times = arrow_table.column('readout_time').to_pylist()
+        self.assertEqual(readout_times, sorted(readout_times))
+        sort_keys = [('readout_time', 'ascending'), ('site_id', 'ascending')]
+        self.assertTrue(arrow_table.sort_by(sort_keys).equals(pandas_table.sort_by(sort_keys)))
+
+    def test_codec_and_row_group_size(self):
+        self.merge(compression='zstd', compression_level=None, row_group_size=1000)
+        metadata = pq.read_metadata(self.output_file)
+        self.assertEqual(metadata.row_group(0).column(0).compression, 'ZSTD')
+        self.assertEqual(metadata.row_group(0).num_rows, 1000)
+
+    def add_key_group(self, source_id: str, avro_schema: bytes = None) -> Path:
+        for path in self.input_files:
+            target = Path(self.in_path, f'prt/2019/10/02/{source_id}/data', path.name.replace('6848', source_id))
+            target.parent.mkdir(parents=True, exist_ok=True)
+            table = pq.read_table(path)
+            if avro_schema is not None and path.name.startswith('WREF'):
+                table = table.replace_schema_metadata({'parquet.avro.schema': avro_schema})
+            pq.write_table(table, target)
+        return Path(self.out_path, f'prt/2019/10/02/{source_id}/data/prt_{source_id}_2019-10-02.parquet')
+
+    def test_parallel_merge(self):
+        output_files = [self.output_file] + [self.add_key_group(source_id) for source_id in ['6849', '6850']]
+        single = Path(self.in_path, 'prt/2019/10/02/7000/data/GRSM_prt_7000_2019-10-02.parquet')
+        single.parent.mkdir(parents=True)
+        shutil.copy(self.input_files[0], single)
+        self.merge(parallelism=1)
+        sequential = [pq.read_table(path) for path in output_files]
+        shutil.rmtree(self.out_path)
+        self.merge(parallelism=2)
+        for path, table in zip(output_files, sequential):
+            self.assertTrue(pq.read_table(path).equals(table))
+        self.assertTrue(Path(self.out_path, 'prt/2019/10/02/7000/data/prt_7000_2019-10-02.parquet').is_symlink())
+
+    def test_parallel_merge_errors(self):
+        failing_output = self.add_key_group('6849', avro_schema=b'{}')
+        with self.assertRaises(SystemExit):
+            self.merge(parallelism=2)
+        self.assertTrue(self.output_file.exists())
+        self.assertFalse(failing_output.exists())
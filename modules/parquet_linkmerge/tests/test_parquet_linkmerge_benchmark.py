@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from parquet_linkmerge.parquet_file_merger import ParquetFileMerger
+from parquet_linkmerge.parquet_linkmerge_config import Config
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Benchmark skipped due to long process time.')
+class ParquetLinkMergeBenchmarkTest(unittest.TestCase):
+    """Time sequential and parallel merges of many small and a few large key groups."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.in_path = Path(self.temp_dir.name, 'in')
+        self.sites = ['CPER', 'GRSM', 'UNDE', 'WREF']
+        source_id = 1000
+        # many single-file keys (linked) and small two-site keys (merged)
+        for n in range(0, 200):
+            self.write_group(source_id, self.sites[:1], 1440)
+            source_id += 1
+        for n in range(0, 50):
+            self.write_group(source_id, self.sites[:2], 1440)
+            source_id += 1
+        # a few large multi-site keys
+        for n in range(0, 4):
+            self.write_group(source_id, self.sites, 864000)
+            source_id += 1
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_group(self, source_id: int, sites, row_count: int) -> None:
+        for site in sites:
+            path = Path(self.in_path, f'prt/2019/10/02/{source_id}/data/{site}_prt_{source_id}_2019-10-02.parquet')
+            path.parent.mkdir(parents=True, exist_ok=True)
+            table = pa.table({'readout_time': pa.array(range(0, row_count), pa.timestamp('ms')),
+                              'site_id': pa.array([site] * row_count),
+                              'resistance': pa.array([float(n % 100) for n in range(0, row_count)], pa.float32()),
+                              'source_id': pa.array([str(source_id)] * row_count)})
+            table = table.replace_schema_metadata({'parquet.avro.schema': '{"name": "prt"}',
+                                                   'writer.model.name': 'avro'})
+            pq.write_table(table, path)
+
+    def run_merge(self, parallelism: int) -> float:
+        out_path = Path(self.temp_dir.name, f'out{parallelism}')
+        offset = len(self.in_path.parts) - 1
+        config = Config(in_path=self.in_path, out_path=out_path, duplication_threshold=0.3,
+                        source_type_index=offset + 1, year_index=offset + 2, month_index=offset + 3,
+                        day_index=offset + 4, source_id_index=offset + 5, parallelism=parallelism)
+        start = time.perf_counter()
+        ParquetFileMerger(config).merge()
+        return time.perf_counter() - start
+
+    def test_benchmark(self):
+        sequential = self.run_merge(1)
+        parallel = self.run_merge(4)
+        print(f'\n254 key groups: sequential {sequential:.2f}s, 4 processes {parallel:.2f}s')
+        for path in Path(self.temp_dir.name, 'out1').rglob('*.parquet'):
+            parallel_path = Path(self.temp_dir.name, 'out4', path.relative_to(Path(self.temp_dir.name, 'out1')))
+            self.assertTrue(pq.read_table(parallel_path).equals(pq.read_table(path)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,8 +8,8 @@ from processed_datums_reader.writer import write_to_db
 from pathlib import Path
 
 
-def run(client: Client, db: Db, l1_pipelines_path: Path) -> None:
+def run(client: Client, db: Db, l1_pipelines_path: Path, workers: int = 8) -> None:
     """Read the error files and write the metadata to the database."""
-    files_by_pipeline = read_processed_files(client, l1_pipelines_path)
+    files_by_pipeline = read_processed_files(client, l1_pipelines_path, workers)
     with closing(db.connection):
         write_to_db(db, files_by_pipeline)
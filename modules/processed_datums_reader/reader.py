@@ -1,26 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from pachyderm_sdk import Client
 from pachyderm_sdk.api import pfs, pps
 from collections import defaultdict
 from pathlib import Path
 
 
-def read_processed_files(client: Client, l1_pipelines_path: Path) -> defaultdict[lambda: defaultdict[int]]:
+def read_processed_files(client: Client, l1_pipelines_path: Path,
+                         workers: int = 8) -> defaultdict[lambda: defaultdict[int]]:
+    """Count the processed groups by date for each pipeline listed in the file, reading pipelines concurrently."""
     files_by_pipeline = defaultdict(lambda: defaultdict(int))
     with open(l1_pipelines_path, 'r') as file:
-        # Read the content of the file
-        line = file.readline()
-        while line:
-            pipeline_name = line.strip()
-            pipeline_info = client.pps.inspect_pipeline(pipeline=pps.Pipeline(name=pipeline_name), details=True)
-            project_name = pipeline_info.pipeline.project.name
-            pipeline_commit_name = f'{project_name}/{pipeline_name}@master'
-
-            for processed_file in client.pfs.glob_file(commit=pfs.Commit.from_uri(pipeline_commit_name), pattern='/????/??/??/*'):
-                path = processed_file.file.path
-                path_parts = path.split('/')
-                pipeline_date_path = f'/{path_parts[1]}/{path_parts[2]}/{path_parts[3]}'
-                processed_date = f'{path_parts[1]}-{path_parts[2]}-{path_parts[3]}'
-                group_name = path_parts[4]
-                files_by_pipeline[pipeline_name][processed_date] += 1
-            line = file.readline()
+        pipeline_names = [line.strip() for line in file if line.strip()]
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        counts = executor.map(lambda pipeline_name: count_processed_files(client, pipeline_name), pipeline_names)
+        for pipeline_name, counts_by_date in zip(pipeline_names, counts):
+            for processed_date, count in counts_by_date.items():
+                files_by_pipeline[pipeline_name][processed_date] += count
     return files_by_pipeline
+
+
+def count_processed_files(client: Client, pipeline_name: str) -> dict[str, int]:
+    """Count the processed groups of a pipeline by date."""
+    counts_by_date = defaultdict(int)
+    pipeline_info = client.pps.inspect_pipeline(pipeline=pps.Pipeline(name=pipeline_name), details=True)
+    project_name = pipeline_info.pipeline.project.name
+    pipeline_commit_name = f'{project_name}/{pipeline_name}@master'
+
+    for processed_file in client.pfs.glob_file(commit=pfs.Commit.from_uri(pipeline_commit_name), pattern='/????/??/??/*'):
+        path = processed_file.file.path
+        path_parts = path.split('/')
+        processed_date = f'{path_parts[1]}-{path_parts[2]}-{path_parts[3]}'
+        counts_by_date[processed_date] += 1
+    return counts_by_date
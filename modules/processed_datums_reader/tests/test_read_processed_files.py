@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+import unittest
+
+from testfixtures import TempDirectory
+
+from errored_datums_reader.tests.fake_client import FakeClient
+from processed_datums_reader.reader import read_processed_files
+
+
+class ReadProcessedFilesTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = TempDirectory()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_read_processed_files(self) -> None:
+        files_by_pipeline = {f'dag{n}_level1': [f'/2024/01/{day % 3 + 1:02d}/group{day}' for day in range(n)]
+                             for n in range(8)}
+        pipelines_path = self.temp_dir.write('pipelines.txt', '\n'.join(files_by_pipeline).encode() + b'\n\n')
+        client = FakeClient(files_by_pipeline, latency=0.01)
+        result = read_processed_files(client, pipelines_path, workers=4)
+        self.assertEqual(8, len(client.patterns))
+        self.assertEqual({'2024-01-01': 3, '2024-01-02': 2, '2024-01-03': 2}, dict(result['dag7_level1']))
+        self.assertEqual({}, dict(result['dag0_level1']))
+        self.assertGreater(client.max_active, 1)
+        self.assertLessEqual(client.max_active, 4)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+import unittest
+from collections import defaultdict
+from datetime import date
+
+from data_access.tests.fake_connector import FakeConnector
+from processed_datums_reader.db_connector import Db
+from processed_datums_reader.writer import write_to_db
+
+
+class WriteProcessedDatumsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.existing = [('dag1_level1', date(2024, 1, 1), 5), ('dag1_level1', date(2024, 1, 2), 5),
+                         ('dag2_level1', date(2024, 1, 1), 3)]
+        self.connector = FakeConnector(lambda sql, parameters: self.existing if 'select' in sql else [])
+        self.db = Db(self.connector.get_connection(), 'pdr')
+
+    def test_write_changes(self) -> None:
+        files_by_pipeline = defaultdict(lambda: defaultdict(int))
+        files_by_pipeline['dag1_level1']['2024-01-01'] = 5
+        files_by_pipeline['dag1_level1']['2024-01-02'] = 7
+        files_by_pipeline['dag3_level1']['2024-01-03'] = 1
+        changes = write_to_db(self.db, files_by_pipeline)
+        self.assertEqual({('dag3_level1', date(2024, 1, 3))}, changes.inserted)
+        self.assertEqual({('dag1_level1', date(2024, 1, 2))}, changes.updated)
+        self.assertEqual({('dag2_level1', date(2024, 1, 1))}, changes.deleted)
+        # one select, delete, update and insert in a single transaction
+        queries = [sql for sql, parameters in self.connector.connection.queries]
+        self.assertEqual(4, len(queries))
+        self.assertIn('delete from pdr.processed_datums', queries[1])
+        self.assertIn('update pdr.processed_datums', queries[2])
+        self.assertIn('insert into pdr.processed_datums', queries[3])
+        self.assertEqual(1, self.connector.connection.commits)
+
+    def test_no_changes(self) -> None:
+        files_by_pipeline = defaultdict(lambda: defaultdict(int))
+        for pipeline_name, processed_date, count in self.existing:
+            files_by_pipeline[pipeline_name][processed_date.isoformat()] = count
+        changes = write_to_db(self.db, files_by_pipeline)
+        self.assertEqual(set(), changes.inserted | changes.updated | changes.deleted)
+        self.assertEqual(1, self.connector.query_count)
@@ -1,34 +1,88 @@
 from collections import defaultdict
 from contextlib import closing
-from datetime import datetime
+from datetime import date, datetime
+from typing import Dict, NamedTuple, Set, Tuple
+
+import structlog
+from psycopg2.extras import execute_values
+
 from processed_datums_reader.db_connector import Db
 
+log = structlog.get_logger()
 
-def write_to_db(db: Db, files_by_pipeline: defaultdict(lambda: defaultdict(int))) -> None:
-    sql = f'''
-        insert into {db.schema}.processed_datums 
-            (dag_name, pipeline_name, processed_date, processed_group_count) 
-        values 
-            (%(dag_name)s, %(pipeline_name)s, %(processed_date)s, %(processed_group_count)s) 
+
+class Changes(NamedTuple):
+    """The rows to insert, update and delete to bring the table up to date."""
+    inserted: Set[Tuple[str, date]]
+    updated: Set[Tuple[str, date]]
+    deleted: Set[Tuple[str, date]]
+
+
+def write_to_db(db: Db, files_by_pipeline: defaultdict(lambda: defaultdict(int)), page_size: int = 1000) -> Changes:
+    """
+    Update the processed datums table to the current group counts in one transaction, inserting
+    new dates, updating changed counts and deleting dates no longer present. Unchanged rows are
+    left in place.
+
+    :param db: The database.
+    :param files_by_pipeline: The processed group counts by date by pipeline name.
+    :param page_size: The number of rows per statement.
+    :return: The inserted, updated and deleted (pipeline name, processed date) rows.
+    """
+    insert_sql = f'''
+        insert into {db.schema}.processed_datums
+            (dag_name, pipeline_name, processed_date, processed_group_count)
+        values
+            %s
+    '''
+    update_sql = f'''
+        update {db.schema}.processed_datums
+        set processed_group_count = changed.processed_group_count
+        from (values %s) as changed (pipeline_name, processed_date, processed_group_count)
+        where
+            processed_datums.pipeline_name = changed.pipeline_name
+        and
+            processed_datums.processed_date = changed.processed_date
+    '''
+    delete_sql = f'''
+        delete from {db.schema}.processed_datums
+        using (values %s) as removed (pipeline_name, processed_date)
+        where
+            processed_datums.pipeline_name = removed.pipeline_name
+        and
+            processed_datums.processed_date = removed.processed_date
     '''
-    clear_existing_records(db=db)
+    current: Dict[Tuple[str, date], int] = {}
+    for pipeline_name, counts_by_date in files_by_pipeline.items():
+        for processed_date, file_count in counts_by_date.items():
+            current[(pipeline_name, datetime.strptime(processed_date, '%Y-%m-%d').date())] = file_count
     with closing(db.connection.cursor()) as cursor:
-        for pipeline_name, processed_date in files_by_pipeline.items():
-            dag_name = pipeline_name.split('_')[0]
-            for processed_date, file_count in processed_date.items():
-                date_object = datetime.strptime(processed_date, '%Y-%m-%d').date()
-                params = dict(dag_name=dag_name, pipeline_name=pipeline_name, processed_date=date_object,
-                              processed_group_count=file_count)
+        try:
+            existing = read_existing_records(db, cursor)
+            changes = Changes(inserted=current.keys() - existing.keys(),
+                              updated={key for key in current.keys() & existing.keys() if current[key] != existing[key]},
+                              deleted=existing.keys() - current.keys())
+            if changes.deleted:
+                execute_values(cursor, delete_sql, sorted(changes.deleted), page_size=page_size)
+            if changes.updated:
+                rows = [key + (current[key],) for key in sorted(changes.updated)]
+                execute_values(cursor, update_sql, rows, page_size=page_size)
+            if changes.inserted:
+                rows = [(pipeline_name.split('_')[0], pipeline_name, processed_date, current[(pipeline_name, processed_date)])
+                        for pipeline_name, processed_date in sorted(changes.inserted)]
+                execute_values(cursor, insert_sql, rows, page_size=page_size)
+            db.connection.commit()
+        except Exception:
+            db.connection.rollback()
+            raise
+    log.info('Updated processed datums', inserted=len(changes.inserted), updated=len(changes.updated),
+             deleted=len(changes.deleted))
+    return changes
 
-                cursor.execute(sql, params)
-        db.connection.commit()
 
-
-# def clear_existing_records(db: Db, dag_name: str, pipeline_name: str, processed_date: str) -> None:
-def clear_existing_records(db: Db) -> None:
+def read_existing_records(db: Db, cursor) -> Dict[Tuple[str, date], int]:
     sql = f'''
-        delete from {db.schema}.processed_datums 
+        select pipeline_name, processed_date, processed_group_count from {db.schema}.processed_datums
     '''
-    with closing(db.connection.cursor()) as cursor:
-        cursor.execute(sql)
-        db.connection.commit()
+    cursor.execute(sql)
+    return {(pipeline_name, processed_date): count for pipeline_name, processed_date, count in cursor.fetchall()}
@@ -19,13 +19,14 @@ def main() -> None:
     egress_url: str = env.str('EGRESS_URL')
     prod: str = env.str('PROD', default="false").lower()
     staging: str = env.str('STAGING', default="true").lower()
+    workers: int = env.int('PACKAGE_WORKERS', 1)
     log_config.configure(log_level)
     log = get_logger()
     log.debug(f'data_dir: {data_path}')
     log.debug(f'out_dir: {out_path}')
 
     egress = Pub_egress(data_path, starting_path_index, out_path, out_path_mdp, out_mdp_sites, err_path,
-                        egress_url, prod, staging)
+                        egress_url, prod, staging, workers=workers)
     egress.upload()
 
 
@@ -49,6 +49,32 @@ class PubEgressTest(TestCase):
         egress.upload()
         self.check_output()
 
+    def test_egress_mdp(self):
+        # an MDP site publishing its private files alongside the public site
+        mdp_dir = Path(self.input_root, 'MD03/2019/01')
+        os.makedirs(mdp_dir)
+        mdp_file_name = self.source_file_name.replace('CPER', 'MD03')
+        with open(Path(mdp_dir, mdp_file_name), 'w') as f:
+            f.write('file 2 content')
+        with open(Path(mdp_dir, self.manifest_file), 'w') as f:
+            f.write('file,hasData,visibility,size,checksum\n')
+            f.write(f'{mdp_file_name},True,private,94064,9964c27c73a86313a24f573f59fc2d52')
+        mdp_sites = Path(self.temp_dir_name, 'mdp_sites.txt')
+        with open(mdp_sites, 'w') as f:
+            f.write('# site prod staging path\nMD03 false true mdp/md03\n')
+        egress = Pub_egress(self.input_dir, self.starting_path_index, self.out_dir, self.out_dir_mdp, mdp_sites,
+                            self.err_dir, 'https://egress/url', 'false', 'true', workers=2)
+        egress.upload()
+        self.check_output()
+        mdp_manifest = Path(self.out_dir_mdp, self.target_manifest_name.replace('CPER', 'MD03'))
+        self.assertTrue(Path(self.out_dir_mdp, self.target_file_name.replace('CPER', 'MD03')).exists())
+        with open(mdp_manifest) as f:
+            lines = f.read().splitlines()
+        self.assertEqual('file,hasData,visibility,size,checksum,objectId', lines[0])
+        self.assertTrue(lines[1].endswith(',https://egress/mdp/md03/' + self.target_file_name.replace('CPER', 'MD03')))
+        with open(Path(self.out_dir, self.target_manifest_name)) as f:
+            self.assertTrue(f.read().splitlines()[1].endswith(',https://egress/url/' + self.target_file_name))
+
     def check_output(self):
         """Check data files are in the output directory."""
         output_path = Path(self.out_dir, self.target_file_name)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Tuple
+
+import pandas as pd
+
+# fields pd.read_csv reads as missing by default, which to_csv writes back as empty
+NA_VALUES = ('#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>',
+             'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null')
+NA_FIELD = re.compile(b'(^|,)(?:' + b'|'.join(re.escape(value.encode()) for value in NA_VALUES)
+                      + b')(?=,|$)', re.MULTILINE)
+LINE_TERMINATOR = os.linesep.encode()
+
+
+class CsvConcatenator:
+    """
+    Concatenate CSV files into one file, writing the header of the first file only. The size
+    and MD5 checksum of the output are computed as it is written.
+
+    The output is identical to reading each file with pd.read_csv(dtype='str') and appending it
+    with to_csv(index=False). Files are copied byte for byte when that round trip would not change
+    them, with missing value markers such as 'nan' emptied as pandas empties them. Files needing more
+    (quoted values, ragged rows, unusual headers) are passed through pandas.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.file = None
+        self.size = 0
+        self.md5 = hashlib.md5()
+
+    def __enter__(self) -> 'CsvConcatenator':
+        return self
+
+    def __exit__(self, *args) -> None:
+        if self.file is not None:
+            self.file.close()
+
+    def add(self, path: Path) -> None:
+        """
+        Append a CSV file. Nothing is written if the file cannot be read.
+
+        :param path: The file.
+        """
+        (header, body) = read_csv_file(path)
+        if self.file is None:
+            self.file = open(self.path, 'wb')
+            self.write(header)
+        self.write(body)
+
+    def write(self, data: bytes) -> None:
+        self.file.write(data)
+        self.size += len(data)
+        self.md5.update(data)
+
+    @property
+    def checksum(self) -> str:
+        return self.md5.hexdigest()
+
+
+def read_csv_file(path: Path) -> Tuple[bytes, bytes]:
+    """
+    Read a CSV file as the header and body bytes to_csv would write after a pd.read_csv(dtype='str').
+
+    :param path: The file.
+    :return: The header and the body.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if is_plain(data):
+        header_end = data.find(b'\n')
+        if header_end < 0:
+            return data + LINE_TERMINATOR, b''
+        body = NA_FIELD.sub(rb'\1', data[header_end + 1:])
+        if body and not body.endswith(b'\n'):
+            body += LINE_TERMINATOR
+        return data[:header_end + 1], body
+    data = pd.read_csv(path, dtype='str')
+    header = data.iloc[:0].to_csv(index=False).encode()
+    body = data.to_csv(index=False, header=False).encode()
+    return header, body
+
+
+def is_plain(data: bytes) -> bool:
+    """Return true if the pandas round trip changes no more than the missing values in the file."""
+    if LINE_TERMINATOR != b'\n' or b'"' in data or b'\r' in data or data.startswith(b'\xef\xbb\xbf'):
+        return False
+    try:
+        data.decode('utf-8')
+    except UnicodeDecodeError:
+        return False
+    lines = data.split(b'\n')
+    if lines[-1] == b'':
+        lines.pop()
+    if not lines:
+        return False
+    names = lines[0].split(b',')
+    # a single column, blank, duplicate or missing names are rewritten by pandas
+    if len(names) < 2 or b'' in names or len(set(names)) != len(names) or NA_FIELD.search(lines[0]):
+        return False
+    return all(line.count(b',') == len(names) - 1 for line in lines)
@@ -4,18 +4,22 @@ import sys
 import pandas as pd
 from sortedcontainers import SortedSet
 import datetime
+import time
+from concurrent.futures import ProcessPoolExecutor
 import hashlib
 import csv
 from pathlib import Path
-from typing import List,Iterator,Tuple
+from typing import Dict,List,Iterator,Tuple
 
 from structlog import get_logger
 from common.err_datum import err_datum_path
+from common.path_linker import walk_files
+from pub_packager.csv_concatenator import CsvConcatenator
 
 log = get_logger()
 
 
-def pub_package(*, data_path, out_path, err_path, product_index: int, publoc_index: int, date_index: int, date_index_length: int, sort_index: int) -> None:
+def pub_package(*, data_path, out_path, err_path, product_index: int, publoc_index: int, date_index: int, date_index_length: int, sort_index: int, parallelism: int = 1) -> None:
     """
     Bundles the required files into a package suitable for publication.
 
@@ -27,92 +31,141 @@ def pub_package(*, data_path, out_path, err_path, product_index: int, publoc_ind
     :param date_index: start input path index of publication date field (e.g. index of the year in the path)
     :param date_index_length: number of input path indices forming the pub date field. e.g. for monthly pub, this will be 2 (year-month)
     :param sort_index: index of filename field to sort on (e.g. the day)
+    :param parallelism: the number of processes packaging publocs
     """
 
     # Each PUBLOC at the glob level is a datum (e.g. /product/year/month/*/PUBLOC). Get all the PUBLOCS, assuming
-    # there is a manifest.csv embedded directly under each PUBLOC directory
+    # there is a manifest.csv embedded directly under each PUBLOC directory. The tree is walked once.
+    files_by_publoc = index_publocs(data_path, publoc_index)
+    options = dict(data_path=data_path, out_path=out_path, err_path=err_path, product_index=product_index,
+                   publoc_index=publoc_index, date_index=date_index, date_index_length=date_index_length,
+                   sort_index=sort_index)
+    if parallelism > 1 and len(files_by_publoc) > 1:
+        with ProcessPoolExecutor(max_workers=parallelism) as executor:
+            futures = [executor.submit(package_publoc, publoc, files, **options)
+                       for publoc, files in files_by_publoc.items()]
+            for future in futures:
+                future.result()
+    else:
+        for publoc, files in files_by_publoc.items():
+            package_publoc(publoc, files, **options)
+
+
+def index_publocs(data_path: Path, publoc_index: int) -> Dict[str, List[Path]]:
+    """
+    Index the files under each publoc with a manifest in a single walk of the data path.
+
+    :param data_path: The input data path.
+    :param publoc_index: input path index of the pub package location
+    :return: The files two directories below each publoc directory, by publoc.
+    """
+    files_by_publoc = {}
     publocs = set()
-    # DirErrBase: the user specified error directory, i.e., /tmp/out/errored
-    DirErrBase = Path(err_path)
-    publoc_date = 0
-    for path in data_path.rglob('manifest.csv'):
+    for path in walk_files(data_path):
         parts = path.parts
+        if len(parts) <= publoc_index:
+            continue
         publoc = parts[publoc_index]
-        publoc_date = parts[publoc_index-1]
-        publocs.add(publoc)
+        if path.name == 'manifest.csv':
+            publocs.add(publoc)
+        if len(parts) == publoc_index + 3:
+            files_by_publoc.setdefault(publoc, []).append(path)
+    return {publoc: files_by_publoc.get(publoc, []) for publoc in sorted(publocs)}
+
 
+def package_publoc(publoc: str, files: List[Path], *, data_path, out_path, err_path, product_index: int,
+                   publoc_index: int, date_index: int, date_index_length: int, sort_index: int) -> None:
+    """Bundle the files of one publoc into packages, routing errors to the error directory."""
+    # DirErrBase: the user specified error directory, i.e., /tmp/out/errored
+    DirErrBase = Path(err_path)
     dataDir_routed = Path(data_path)
-    for publoc in publocs:
-        log.debug(f'Processing datum {data_path} and {publoc}')
-
-        package_files = {}  # the set of files to be collated into each package file
-        has_data_by_file = {}  # has_data by package file
-        package_path_by_file = {}  # package path by package file
-        visibility_by_file = {} # visibility by package file
-
-        # processing timestamp
-        timestamp = datetime.datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
-        # get the package path prefix and date field
-        for path in data_path.rglob(publoc+'/*/*'):
-            if path.is_file():
-                # Get one full path
-                break
-        (path_prefix, date_field) = get_package_prefix(path, product_index, publoc_index, date_index, date_index_length)
-        for path in data_path.rglob(publoc+'/*/*'):
-            try:
-                if path.is_file():
-                    file = os.path.basename(path)
-                    log.debug(f'{file}')
-                    dataDir_routed = Path(path).parent
-                    if 'manifest' in file:
-                        parse_manifest(path, has_data_by_file, visibility_by_file, sort_index, date_field, timestamp)
-                        continue
-                    # get the package filename
-                    package_file = get_package_filename(file, sort_index, date_field, timestamp)
-                    if package_file in package_files.keys():
-                        package_files[package_file].add(path)
-                    else:
-                        package_files[package_file] = SortedSet({path})
-            except:
-                log.debug('.... Errored executing parse_manifest or getting the package filename  ...')
-                err_msg = sys.exc_info()
-                err_datum_path(err=err_msg, DirDatm=str(dataDir_routed), DirErrBase=DirErrBase,
-                           RmvDatmOut=True, DirOutBase=out_path)
+    start = time.perf_counter()
+    try:
+        write_publoc_packages(publoc, files, data_path, out_path, DirErrBase, product_index, publoc_index,
+                              date_index, date_index_length, sort_index)
+    except:
+        log.debug(f'.... Errored packaging {publoc} ...')
+        err_msg = sys.exc_info()
+        if files:
+            dataDir_routed = get_publoc_path(files[0], publoc_index)
+        err_datum_path(err=err_msg, DirDatm=str(dataDir_routed), DirErrBase=DirErrBase,
+                       RmvDatmOut=True, DirOutBase=out_path)
+    log.info(f'Packaged {publoc} in {time.perf_counter() - start:.3f}s', files=len(files))
+
+
+def write_publoc_packages(publoc: str, files: List[Path], data_path, out_path, DirErrBase: Path,
+                          product_index: int, publoc_index: int, date_index: int, date_index_length: int,
+                          sort_index: int) -> None:
+    """Write the package files and manifest of one publoc, routing errored files to the error directory."""
+    dataDir_routed = Path(data_path)
+    log.debug(f'Processing datum {data_path} and {publoc}')
+
+    package_files = {}  # the set of files to be collated into each package file
+    has_data_by_file = {}  # has_data by package file
+    package_path_by_file = {}  # package path by package file
+    visibility_by_file = {} # visibility by package file
+
+    # processing timestamp
+    timestamp = datetime.datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+    # get the package path prefix and date field
+    path = files[0]
+    (path_prefix, date_field) = get_package_prefix(path, product_index, publoc_index, date_index, date_index_length)
+    for path in files:
+        try:
+            file = os.path.basename(path)
+            log.debug(f'{file}')
+            dataDir_routed = Path(path).parent
+            if 'manifest' in file:
+                parse_manifest(path, has_data_by_file, visibility_by_file, sort_index, date_field, timestamp)
                 continue
+            # get the package filename
+            package_file = get_package_filename(file, sort_index, date_field, timestamp)
+            if package_file in package_files.keys():
+                package_files[package_file].add(path)
+            else:
+                package_files[package_file] = SortedSet({path})
+        except:
+            log.debug('.... Errored executing parse_manifest or getting the package filename  ...')
+            err_msg = sys.exc_info()
+            err_datum_path(err=err_msg, DirDatm=str(dataDir_routed), DirErrBase=DirErrBase,
+                       RmvDatmOut=True, DirOutBase=out_path)
+            continue
 
-        for package_file in package_files.keys():
-            output_file = os.path.join(out_path, path_prefix, package_file)
-            package_path_by_file[package_file] = output_file
-            os.makedirs(os.path.join(out_path, path_prefix), exist_ok=True)
-            is_first_file = True
+    checksum_by_file = {}  # size and checksum by package file, computed while writing
+    for package_file in package_files.keys():
+        output_file = os.path.join(out_path, path_prefix, package_file)
+        package_path_by_file[package_file] = output_file
+        os.makedirs(os.path.join(out_path, path_prefix), exist_ok=True)
+        is_complete = True
+        with CsvConcatenator(output_file) as concatenator:
             for file in package_files[package_file]:
                 dataDir_routed = Path(file).parent
                 try:
-                    data = pd.read_csv(file,dtype='str') # dtype='str' Preserves formatting applied in transformer module
-                    mode = 'a'
-                    write_header = False
-                    if is_first_file:
-                        mode = 'w'
-                        write_header = True
-                        is_first_file = False
-                    data.to_csv(output_file, mode=mode, header=write_header, index=False)
+                    concatenator.add(file)
                     log.debug(f'Wrote data file {output_file}')
                 except:
                     log.debug('.... Errored writing output_file ...')
                     err_msg = sys.exc_info()
                     err_datum_path(err=err_msg, DirDatm=str(dataDir_routed), DirErrBase=DirErrBase,
                            RmvDatmOut=True, DirOutBase=out_path)
+                    is_complete = False
                     continue
-        try:
-            write_manifest(out_path,path_prefix,has_data_by_file,visibility_by_file,package_path_by_file)
-        except:
-            log.debug('.... Errored executing write_manifest ...')
-            err_msg = sys.exc_info()
-            dataDir_routed = data_path
-            log.debug('.... Error executing write_manifest...')
-            err_datum_path(err=err_msg, DirDatm=str(dataDir_routed), DirErrBase=DirErrBase,
-                           RmvDatmOut=True, DirOutBase=out_path)
-            continue
+        # packages with errored files are checked on disk
+        if is_complete and concatenator.file is not None:
+            checksum_by_file[package_file] = (concatenator.size, concatenator.checksum)
+    try:
+        write_manifest(out_path,path_prefix,has_data_by_file,visibility_by_file,package_path_by_file,checksum_by_file)
+    except:
+        log.debug('.... Errored executing write_manifest ...')
+        err_msg = sys.exc_info()
+        dataDir_routed = get_publoc_path(files[0], publoc_index)
+        log.debug('.... Error executing write_manifest...')
+        err_datum_path(err=err_msg, DirDatm=str(dataDir_routed), DirErrBase=DirErrBase,
+                       RmvDatmOut=True, DirOutBase=out_path)
+
+
+def get_publoc_path(path: Path, publoc_index: int) -> Path:
+    return Path(*path.parts[:publoc_index + 1])
 
 
 def get_package_filename(file, sort_index, date_field, timestamp):
@@ -130,7 +183,9 @@ def get_package_prefix(data_path, product_index, publoc_index, date_index, date_
     return path_prefix, date_field
 
 
-def write_manifest(out_path, path_prefix, has_data_by_file, visibility_by_file, package_path_by_file):
+def write_manifest(out_path, path_prefix, has_data_by_file, visibility_by_file, package_path_by_file, checksum_by_file=None):
+    """Write the package manifest. Sizes and checksums not in checksum_by_file are read from the package files."""
+    checksum_by_file = checksum_by_file or {}
     manifest_filepath = os.path.join(out_path, path_prefix, 'manifest.csv')
     with open(manifest_filepath, 'w') as manifest_csv:
         writer = csv.writer(manifest_csv)
@@ -138,16 +193,23 @@ def write_manifest(out_path, path_prefix, has_data_by_file, visibility_by_file,
         for key in has_data_by_file.keys():
             # get file size and checksum
             package_path = package_path_by_file[key]
-            file_size = os.stat(package_path).st_size
-            md5_hash = hashlib.md5()
-            with open(package_path, "rb") as f:
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    md5_hash.update(byte_block)
-            checksum = md5_hash.hexdigest()
+            if key in checksum_by_file:
+                (file_size, checksum) = checksum_by_file[key]
+            else:
+                (file_size, checksum) = get_checksum(package_path)
             writer.writerow([key, has_data_by_file[key], visibility_by_file[key], file_size, checksum])
     log.debug(f'Wrote manifest {manifest_filepath}')
 
 
+def get_checksum(package_path):
+    file_size = os.stat(package_path).st_size
+    md5_hash = hashlib.md5()
+    with open(package_path, "rb") as f:
+        for byte_block in iter(lambda: f.read(4096), b""):
+            md5_hash.update(byte_block)
+    return file_size, md5_hash.hexdigest()
+
+
 def parse_manifest(manifest_file, has_data_by_file, visibility_by_file, sort_index, date_field, timestamp):
     manifest_hasData = pd.read_csv(manifest_file, header=0, index_col=0,usecols=['file','hasData'])
     manifest_hasData = manifest_hasData.squeeze("columns").to_dict()
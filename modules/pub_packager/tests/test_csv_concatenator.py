@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import hashlib
+from pathlib import Path
+from unittest import TestCase
+
+import pandas as pd
+from testfixtures import TempDirectory
+
+from pub_packager.csv_concatenator import CsvConcatenator, NA_VALUES, is_plain
+
+
+class CsvConcatenatorTest(TestCase):
+
+    def setUp(self):
+        self.temp_dir = TempDirectory()
+        self.contents = [
+            'startDateTime,endDateTime,mean,remarks\n'
+            '2019-05-24T00:00:00Z,2019-05-24T00:01:00Z,27.32,\n'
+            '2019-05-24T00:01:00Z,2019-05-24T00:02:00Z,nan,NA\n',
+            # no trailing newline
+            'startDateTime,endDateTime,mean,remarks\n'
+            '2019-05-25T00:00:00Z,2019-05-25T00:01:00Z,1e-05,ok',
+            # quoted values and a blank line
+            'startDateTime,endDateTime,mean,remarks\n'
+            '2019-05-26T00:00:00Z,2019-05-26T00:01:00Z,"3.5","a, b"\n\n'
+            '2019-05-26T00:01:00Z,2019-05-26T00:02:00Z,None,"say ""hi"""\n',
+            # ragged rows
+            'startDateTime,endDateTime,mean,remarks\n'
+            '2019-05-27T00:00:00Z,2019-05-27T00:01:00Z\n',
+            # header only
+            'startDateTime,endDateTime,mean,remarks\n']
+        self.paths = []
+        for index, content in enumerate(self.contents):
+            path = Path(self.temp_dir.path, f'{index}.csv')
+            path.write_text(content)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_na_values(self):
+        # the byte copy empties exactly the fields pandas reads as missing
+        near_misses = ['Nan', 'NAN', 'none', 'NONE', 'Null', 'na', '-NAN', 'N/a', '#n/a', 'nil', '.']
+        for value in list(NA_VALUES) + near_misses:
+            path = Path(self.temp_dir.path, 'na.csv')
+            path.write_text(f'name,value\nx,{value}\n')
+            body = pd.read_csv(path, dtype='str').to_csv(index=False, header=False)
+            expected = 'x,\n' if value in NA_VALUES else f'x,{value}\n'
+            self.assertEqual(expected, body, value)
+
+    def test_is_plain(self):
+        self.assertEqual([True, True, False, False, True], [is_plain(path.read_bytes()) for path in self.paths])
+        self.assertFalse(is_plain(b'a,a\n1,2\n'))
+        self.assertFalse(is_plain(b'value\n1\n'))
+        self.assertFalse(is_plain(b'a,nan\n1,2\n'))
+
+    def test_add(self):
+        expected_path = Path(self.temp_dir.path, 'expected.csv')
+        output_path = Path(self.temp_dir.path, 'output.csv')
+        for paths in [self.paths, list(reversed(self.paths))]:
+            for index, path in enumerate(paths):
+                data = pd.read_csv(path, dtype='str')
+                data.to_csv(expected_path, mode='w' if index == 0 else 'a', header=index == 0, index=False)
+            with CsvConcatenator(output_path) as concatenator:
+                for path in paths:
+                    concatenator.add(path)
+            output = output_path.read_bytes()
+            self.assertEqual(expected_path.read_bytes(), output)
+            self.assertEqual(len(output), concatenator.size)
+            self.assertEqual(hashlib.md5(output).hexdigest(), concatenator.checksum)
+
+    def test_add_error(self):
+        empty_path = Path(self.temp_dir.path, 'empty.csv')
+        empty_path.write_text('')
+        output_path = Path(self.temp_dir.path, 'output.csv')
+        with CsvConcatenator(output_path) as concatenator:
+            with self.assertRaises(pd.errors.EmptyDataError):
+                concatenator.add(empty_path)
+            concatenator.add(self.paths[1])
+        self.assertEqual(self.contents[1] + '\n', output_path.read_text())
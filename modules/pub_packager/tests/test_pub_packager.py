@@ -4,7 +4,7 @@ import glob
 import sys
 from pathlib import Path
 from unittest import TestCase
-from pub_packager.pub_packager import pub_package
+from pub_packager.pub_packager import pub_package, index_publocs
 import pub_packager.pub_packager_main as pub_packager_main
 from testfixtures import TempDirectory
 from sortedcontainers import SortedList
@@ -66,6 +66,29 @@ class PubPackagerTest(TestCase):
                 sort_index=self.sort_index)
         self.check_output()
 
+    def test_package_parallel(self):
+        # a second site to package alongside the first
+        site_path = Path(self.data_path, 'ONAQ')
+        for path in [self.data_file_1, self.data_file_2, self.manifest_file_1, self.manifest_file_2]:
+            onaq_path = Path(site_path, path.parent.name, path.name.replace('CPER', 'ONAQ'))
+            os.makedirs(onaq_path.parent, exist_ok=True)
+            onaq_path.write_text(path.read_text().replace('CPER', 'ONAQ'))
+        files_by_publoc = index_publocs(self.data_path, self.publoc_index)
+        self.assertEqual(['CPER', 'ONAQ'], list(files_by_publoc.keys()))
+        self.assertEqual(4, len(files_by_publoc['ONAQ']))
+        pub_package(data_path=self.data_path,
+                out_path=self.out_path,
+                err_path=self.err_path,
+                product_index=self.product_index,
+                publoc_index=self.publoc_index,
+                date_index=self.date_index,
+                date_index_length=self.date_index_length,
+                sort_index=self.sort_index,
+                parallelism=2)
+        self.check_output()
+        onaq_files = glob.glob(str(Path(self.out_path, 'DP1.00066.001/ONAQ/2019/05/*.csv')))
+        self.assertEqual(2, len(onaq_files))
+
     def test_main(self):
         os.environ['DATA_PATH'] = str(self.data_path)
         os.environ['OUT_PATH'] = str(self.out_path)
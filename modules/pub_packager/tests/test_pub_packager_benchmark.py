@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import common.log_config as log_config
+from pub_packager.pub_packager import pub_package
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Benchmark skipped due to long process time.')
+class PubPackagerBenchmarkTest(unittest.TestCase):
+    """Time packaging a month of daily one minute files for four locations at each of four sites."""
+
+    def setUp(self):
+        log_config.configure('INFO')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_path = Path(self.temp_dir.name, 'repo/inputs/DP1.00066.001/2019/05')
+        self.out_path = Path(self.temp_dir.name, 'outputs')
+        self.err_path = Path(self.temp_dir.name, 'errored')
+        rng = np.random.default_rng(0)
+        self.sites = ['BART', 'CPER', 'HARV', 'ONAQ']
+        for site, day in [(site, day) for site in self.sites for day in range(1, 32)]:
+            path = Path(self.data_path, site, f'{day:02d}')
+            path.mkdir(parents=True)
+            files = []
+            for location in ['001.000', '002.000', '003.000', '004.000']:
+                filename = f'NEON.D10.{site}.DP1.00066.001.{location}.001.ST_1_minute.2019-05-{day:02d}.basic.csv'
+                times = pd.date_range(f'2019-05-{day:02d}', periods=1440, freq='min')
+                data = pd.DataFrame({name: rng.normal(0, 100, 1440).round(3).astype(str)
+                                     for name in ['mean', 'minimum', 'maximum', 'variance', 'stdEr']})
+                data.loc[rng.random(1440) < 0.05, 'mean'] = 'nan'
+                data.insert(0, 'endDateTime', (times + pd.Timedelta(minutes=1)).strftime('%Y-%m-%dT%H:%M:%SZ'))
+                data.insert(0, 'startDateTime', times.strftime('%Y-%m-%dT%H:%M:%SZ'))
+                data['finalQF'] = '0'
+                data.to_csv(Path(path, filename), index=False)
+                files.append(filename)
+            with open(Path(path, 'manifest.csv'), 'w') as file:
+                file.write('file,hasData,visibility\n')
+                file.writelines(f'{filename},True,public\n' for filename in files)
+        parts = Path(self.data_path, 'CPER', '01', 'file').parts
+        self.product_index = parts.index('DP1.00066.001')
+        self.publoc_index = parts.index('CPER')
+        self.date_index = parts.index('2019')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_package(self):
+        for parallelism in [1, 4]:
+            out_path = Path(self.out_path, str(parallelism))
+            start = time.perf_counter()
+            pub_package(data_path=self.data_path,
+                        out_path=out_path,
+                        err_path=self.err_path,
+                        product_index=self.product_index,
+                        publoc_index=self.publoc_index,
+                        date_index=self.date_index,
+                        date_index_length=2,
+                        sort_index=10,
+                        parallelism=parallelism)
+            elapsed = time.perf_counter() - start
+            for site in self.sites:
+                output_path = Path(out_path, 'DP1.00066.001', site, '2019/05')
+                manifest = pd.read_csv(Path(output_path, 'manifest.csv'))
+                self.assertEqual(4, len(manifest))
+                for row in manifest.itertuples():
+                    content = Path(output_path, row.file).read_bytes()
+                    self.assertEqual(row.size, len(content))
+                    self.assertEqual(row.checksum, hashlib.md5(content).hexdigest())
+            print(f'\n{len(self.sites) * 124} daily files with {parallelism} processes: {elapsed:.2f}s')
+
+
+if __name__ == '__main__':
+    unittest.main()
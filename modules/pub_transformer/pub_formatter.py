@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+import csv
+import io
+import math
+import os
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas import Series
+
+# largest power of ten exactly representable as a float64
+MAX_EXACT_POWER = 22
+# largest magnitude at which every integer is exactly representable as a float64
+MAX_EXACT_INTEGER = 2.0 ** 52
+
+
+def format_sig(element, n_digits):
+    """Format a number to n_digits significant figures and at most 7 decimal places."""
+    if pd.isna(element) or element == 0:
+        rounded = element
+    else:
+        rounded = round(element, -int(math.floor(math.log10(abs(element))-(n_digits-1))))
+    # Format as decimal
+    formatted = ("%.16f" % rounded).rstrip('0').rstrip('.')
+    # Retain at most 7 decimal places
+    if '.' in formatted:
+        n_decimal = len(formatted.split('.')[1])
+        if n_decimal > 7:
+            formatted = "{:.7f}".format(rounded)
+    else:
+        formatted = str(rounded)
+    return formatted
+
+
+def format_signif(values: Series, n_digits: int) -> np.ndarray:
+    """
+    Format values to n_digits significant figures and at most 7 decimal places, as format_sig does
+    element by element. Rounding is done with exact float64 arithmetic; values it cannot settle
+    exactly (near rounding ties, very large or small magnitudes) are passed to format_sig.
+
+    :param values: The values.
+    :param n_digits: The number of significant digits.
+    :return: The formatted values.
+    """
+    if values.dtype.kind != 'f':
+        return np.array([format_sig(element, n_digits) for element in values], dtype=object)
+    x = values.to_numpy(dtype=np.float64)
+    result = np.empty(len(x), dtype=object)
+    result[np.isnan(x)] = 'nan'
+    result[(x == 0) & ~np.signbit(x)] = '0.0'
+    result[(x == 0) & np.signbit(x)] = '-0.0'
+    ax = np.abs(x)
+    candidates = np.flatnonzero((ax >= 1e-200) & (ax < 1e15))
+    fallback = [np.flatnonzero(np.isinf(x) | ((ax > 0) & (ax < 1e-200)) | (ax >= 1e15) & np.isfinite(x))]
+    # decimal places to round to, as format_sig computes them
+    log = np.log10(ax[candidates])
+    k = (n_digits - 1) - np.floor(log)
+    near_integer = np.abs(log - np.rint(log)) < 1e-9
+    k[near_integer] = [-math.floor(math.log10(value) - (n_digits - 1)) for value in ax[candidates[near_integer]]]
+    k = k.astype(np.int64)
+    usable = np.abs(k) <= MAX_EXACT_POWER
+    fallback.append(candidates[~usable])
+    candidates, k = candidates[usable], k[usable]
+    # round to k decimal places: exact unless the scaled value lies near a tie
+    scale = 10.0 ** np.abs(k)
+    scaled = np.where(k >= 0, ax[candidates] * scale, ax[candidates] / scale)
+    fraction = scaled - np.floor(scaled)
+    usable = (np.abs(fraction - 0.5) > 4 * np.spacing(scaled)) & (scaled < MAX_EXACT_INTEGER)
+    digits = np.rint(scaled).astype(np.int64)
+    usable &= digits != 0
+    fallback.append(candidates[~usable])
+    candidates, k, digits, scale = candidates[usable], k[usable], digits[usable], scale[usable]
+    rounded = np.where(k >= 0, digits / scale, digits * scale)
+    # drop trailing zero digits
+    for _ in range(MAX_EXACT_POWER):
+        trailing = (k > 0) & (digits % 10 == 0)
+        if not trailing.any():
+            break
+        digits[trailing] //= 10
+        k[trailing] -= 1
+    sign = np.where(np.signbit(x[candidates]), '-', '')
+    # whole numbers format as their repr
+    whole = (k <= 0) & (rounded < 1e16)
+    result[candidates[whole]] = _join(sign[whole], _to_strings(rounded[whole].astype(np.int64)), '.0')
+    fallback.append(candidates[(k <= 0) & ~whole])
+    # fractions: rounded must resolve the last digit for the string forms below to hold
+    fractional = (k > 0) & (k <= 16)
+    fallback.append(candidates[(k > 16)])
+    power = 10.0 ** np.where(fractional, k, 0)
+    fractional &= np.spacing(rounded) * power < 0.1
+    fallback.append(candidates[(k > 0) & (k <= 16) & ~fractional])
+    candidates, k, digits, rounded, power, sign = (
+        candidates[fractional], k[fractional], digits[fractional], rounded[fractional], power[fractional],
+        sign[fractional])
+    # exact rounded * 10^k - digits, telling whether "%.16f" shows digits / 10^k exactly
+    product = rounded * power
+    residual = (product - digits) + _product_error(rounded, power, product)
+    threshold = 0.5 * 10.0 ** (k - 16)
+    usable = np.abs(np.abs(residual) - threshold) > 0.01 * threshold
+    fallback.append(candidates[~usable])
+    exact = usable & (np.abs(residual) < threshold) & (k <= 7)
+    result[candidates[exact]] = _format_decimal(sign[exact], digits[exact], k[exact])
+    # otherwise "{:.7f}" of rounded, settling decimal ties beyond the 7th place with the residual
+    seven = usable & ~exact
+    digits, k, residual = digits[seven], k[seven], residual[seven]
+    shift = np.maximum(k - 7, 0)
+    divisor = 10 ** shift
+    quotient, remainder = np.divmod(digits, divisor)
+    half = divisor // 2
+    up = (shift > 0) & ((remainder > half) | ((remainder == half) &
+                                              ((residual > 0) | ((residual == 0) & (quotient % 2 == 1)))))
+    quotient = (quotient + up) * 10 ** np.maximum(7 - k, 0)
+    result[candidates[seven]] = _format_decimal(sign[seven], quotient, np.full(len(quotient), 7))
+    for index in np.concatenate(fallback):
+        result[index] = format_sig(float(x[index]), n_digits)
+    return result
+
+
+def format_fixed(values: Series, n_decimals: int) -> np.ndarray:
+    """
+    Format values with a fixed number of decimal places, as '{:.nf}'.format does element by element.
+
+    :param values: The values.
+    :param n_decimals: The number of decimal places.
+    :return: The formatted values.
+    """
+    py_format = '{:.' + str(n_decimals) + 'f}'
+    if values.dtype.kind not in 'fiub' or n_decimals > 15:
+        return values.map(py_format.format).to_numpy(dtype=object)
+    x = values.to_numpy(dtype=np.float64)
+    result = np.empty(len(x), dtype=object)
+    result[np.isnan(x)] = 'nan'
+    result[np.isposinf(x)] = 'inf'
+    result[np.isneginf(x)] = '-inf'
+    finite = np.flatnonzero(np.isfinite(x))
+    scaled = np.abs(x[finite]) * 10.0 ** n_decimals
+    fraction = scaled - np.floor(scaled)
+    usable = (np.abs(fraction - 0.5) > 4 * np.spacing(scaled)) & (scaled < MAX_EXACT_INTEGER)
+    for index in finite[~usable]:
+        result[index] = py_format.format(float(x[index]))
+    finite = finite[usable]
+    digits = np.rint(scaled[usable]).astype(np.int64)
+    sign = np.where(np.signbit(x[finite]), '-', '')
+    result[finite] = _format_decimal(sign, digits, np.full(len(digits), n_decimals))
+    return result
+
+
+def format_integer(values: Series) -> np.ndarray:
+    """
+    Round values to integers, as Series.round().map('{:.0f}'.format) does.
+
+    :param values: The values.
+    :return: The formatted values.
+    """
+    if values.dtype.kind not in 'fiub':
+        return values.round().map('{:.0f}'.format).to_numpy(dtype=object)
+    return format_fixed(Series(np.rint(values.to_numpy(dtype=np.float64))), 0)
+
+
+def format_datetime(values: Series) -> np.ndarray:
+    """
+    Format times as yyyy-MM-ddTHH:mm:ssZ, as Series.dt.strftime('%Y-%m-%dT%H:%M:%SZ') does.
+
+    :param values: The times.
+    :return: The formatted values, NaN for missing times.
+    """
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        values = values.dt.tz_localize(None)
+    if values.dtype.kind != 'M':
+        return values.dt.strftime('%Y-%m-%dT%H:%M:%SZ').to_numpy(dtype=object)
+    seconds = values.to_numpy().astype('datetime64[s]')
+    missing = np.isnat(seconds)
+    years = seconds[~missing].astype('datetime64[Y]').astype(np.int64) + 1970
+    if len(years) and (years.min() < 1000 or years.max() > 9999):
+        return values.dt.strftime('%Y-%m-%dT%H:%M:%SZ').to_numpy(dtype=object)
+    result = np.char.add(np.datetime_as_string(seconds, unit='s'), 'Z').astype(object)
+    result[missing] = np.nan
+    return result
+
+
+def write_packages(data: pd.DataFrame, packages: Dict[str, List[str]]) -> None:
+    """
+    Write column subsets of a frame to CSV files, as DataFrame.to_csv(index=False) writes them.
+    Each column is converted to text once, however many files include it.
+
+    :param data: The formatted data.
+    :param packages: The columns to write, in order, by file path.
+    """
+    cells = {}
+    for columns in packages.values():
+        for column in columns:
+            if column not in cells:
+                cells[column] = _get_csv_cells(data[column])
+    for file_path, columns in packages.items():
+        with open(file_path, 'w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.writer(csv_file, lineterminator=os.linesep, quoting=csv.QUOTE_MINIMAL)
+            writer.writerow([str(column) for column in columns])
+            writer.writerows(zip(*[cells[column] for column in columns]))
+
+
+def _get_csv_cells(values: Series):
+    """Convert a column to the values pandas hands to csv.writer."""
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'fiubO':
+        array = values.to_numpy()
+        mask = pd.isna(array)
+        if dtype.kind == 'f':
+            cells = array.astype(str).astype(object)
+        else:
+            cells = np.array(array, dtype=object)
+        cells[mask] = ''
+        return cells
+    # other types (times, categories, extension arrays) are converted by pandas itself
+    text = values.to_frame().to_csv(index=False, header=False, lineterminator='\n')
+    return [row[0] for row in csv.reader(io.StringIO(text, newline=''))]
+
+
+def _product_error(a: np.ndarray, b: np.ndarray, product: np.ndarray) -> np.ndarray:
+    """The rounding error of product = a * b, exactly (Dekker's two-product)."""
+    a_high, a_low = _split(a)
+    b_high, b_low = _split(b)
+    return ((a_high * b_high - product) + a_high * b_low + a_low * b_high) + a_low * b_low
+
+
+def _split(a: np.ndarray):
+    factor = a * 134217729.0  # 2^27 + 1
+    high = factor - (factor - a)
+    return high, a - high
+
+
+def _format_decimal(sign: np.ndarray, digits: np.ndarray, places: np.ndarray) -> np.ndarray:
+    """Format integer digits with a decimal point places digits from the right."""
+    result = np.empty(len(digits), dtype=object)
+    for count in np.unique(places):
+        selected = places == count
+        whole, fraction = np.divmod(digits[selected], 10 ** count)
+        if count > 0:
+            fraction = pc.utf8_lpad(_to_strings(fraction), width=int(count), padding='0')
+            result[selected] = _join(sign[selected], _to_strings(whole), '.', fraction)
+        else:
+            result[selected] = _join(sign[selected], _to_strings(whole))
+    return result
+
+
+def _to_strings(values: np.ndarray) -> pa.Array:
+    return pc.cast(pa.array(values), pa.string())
+
+
+def _join(*parts) -> np.ndarray:
+    """Concatenate string arrays (or strings) element by element."""
+    joined = pc.binary_join_element_wise(*[pa.array(part) if isinstance(part, np.ndarray) else part
+                                           for part in parts], '')
+    return joined.to_numpy(zero_copy_only=False)
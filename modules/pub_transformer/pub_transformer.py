@@ -4,13 +4,15 @@ import json
 import pandas as pd
 from pandas import DataFrame
 import fnmatch
-import math
 import csv
 import sys
 from pathlib import Path
 
 from structlog import get_logger
 from common.err_datum import err_datum_path
+import common.workbook_index as workbook_index
+import pub_transformer.pub_formatter as pub_formatter
+from pub_transformer.pub_formatter import format_sig
 
 log = get_logger()
 
@@ -30,15 +32,8 @@ def pub_transform(*, data_path: Path, out_path: Path, workbook_path: Path, produ
     #out_path = os.environ['OUT_PATH']
     #data_path = os.path.join(os.environ['DATA_PATH'])
 
-    # Import workbooks
-    workbooks = []
-    workbook_products = []
-    for workbook_file in workbook_path.rglob('*'):
-        if workbook_file.is_file():
-            log.info(f'Loading workbook file {workbook_file}')
-            workbook = pd.read_csv(workbook_file, delimiter='\t', keep_default_na=False)
-            workbooks.append(workbook)
-            workbook_products.append(workbook['dpID'].unique())
+    # Import workbooks, indexed once per process
+    workbooks = workbook_index.read_workbooks(workbook_path)
     if len(workbooks) == 0:
         log.fatal(f'No workbook files found in directory {workbook_path}')
         sys.exit(1)
@@ -99,24 +94,16 @@ def pub_transform(*, data_path: Path, out_path: Path, workbook_path: Path, produ
             output_path = os.path.join(out_path, product, year, month, site, day)
     
             # Find the relevant workbook
-            workbook_index = [workbook_products.index(i) for i in workbook_products if i == 'NEON.DOM.SITE.'+product]
-            if len(workbook_index) == 0:
+            workbook = workbooks.get('NEON.DOM.SITE.'+product)
+            if workbook is None:
                 continue
-            workbook=workbooks[workbook_index[0]]
             
             # Create each table in the workbook if possible
-            for table in workbook['table'].unique():
-                
-                # Get the table
-                workbook_table=workbook.loc[workbook['table']==table,]
+            for table, workbook_table in workbook.tables.items():
                 
                 # Determine which, if any, packages files will be created for this product
-                basic_file = False
-                expanded_file = False
-                if workbook_table['downloadPkg'].str.contains('basic').any():
-                    basic_file = True
-                if workbook_table['downloadPkg'].str.contains('expanded').any():
-                    expanded_file = True
+                basic_file = workbook_table.has_package('basic')
+                expanded_file = workbook_table.has_package('expanded')
                     
                 if basic_file is False and expanded_file is False:
                     log.warn(f'No download packages indicated for {table}. Skipping.')
@@ -136,8 +123,7 @@ def pub_transform(*, data_path: Path, out_path: Path, workbook_path: Path, produ
                     continue
     
                 # Get the full 45-digit DP IDs to grab fields from
-                dp_number = [element for element in workbook_table['DPNumber'] if len(element)==45]
-                dp_number = dp_number[0]
+                dp_number = workbook_table.dp_numbers[0]
                 
                 # construct filenames
                 dp_parts = dp_number.split('.')
@@ -157,26 +143,20 @@ def pub_transform(*, data_path: Path, out_path: Path, workbook_path: Path, produ
     
                 # format columns
                 for column in data.columns:
-                    if not workbook_table['fieldName'].str.contains(column).any():
-                        column_format = 'asIs'
-                    else:
-                        column_format = workbook_table['pubFormat'][workbook_table[workbook_table['fieldName'] == column].index.values[0]]
-                    format_column(data, column, column_format)
+                    format_column(data, column, workbook_table.formats.get(column, 'asIs'))
                 
                 # add empty columns for any fields specified in workbook that are not present in the data
-                data[workbook_table['fieldName'][workbook_table['fieldName'].isin(data.columns) == False]] = ""
+                data[[field for field in workbook_table.field_names if field not in data.columns]] = ""
     
                 # determine data availability
                 if product not in has_data_by_file.keys():
                     has_data_by_file[product]={}
                 if basic_file is True:
-                    has_data_by_file[product][basic_filename] = not data[workbook_table.loc[
-                        (workbook_table['dataCategory'] == 'Y') &
-                        (workbook_table['downloadPkg'] == 'basic')]['fieldName'].values].isnull().values.all()
+                    has_data_by_file[product][basic_filename] = \
+                        not data[workbook_table.data_field_names['basic']].isnull().values.all()
                 if expanded_file is True:
                     has_data_by_file[product][expanded_filename] = \
-                        not data[workbook_table.loc[(workbook_table['dataCategory'] == 'Y') & ((workbook_table['downloadPkg'] == 'basic') |
-                                            (workbook_table['downloadPkg'] == 'expanded'))]['fieldName'].values].isnull().values.all()
+                        not data[workbook_table.data_field_names['expanded']].isnull().values.all()
                 
                 # Record portal visibility
                 if product not in visibility_by_file.keys():
@@ -188,15 +168,14 @@ def pub_transform(*, data_path: Path, out_path: Path, workbook_path: Path, produ
                 
                 # extract and write datasets
                 os.makedirs(output_path, exist_ok=True)
+                packages = {}
                 # basic
-                if workbook_table['downloadPkg'].str.contains('basic').any():
-                    basic_columns = workbook_table.loc[(workbook_table['downloadPkg'] == 'basic'), ['rank','fieldName']]
-                    data[basic_columns.sort_values('rank')['fieldName']].to_csv(basic_filepath, index=False)
+                if basic_file is True:
+                    packages[basic_filepath] = workbook_table.package_field_names['basic']
                 # expanded
-                if workbook_table['downloadPkg'].str.contains('expanded').any():
-                    expanded_columns = workbook_table.loc[((workbook_table['downloadPkg'] == 'basic') |
-                                                     (workbook_table['downloadPkg'] == 'expanded')), ['rank', 'fieldName']]
-                    data[expanded_columns.sort_values('rank')['fieldName']].to_csv(expanded_filepath, index=False)
+                if expanded_file is True:
+                    packages[expanded_filepath] = workbook_table.package_field_names['expanded']
+                pub_formatter.write_packages(data, packages)
             
         # Write manifest for each product
         for product in visibility_by_file.keys():
@@ -218,35 +197,13 @@ def write_manifest(output_path: str, has_data_by_file: dict, visibility_by_file:
 # Apply pub format to a column of a dataframe
 def format_column(dataframe: DataFrame, column: str, column_format: str):
     if column_format == "yyyy-MM-dd'T'HH:mm:ss'Z'(floor)":
-        dataframe[column] = dataframe[column].dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+        dataframe[column] = pub_formatter.format_datetime(dataframe[column])
 
     if fnmatch.fnmatch(column_format, "*.*(round)"):
-        py_format = '{:.' + str(column_format.count('#')) + 'f}'
-        dataframe[column] = dataframe[column].map(py_format.format)
+        dataframe[column] = pub_formatter.format_fixed(dataframe[column], column_format.count('#'))
 
     if fnmatch.fnmatch(column_format, "signif_*(round)"):
-        n_digits = column_format.count('#')
-        dataframe[column] = [format_sig(element, n_digits) for element in dataframe[column]]
-        # py_format = '{:.' + str(column_format.count('#')) + '}' # This works but doesn't limit to 7 decimal places
-        # dataframe[column] = dataframe[column].map(py_format.format)
+        dataframe[column] = pub_formatter.format_signif(dataframe[column], column_format.count('#'))
         
     if column_format == 'integer':
-        dataframe[column] = dataframe[column].round().map('{:.0f}'.format)
-
-
-def format_sig(element, n_digits):
-    """Format a number to n_digits significant figures and at most 7 decimal places."""
-    if pd.isna(element) or element == 0:
-        rounded = element
-    else:
-        rounded = round(element, -int(math.floor(math.log10(abs(element))-(n_digits-1))))
-    # Format as decimal
-    formatted = ("%.16f" % rounded).rstrip('0').rstrip('.')
-    # Retain at most 7 decimal places
-    if '.' in formatted:
-        n_decimal = len(formatted.split('.')[1])
-        if n_decimal > 7:
-            formatted = "{:.7f}".format(rounded)
-    else:
-        formatted = str(rounded)
-    return formatted
+        dataframe[column] = pub_formatter.format_integer(dataframe[column])
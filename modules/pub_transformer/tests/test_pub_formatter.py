@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+import os
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from testfixtures import TempDirectory
+
+import pub_transformer.pub_formatter as pub_formatter
+from pub_transformer.pub_formatter import format_sig
+
+
+class PubFormatterTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(2024)
+        count = 20000
+        decimals = rng.integers(0, 8, count)
+        self.values = pd.Series(np.concatenate([
+            # all magnitudes
+            rng.normal(0, 1, count) * 10.0 ** rng.integers(-12, 14, count),
+            # short decimals, which are often rounding ties
+            np.rint(rng.normal(0, 100, count) * 10.0 ** decimals) / 10.0 ** decimals,
+            [0.0, -0.0, np.nan, np.inf, -np.inf, 1.0, 10.0, 100.0, 0.1, 0.001, 1e-7, 5e-8, 0.5, 2.5, -0.05,
+             1e15, 9.99999e14, 123456.789, 999.99995, 0.00390625, 1e-200, 5e-324, 1234.5, 0.15, 0.25, 0.35]]))
+
+    def test_format_signif(self):
+        finite = self.values[~np.isinf(self.values)]
+        for n_digits in range(0, 9):
+            expected = [format_sig(value, n_digits) for value in finite]
+            self.assertEqual(expected, list(pub_formatter.format_signif(finite, n_digits)))
+        with self.assertRaises(OverflowError):
+            pub_formatter.format_signif(self.values, 3)
+
+    def test_format_signif_types(self):
+        for values in [pd.Series([1234, -5, 0, 7]), pd.Series(np.array([0.1, 2.5, np.nan], dtype=np.float32)),
+                       pd.Series([0.1, np.nan, 3], dtype=object)]:
+            expected = [format_sig(value, 2) for value in values]
+            self.assertEqual(expected, list(pub_formatter.format_signif(values, 2)))
+
+    def test_format_fixed(self):
+        for n_decimals in range(0, 9):
+            py_format = '{:.' + str(n_decimals) + 'f}'
+            for values in [self.values, pd.Series([1, -2, 3]), pd.Series(np.array([0.125, -0.5], dtype=np.float32))]:
+                expected = list(values.map(py_format.format))
+                self.assertEqual(expected, list(pub_formatter.format_fixed(values, n_decimals)))
+
+    def test_format_integer(self):
+        for values in [self.values, pd.Series([1, -2, 3])]:
+            expected = list(values.round().map('{:.0f}'.format))
+            self.assertEqual(expected, list(pub_formatter.format_integer(values)))
+
+    def test_format_datetime(self):
+        times = pd.Series(pd.to_datetime(['1969-12-31 23:59:59.5', '2019-01-03 00:01:00.999', None,
+                                          '2020-02-29 12:00:00'], format='ISO8601'))
+        for values in [times, times.astype('datetime64[us]'), times.dt.tz_localize('UTC')]:
+            expected = values.dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+            formatted = pub_formatter.format_datetime(values)
+            self.assertEqual(list(expected.fillna('missing')), list(pd.Series(formatted).fillna('missing')))
+
+    def test_write_packages(self):
+        temp_dir = TempDirectory()
+        data = pd.DataFrame({
+            'mean': [1.5, np.nan, 1e-5, 1e16],
+            'remarks': ['x,y', 'q"r', None, ''],
+            'count': [1, 2, 3, 4],
+            'valid': [True, False, True, False],
+            'startDateTime': pd.to_datetime(['2020-01-01', '2020-01-02 00:00:01', None, '2020-01-03'],
+                                            format='ISO8601'),
+            'minimum': np.array([0.1, 0.2, np.nan, 3], dtype=np.float32),
+            'numPts': pd.array([1, None, 3, 4], dtype='Int64'),
+            'flag': pd.Categorical(['a', 'b,c', None, 'a']),
+            'empty': [''] * 4})
+        basic_path = Path(temp_dir.path, 'basic.csv')
+        expanded_path = Path(temp_dir.path, 'expanded.csv')
+        single_path = Path(temp_dir.path, 'single.csv')
+        packages = {str(basic_path): ['startDateTime', 'mean', 'remarks', 'empty'],
+                    str(expanded_path): list(data.columns),
+                    str(single_path): ['empty']}
+        pub_formatter.write_packages(data, packages)
+        for file_path, columns in packages.items():
+            expected_path = file_path + '.expected'
+            data[columns].to_csv(expected_path, index=False)
+            with open(file_path, 'rb') as file, open(expected_path, 'rb') as expected_file:
+                self.assertEqual(expected_file.read(), file.read())
+        temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
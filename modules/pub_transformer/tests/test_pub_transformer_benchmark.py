@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import common.log_config as log_config
+from pub_transformer.pub_transformer import pub_transform
+from pub_transformer.tests.group_data import get_group_data
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Benchmark skipped due to long process time.')
+class PubTransformerBenchmarkTest(unittest.TestCase):
+    """Time transforming a month of daily datums, one call per datum, against a three table workbook."""
+
+    def setUp(self):
+        log_config.configure('INFO')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_path = Path(self.temp_dir.name, 'repo/inputs')
+        self.month_path = Path(self.input_path, 'DP1.00066.001/2019/05/CPER')
+        self.out_path = Path(self.temp_dir.name, 'outputs')
+        self.workbook_path = Path(self.input_path, 'workbooks')
+        self.workbook_path.mkdir(parents=True)
+        self.group = 'par-quantum-line_CPER001000'
+        fields = ['startDateTime', 'endDateTime'] + [f'field{n}' for n in range(0, 40)]
+        formats = ["yyyy-MM-dd'T'HH:mm:ss'Z'(floor)"] * 2 + ['signif_###(round)', '*.##(round)', 'integer',
+                                                              'asIs'] * 10
+        workbook = pd.concat([pd.DataFrame({'fieldName': fields,
+                                            'DPNumber': f'NEON.DOM.SITE.DP1.00066.001.01234.HOR.VER.{table}',
+                                            'downloadPkg': ['basic', 'expanded'] * 21,
+                                            'rank': range(1, len(fields) + 1),
+                                            'table': f'table{table}',
+                                            'dpID': 'NEON.DOM.SITE.DP1.00066.001',
+                                            'pubFormat': formats,
+                                            'dataCategory': 'Y'}) for table in ['001', '030', '060']])
+        workbook.to_csv(Path(self.workbook_path, 'publication_workbook.txt'), sep='\t', index=False)
+        rng = np.random.default_rng(0)
+        self.days = [f'{day:02d}' for day in range(1, 32)]
+        for day in self.days:
+            group_path = Path(self.month_path, day, 'group', self.group)
+            data_path = Path(self.month_path, day, 'data', self.group)
+            group_path.mkdir(parents=True)
+            data_path.mkdir(parents=True)
+            with open(Path(group_path, 'group.json'), 'w') as file:
+                json.dump(get_group_data(), file)
+            for table, rows in [('001', 1440), ('030', 48), ('060', 24)]:
+                times = pd.date_range(f'2019-05-{day}', periods=rows, freq=f'{1440 // rows}min')
+                data = pd.DataFrame({name: rng.normal(0, 100, rows) for name in fields[2:]})
+                data.insert(0, 'startDateTime', times)
+                data.insert(1, 'endDateTime', times + pd.Timedelta(minutes=1440 // rows))
+                data.to_parquet(Path(data_path, f'par_{self.group}_2019-05-{day}_table{table}.parquet'))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_transform(self):
+        parts = Path(self.month_path, '01').parts
+        start = time.perf_counter()
+        for day in self.days:
+            pub_transform(data_path=Path(self.month_path, day),
+                          out_path=self.out_path,
+                          workbook_path=self.workbook_path,
+                          product_index=parts.index('DP1.00066.001'),
+                          year_index=parts.index('2019'),
+                          month_index=parts.index('05'),
+                          day_index=len(parts) - 1,
+                          data_type_index=len(parts),
+                          group_metadata_dir='group',
+                          data_path_parse_index=len(parts) - 1)
+        elapsed = time.perf_counter() - start
+        files = list(self.out_path.rglob('*.csv'))
+        self.assertEqual(len(self.days) * 7, len(files))
+        print(f'\n{len(self.days)} datums: {elapsed:.2f}s')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 from pathlib import Path
+from typing import Iterator
 
 import environs
 import structlog
@@ -9,7 +10,8 @@ import pandas as pd
 import common.log_config as log_config
 from data_access.db_config_reader import read_from_mount
 from data_access.db_connector import DbConnector
-from data_access.create_pub import create_pub
+from data_access.create_pub import create_pub, create_pubs
+from common.path_linker import walk_files
 
 log = structlog.get_logger()
 
@@ -22,18 +24,29 @@ def main() -> None:
     log_config.configure(log_level)
     data_path: Path = env.path('DATA_PATH')
     starting_path_index: int = env.int('STARTING_PATH_INDEX')
+    # manifests per transaction in bulk mode, 0 to commit each manifest with row by row inserts
+    commit_size: int = env.int('COMMIT_SIZE', 0)
     db_config = read_from_mount(Path('/var/db_secret'))
     
     with closing(DbConnector(db_config)) as connector:
-        # Find each manifest file
         data_path_start = Path(*data_path.parts[0:starting_path_index+1]) # starting index
-        for path in data_path_start.rglob('*'):
-            # When we reach a manifest file, process it
-            if path.parts[-1] == 'manifest.csv':
-                log.info(f'Processing manifest {path}') 
-                manifest = pd.read_csv(path)
+        if commit_size > 0:
+            object_count = create_pubs(connector, read_manifests(data_path_start), version, change_by,
+                                       commit_size=commit_size)
+            log.info(f'Created {object_count} pub objects')
+        else:
+            for manifest in read_manifests(data_path_start):
                 create_pub(connector, manifest, version, change_by)
 
 
+def read_manifests(data_path: Path) -> Iterator[pd.DataFrame]:
+    """Read each manifest file below the path."""
+    for path in walk_files(data_path):
+        # When we reach a manifest file, process it
+        if path.parts[-1] == 'manifest.csv':
+            log.info(f'Processing manifest {path}')
+            yield pd.read_csv(path)
+
+
 if __name__ == "__main__":
     main()
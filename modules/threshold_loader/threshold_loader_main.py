@@ -35,12 +35,14 @@ def main() -> None:
         contexts = [context]
     
     log_level: str = env.log_level('LOG_LEVEL', 'INFO')
+    prepare_statements: bool = env.bool('DB_PREPARE_STATEMENTS', False)
+    itersize: int = env.int('DB_ITERSIZE', 0)
     log_config.configure(log_level)
     log = get_logger()
     log.debug(f'out_path: {out_path}')
     log.debug(f'contexts: {contexts}')
     db_config = read_from_mount(Path('/var/db_secret'))
-    with closing(DbConnector(db_config)) as connector:
+    with closing(DbConnector(db_config, prepare_statements=prepare_statements, itersize=itersize)) as connector:
         get_thresholds_partial = partial(get_thresholds, connector=connector)
         load_thresholds(get_thresholds_partial, out_path, term=term, contexts=contexts)
 
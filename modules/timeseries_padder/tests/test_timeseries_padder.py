@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
+import json
 import os
 from pathlib import Path
+from unittest import mock
 
 from pyfakefs.fake_filesystem_unittest import TestCase
 
@@ -43,9 +45,9 @@ class TimeSeriesPadTest(TestCase):
         test_config = Path(this_path.parent, 'config/windowSizeNames.yaml')
         self.fs.add_real_file(test_config, target_path=config_path)
         # location file (real file for parsing)
-        location_path = Path(input_root, self.metadata_path, 'location/prt_40202_locations.json')
-        test_locations = Path(os.path.dirname(__file__), 'test-locations.json')
-        self.fs.add_real_file(test_locations, target_path=location_path)
+        self.location_path = Path(input_root, self.metadata_path, 'location/prt_40202_locations.json')
+        self.test_locations = Path(os.path.dirname(__file__), 'test-locations.json')
+        self.fs.add_real_file(self.test_locations, target_path=self.location_path)
         # threshold file (real file for parsing)
         threshold_path = Path(input_root, self.metadata_path, Config.threshold_dir, Config.threshold_filename)
         test_thresholds = Path(os.path.dirname(__file__), 'test-thresholds.json')
@@ -90,6 +92,47 @@ class TimeSeriesPadTest(TestCase):
         variable_pad.pad()
         self.check_output()
 
+    def test_variable_pad_plan(self):
+        config = Config(data_path=self.input_path,
+                        out_path=self.out_path,
+                        pad_dirs=self.pad_dirs,
+                        copy_dirs=self.copy_dirs,
+                        relative_path_index=self.relative_path_index,
+                        year_index=self.year_index,
+                        month_index=self.month_index,
+                        day_index=self.day_index,
+                        location_index=self.location_index,
+                        data_type_index=self.data_type_index,
+                        window_size=0)
+        plan = VariablePad(config).plan()
+        # three padded dates for the data file and one link per copy directory
+        self.assertEqual(3 + len(self.copy_dirs), plan.link_count)
+        self.assertEqual(1, len(plan.pad_plans))
+        self.assertEqual([Path(self.out_path, self.metadata_path, self.data_dir)], list(plan.manifests.keys()))
+        self.assertFalse(self.out_path.exists())
+
+    def test_location_file_parsed_once(self):
+        # the active period check and the data rate read the same CFGLOC location file
+        self.fs.remove_object(str(self.location_path))
+        location_path = Path(self.location_path.parent, 'CFGLOC112154.json')
+        self.fs.add_real_file(self.test_locations, target_path=location_path)
+        config = Config(data_path=self.input_path,
+                        out_path=self.out_path,
+                        pad_dirs=self.pad_dirs,
+                        copy_dirs=self.copy_dirs,
+                        relative_path_index=self.relative_path_index,
+                        year_index=self.year_index,
+                        month_index=self.month_index,
+                        day_index=self.day_index,
+                        location_index=self.location_index,
+                        data_type_index=self.data_type_index,
+                        window_size=0)
+        with mock.patch('json.load', wraps=json.load) as load:
+            plan = VariablePad(config).plan()
+        location_loads = [call for call in load.call_args_list if call.args[0].name == str(location_path)]
+        self.assertEqual(1, len(location_loads))
+        self.assertEqual(3 + len(self.copy_dirs), plan.link_count)
+
     def check_output(self):
         """Ensure the expected files are in the output directory."""
         not_exists_data_path = Path(self.out_path, 'prt/2018/01/01/CFGLOC112154/data', self.data_filename)
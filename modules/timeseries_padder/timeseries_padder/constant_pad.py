@@ -4,6 +4,7 @@ import datetime
 
 from structlog import get_logger
 
+from common.path_linker import PathLinker, walk_files
 import timeseries_padder.timeseries_padder.pad_calculator as pad_calculator
 import timeseries_padder.timeseries_padder.file_writer as file_writer
 from timeseries_padder.timeseries_padder.timeseries_padder_config import Config
@@ -31,37 +32,30 @@ class ConstantPad:
 
     def pad(self) -> None:
         """Pad the data using the given window size."""
-        for path in self.data_path.rglob('*'):
+        linker = PathLinker()
+        for path in walk_files(self.data_path):
             log.debug(f'path: {path}')
-            if path.is_file():
-                parts = path.parts
-                year, month, day, location, data_type = self.data_path_parser.parse(path)
-                if data_type in self.pad_dirs:
-                    log.debug(f'processing file: {path}')
-                    location_path = Path(*parts[:self.location_index + 1])
-                    data_date = datetime.date(int(year), int(month), int(day))
-                    padded_dates = pad_calculator.get_padded_dates(data_date, self.window_size)
-                    log.debug(f'{path} padded dates {padded_dates}')
-                    # link data file into each date in the padded range
-                    link_parts = list(parts)
-                    for date in padded_dates:
-                        if any(pad_dir in str(path) for pad_dir in self.pad_dirs):
-                            link_parts[self.year_index] = str(date.year)
-                            link_parts[self.month_index] = str(date.month).zfill(2)
-                            link_parts[self.day_index] = str(date.day).zfill(2)
-                            link_path = Path(self.out_path, *link_parts[self.relative_path_index:])
-                            log.debug(f'file: {path} link: {link_path}')
-                            link_path.parent.mkdir(parents=True, exist_ok=True)
-                            if not link_path.exists():
-                                link_path.symlink_to(path)
-                        if date == data_date:
-                            file_writer.link_thresholds(location_path, link_path)
-                            manifest_path = Path(link_path.parent, Config.manifest_filename)
-                            log.debug(f'writing manifest: {manifest_path}')
-                            file_writer.write_manifest(padded_dates, manifest_path)
-                elif data_type in self.copy_dirs:
-                    link_path = Path(self.out_path, *parts[self.relative_path_index:])
-                    link_path.parent.mkdir(parents=True, exist_ok=True)
-                    log.debug(f'file: {path} link: {link_path}')
-                    if not link_path.exists():
-                        link_path.symlink_to(path)
+            parts = path.parts
+            year, month, day, location, data_type = self.data_path_parser.parse(path)
+            if data_type in self.pad_dirs:
+                log.debug(f'processing file: {path}')
+                location_path = Path(*parts[:self.location_index + 1])
+                data_date = datetime.date(int(year), int(month), int(day))
+                padded_dates = pad_calculator.get_padded_dates(data_date, self.window_size)
+                log.debug(f'{path} padded dates {padded_dates}')
+                # link data file into each date in the padded range
+                link_parts = list(parts)
+                for date in padded_dates:
+                    if any(pad_dir in str(path) for pad_dir in self.pad_dirs):
+                        link_parts[self.year_index] = str(date.year)
+                        link_parts[self.month_index] = str(date.month).zfill(2)
+                        link_parts[self.day_index] = str(date.day).zfill(2)
+                        link_path = Path(self.out_path, *link_parts[self.relative_path_index:])
+                        linker.link(path, link_path)
+                    if date == data_date:
+                        file_writer.link_thresholds(location_path, link_path)
+                        manifest_path = Path(link_path.parent, Config.manifest_filename)
+                        log.debug(f'writing manifest: {manifest_path}')
+                        file_writer.write_manifest(padded_dates, manifest_path)
+            elif data_type in self.copy_dirs:
+                linker.link(path, Path(self.out_path, *parts[self.relative_path_index:]))
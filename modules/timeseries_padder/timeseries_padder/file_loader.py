@@ -3,6 +3,7 @@ import os
 from yaml import Loader
 import yaml
 import json
+from functools import lru_cache
 from pathlib import Path
 
 import structlog
@@ -10,6 +11,7 @@ import structlog
 log = structlog.getLogger()
 
 
+@lru_cache(maxsize=None)
 def load_window_size_file():
     try:
         this_path = Path(os.path.dirname(__file__))
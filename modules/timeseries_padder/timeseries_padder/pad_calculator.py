@@ -90,5 +90,15 @@ def get_data_rate(location_file: str) -> float:
     """
     with open(location_file, "r") as file:
         location_json = json.load(file)
-        data_rate = location_json['features'][0]['Data Rate']
+    return get_location_data_rate(location_json)
+
+
+def get_location_data_rate(location_json: dict) -> float:
+    """
+    Get the data rate from parsed location metadata.
+
+    :param location_json: The location metadata.
+    :returns: The data rate.
+    """
+    data_rate = location_json['features'][0]['Data Rate']
     return float(data_rate)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+
+class PadPlan(NamedTuple):
+    """The padding of one date and location."""
+    location_path: Path
+    data_date: datetime.date
+    padded_dates: List[datetime.date]
+    manifest_dates: List[datetime.date]
+
+
+class LinkPlan:
+    """The links, manifests and threshold links to create in the output."""
+
+    def __init__(self) -> None:
+        self.pad_plans: Dict[str, PadPlan] = {}
+        # links grouped by output directory
+        self.links: Dict[Path, List[Tuple[Path, Path]]] = {}
+        # the pad plan and a data file link for each output directory needing a manifest
+        self.manifests: Dict[Path, Tuple[PadPlan, Path]] = {}
+        self.link_count = 0
+
+    def add_link(self, path: Path, link_path: Path) -> None:
+        self.links.setdefault(link_path.parent, []).append((path, link_path))
+        self.link_count += 1
@@ -3,15 +3,18 @@ import datetime
 import json
 import os
 import sys
+import time
 from pathlib import Path
-from typing import Dict, Union, Optional, Any, List
+from typing import Dict, Optional, Any, List, Tuple
 
 from structlog import get_logger
 
+from common.path_linker import PathLinker, walk_files
 import timeseries_padder.timeseries_padder.pad_calculator as pad_calculator
 import timeseries_padder.timeseries_padder.file_writer as file_writer
 from timeseries_padder.timeseries_padder.timeseries_padder_config import Config
 from timeseries_padder.timeseries_padder.data_path_parser import DataPathParser
+from timeseries_padder.timeseries_padder.pad_plan import LinkPlan, PadPlan
 
 
 log = get_logger()
@@ -28,78 +31,138 @@ class VariablePad:
         self.data_file_path = DataPathParser(config)
         self.out_dir_parts = list(self.out_path.parts)
         self.relative_path_index = config.relative_path_index
+        # parsed location files by path
+        self.location_documents: Dict[Path, Any] = {}
 
     def pad(self) -> None:
         """Pad the data with the calculated window size."""
         try:
-            # date_path should be based on year/month/day
-            active_periods = self.check_active_periods_flag()
-
-            date_and_location_max_window_size: Dict[str, Union[int, float]] = {}
-            date_and_location_min_data_rate: Dict[str, float] = {}
-            for path in self.data_path.rglob('*'):
-                if path.is_file():
-                    parts = path.parts
-                    year, month, day, location, data_type = self.data_file_path.parse(path)
-                    if data_type in self.pad_dirs:
-                        date_location_key = year+month+day+location
-                        config_location_path = Path(*parts[:self.data_file_path.location_index + 1])
-                        # get min of all data rates (to ensure adequate window coverage)
-                        if date_location_key not in date_and_location_min_data_rate:
-                            location_path = Path(config_location_path, Config.location_dir)
-                            location_files = [f for f in os.listdir(location_path)
-                                            if f.endswith(Config.location_file_extension)]
-                            location_file = Path(location_path, location_files[0])
-                            date_and_location_min_data_rate[date_location_key] = \
-                                pad_calculator.get_data_rate(str(location_file))
-                        data_rate = date_and_location_min_data_rate[date_location_key]
-                        # get max of all window sizes
-                        if date_location_key not in date_and_location_max_window_size:
-                            threshold_path = Path(config_location_path, Config.threshold_dir)
-                            threshold_files = [f for f in os.listdir(threshold_path)
-                                            if f.endswith(Config.threshold_file_extension)]
-                            threshold_file = Path(threshold_path, threshold_files[0])
-                            log.debug(f'threshold file: {threshold_file}')
-                            date_and_location_max_window_size[date_location_key] = \
-                                pad_calculator.get_max_window_size(str(threshold_file), data_rate)
-                        window_size = date_and_location_max_window_size[date_location_key]
-                        data_date = datetime.date(int(year), int(month), int(day))
-                        # calculate pad size
-                        pad_size = pad_calculator.calculate_pad_size(window_size)
-                        padded_dates = pad_calculator.get_padded_dates(data_date, pad_size)
-                        # link data file into each date in the padded range
-                        link_parts = list(parts)
-                        for index in range(1, len(self.out_dir_parts)):
-                            link_parts[index] = self.out_dir_parts[index]
-                        for date in padded_dates:
-                            if any(pad_dir in str(path) for pad_dir in self.pad_dirs):
-                                link_parts[self.data_file_path.year_index] = str(date.year)
-                                link_parts[self.data_file_path.month_index] = str(date.month).zfill(2)
-                                link_parts[self.data_file_path.day_index] = str(date.day).zfill(2)
-                                link_path = Path(*link_parts)
-                                log.debug(f'file: {path} link: {link_path}')
-                                link_path.parent.mkdir(parents=True, exist_ok=True)
-                                if not link_path.exists():
-                                    link_path.symlink_to(path)
-                            # write manifest and thresholds
-                            if date == data_date:
-                                # link thresholds
-                                file_writer.link_thresholds(config_location_path, link_path)
-                                manifest_path = Path(link_path.parent, Config.manifest_filename)
-                                padded_dates = self.recheck_padded_dates(padded_dates, active_periods)
-                                file_writer.write_manifest(padded_dates, manifest_path)
-                    elif data_type in self.copy_dirs:
-                        link_path = Path(self.out_path, *parts[self.relative_path_index:])
-                        link_path.parent.mkdir(parents=True, exist_ok=True)
-                        log.debug(f'file: {path} link: {link_path}')
-                        if not link_path.exists():
-                            link_path.symlink_to(path)
+            start = time.perf_counter()
+            plan = self.plan()
+            planned = time.perf_counter()
+            log.info(f'planned {plan.link_count} links for {len(plan.pad_plans)} date/locations '
+                     f'in {planned - start:.3f}s')
+            self.link(plan)
+            log.info(f'linked {plan.link_count} files in {time.perf_counter() - planned:.3f}s')
         except Exception:
             exc_type, exc_obj, exc_tb = sys.exc_info()
             log.error("Exception at line " + str(exc_tb.tb_lineno) + ": " + str(sys.exc_info()))
 
-    def check_active_periods_flag(self) -> Optional[Dict[str, Any]]:
-        for root, dirs, files in os.walk(self.data_path):
+    def plan(self) -> LinkPlan:
+        """
+        Walk the input once and plan every link, manifest and threshold link of the output.
+
+        :return: The plan.
+        """
+        files_by_dir = self.scan_files()
+        # date_path should be based on year/month/day
+        active_periods = self.check_active_periods_flag(files_by_dir)
+        plan = LinkPlan()
+        for root, files in files_by_dir.items():
+            for filename in files:
+                path = Path(root, filename)
+                parts = path.parts
+                year, month, day, location, data_type = self.data_file_path.parse(path)
+                if data_type in self.pad_dirs:
+                    date_location_key = year+month+day+location
+                    pad_plan = plan.pad_plans.get(date_location_key)
+                    if pad_plan is None:
+                        pad_plan = self.plan_pad(parts, files_by_dir, active_periods)
+                        plan.pad_plans[date_location_key] = pad_plan
+                    # link data file into each date in the padded range
+                    link_parts = list(parts)
+                    for index in range(1, len(self.out_dir_parts)):
+                        link_parts[index] = self.out_dir_parts[index]
+                    for date in pad_plan.padded_dates:
+                        link_parts[self.data_file_path.year_index] = str(date.year)
+                        link_parts[self.data_file_path.month_index] = str(date.month).zfill(2)
+                        link_parts[self.data_file_path.day_index] = str(date.day).zfill(2)
+                        link_path = Path(*link_parts)
+                        plan.add_link(path, link_path)
+                        # write manifest and thresholds
+                        if date == pad_plan.data_date:
+                            plan.manifests[link_path.parent] = (pad_plan, link_path)
+                elif data_type in self.copy_dirs:
+                    plan.add_link(path, Path(self.out_path, *parts[self.relative_path_index:]))
+        return plan
+
+    def plan_pad(self, parts: Tuple[str, ...], files_by_dir: Dict[str, List[str]],
+                 active_periods: Optional[Dict[str, Any]]) -> PadPlan:
+        """
+        Calculate the padded dates for a date and location.
+
+        :param parts: The path parts of a data file for the date and location.
+        :param files_by_dir: The input file names by directory.
+        :param active_periods: The active period limiting the manifest dates.
+        :return: The pad plan.
+        """
+        year = parts[self.data_file_path.year_index]
+        month = parts[self.data_file_path.month_index]
+        day = parts[self.data_file_path.day_index]
+        config_location_path = Path(*parts[:self.data_file_path.location_index + 1])
+        # get min of all data rates (to ensure adequate window coverage)
+        location_path = Path(config_location_path, Config.location_dir)
+        location_files = [f for f in self.list_files(location_path, files_by_dir)
+                          if f.endswith(Config.location_file_extension)]
+        location_file = Path(location_path, location_files[0])
+        data_rate = pad_calculator.get_location_data_rate(self.load_location(location_file))
+        # get max of all window sizes
+        threshold_path = Path(config_location_path, Config.threshold_dir)
+        threshold_files = [f for f in self.list_files(threshold_path, files_by_dir)
+                           if f.endswith(Config.threshold_file_extension)]
+        threshold_file = Path(threshold_path, threshold_files[0])
+        log.debug(f'threshold file: {threshold_file}')
+        window_size = pad_calculator.get_max_window_size(str(threshold_file), data_rate)
+        data_date = datetime.date(int(year), int(month), int(day))
+        # calculate pad size
+        pad_size = pad_calculator.calculate_pad_size(window_size)
+        padded_dates = pad_calculator.get_padded_dates(data_date, pad_size)
+        manifest_dates = self.recheck_padded_dates(padded_dates, active_periods)
+        return PadPlan(location_path=config_location_path, data_date=data_date,
+                       padded_dates=padded_dates, manifest_dates=manifest_dates)
+
+    @staticmethod
+    def link(plan: LinkPlan) -> None:
+        """
+        Create the planned links, then write the manifests.
+
+        :param plan: The plan.
+        """
+        linker = PathLinker()
+        linker.link_all(link for links in plan.links.values() for link in links)
+        for manifest_dir, (pad_plan, link_path) in plan.manifests.items():
+            # link thresholds
+            file_writer.link_thresholds(pad_plan.location_path, link_path)
+            manifest_path = Path(manifest_dir, Config.manifest_filename)
+            file_writer.write_manifest(pad_plan.manifest_dates, manifest_path)
+
+    def scan_files(self) -> Dict[str, List[str]]:
+        """
+        Walk the input once.
+
+        :return: The file names in each directory, in walk order.
+        """
+        files_by_dir: Dict[str, List[str]] = {}
+        for path in walk_files(self.data_path):
+            files_by_dir.setdefault(str(path.parent), []).append(path.name)
+        return files_by_dir
+
+    @staticmethod
+    def list_files(path: Path, files_by_dir: Dict[str, List[str]]) -> List[str]:
+        files = files_by_dir.get(str(path))
+        return files if files is not None else os.listdir(path)
+
+    def load_location(self, path: Path) -> Any:
+        """Parse a location file once, reusing the document for every later lookup."""
+        if path not in self.location_documents:
+            with path.open("r", encoding="utf-8") as file:
+                self.location_documents[path] = json.load(file)
+        return self.location_documents[path]
+
+    def check_active_periods_flag(self, files_by_dir: Optional[Dict[str, List[str]]] = None) -> Optional[Dict[str, Any]]:
+        if files_by_dir is None:
+            files_by_dir = {root: files for root, dirs, files in os.walk(self.data_path)}
+        for root, files in files_by_dir.items():
             if Path(root).parts[-1] != Config.location_dir:
                 continue
 
@@ -109,8 +172,7 @@ class VariablePad:
 
                 loc_json = Path(root) / fname
                 try:
-                    with loc_json.open("r", encoding="utf-8") as f:
-                        doc = json.load(f)
+                    doc = self.load_location(loc_json)
                 except Exception as e:
                     log.warning(f"Skipping {loc_json}: {e}")
                     continue